@@ -0,0 +1,63 @@
+"""
+Local stand-in for the Clash King API used by the flow benchmarks.
+
+Serves ``/player/{tag}/stats`` with a deterministic player per tag after a
+fixed delay, on a free port of 127.0.0.1.
+"""
+import asyncio
+import zlib
+from typing import Any, Dict, Optional
+from aiohttp import web
+
+def player_stats_payload(tag: str) -> Dict[str, Any]:
+    """Deterministic Clash King player stats for a tag"""
+    tag = tag.lstrip('#').upper()
+    seed = zlib.crc32(tag.encode())
+    return {
+        'name': f"Player {tag}",
+        'tag': f"#{tag}",
+        'townHallLevel': 10 + seed % 7,
+        'expLevel': 100 + seed % 150,
+        'trophies': 2000 + seed % 3000,
+        'bestTrophies': 5000,
+        'warStars': seed % 2000,
+        'clan': {'name': "Feeder Clan"},
+        'league': {'name': "Legend League"},
+        'heroes': [
+            {'name': "Barbarian King", 'level': 80, 'village': 'home'},
+            {'name': "Archer Queen", 'level': 80, 'village': 'home'}
+        ],
+        'troops': [{'name': "Dragon", 'level': 9, 'village': 'home'}],
+        'spells': [{'name': "Rage Spell", 'level': 6, 'village': 'home'}],
+        'siegeMachines': []
+    }
+
+class ClashKingStub:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.requests = 0
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url: Optional[str] = None
+
+    async def start(self) -> str:
+        """Start serving and return the base URL"""
+        app = web.Application()
+        app.router.add_get('/player/{tag}/stats', self.player_stats)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        host, port = self._runner.addresses[0][:2]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def player_stats(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return web.json_response(player_stats_payload(request.match_info['tag']))
@@ -0,0 +1,626 @@
+"""
+In-process fake of the Discord objects and REST layer the bot's flows touch.
+
+Guilds, channels, threads, members, messages and interactions keep their
+state in memory. Every coroutine that would be a REST request goes through
+``FakeRest.request``, which records the call, applies simulated per-route
+rate-limit buckets and a round-trip latency. Views are driven with
+``click``, user replies arrive with ``receive``, so whole flows run against
+the real cogs and views without a gateway or a token, and the recorded calls
+show how much REST budget each flow spends.
+
+With ``realtime=False`` nothing sleeps: a virtual clock advances by each
+call's wait and latency, so repeated runs record exactly the same calls.
+"""
+import asyncio
+import itertools
+import json
+import time
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import discord
+
+# Snowflake-sized IDs, unique across every fake object
+_ids = itertools.count(1 << 60)
+
+def next_id() -> int:
+    return next(_ids)
+
+# Approximate per-route limits as (requests, seconds), as Discord reports them
+# in its X-RateLimit headers. Buckets are per major parameter: channel, guild
+# or interaction webhook. Routes missing here are not limited per route.
+ROUTE_LIMITS: Dict[str, Tuple[int, float]] = {
+    'POST /channels/{channel_id}/messages': (5, 5.0),
+    'PATCH /channels/{channel_id}/messages/{message_id}': (5, 5.0),
+    'DELETE /channels/{channel_id}/messages/{message_id}': (5, 1.0),
+    'PUT /channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me': (1, 0.25),
+    'POST /channels/{channel_id}/threads': (5, 5.0),
+    'PUT /channels/{channel_id}/thread-members/{user_id}': (5, 5.0),
+    'PUT /channels/{channel_id}/permissions/{overwrite_id}': (5, 5.0),
+    'PATCH /channels/{channel_id}': (2, 600.0),
+    'DELETE /channels/{channel_id}': (5, 5.0),
+    'POST /guilds/{guild_id}/channels': (5, 5.0),
+    'PUT /guilds/{guild_id}/members/{user_id}/roles/{role_id}': (10, 10.0),
+    'DELETE /guilds/{guild_id}/members/{user_id}/roles/{role_id}': (10, 10.0),
+    'POST /webhooks/{application_id}/{interaction_token}': (5, 5.0),
+    'PATCH /webhooks/{application_id}/{interaction_token}/messages/{message_id}': (5, 5.0)
+}
+
+# Requests per second across all routes, interaction callbacks are exempt
+GLOBAL_LIMIT = 50
+
+MAJOR_PARAMETERS = ('channel_id', 'guild_id', 'interaction_token')
+
+class RateLimitBucket:
+    """Fixed-window bucket, like the remaining/reset pair Discord returns"""
+
+    __slots__ = ('limit', 'per', 'remaining', 'reset_at')
+
+    def __init__(self, limit: int, per: float):
+        self.limit = limit
+        self.per = per
+        self.remaining = limit
+        self.reset_at = 0.0
+
+    def acquire(self, now: float) -> float:
+        """Take one request, returning how long it has to wait for it"""
+        wait = 0.0
+        if now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = now + self.per
+        elif self.remaining <= 0:
+            wait = self.reset_at - now
+            self.remaining = self.limit
+            self.reset_at += self.per
+        self.remaining -= 1
+        return wait
+
+class RestCall:
+    """One recorded request"""
+
+    __slots__ = ('route', 'params', 'bytes', 'waited', 'at')
+
+    def __init__(self, route: str, params: Dict[str, Any], size: int, waited: float, at: float):
+        self.route = route
+        self.params = params
+        self.bytes = size
+        self.waited = waited
+        self.at = at
+
+    def __repr__(self) -> str:
+        return f"<RestCall {self.route} bytes={self.bytes} waited={self.waited:.3f}>"
+
+def payload_size(payload: Optional[Dict[str, Any]]) -> int:
+    """Approximate size of a request's JSON body and attachments"""
+    if not payload:
+        return 0
+    body, size = {}, 0
+    for key, value in payload.items():
+        if value is None:
+            continue
+        if key == 'embed':
+            body['embeds'] = [value.to_dict()]
+        elif key == 'embeds':
+            body['embeds'] = [embed.to_dict() for embed in value]
+        elif key == 'view':
+            body['components'] = value.to_components()
+        elif key in ('file', 'files'):
+            for file in (value if key == 'files' else [value]):
+                buffer = getattr(file.fp, 'getbuffer', None)
+                size += buffer().nbytes if buffer else 0
+        elif isinstance(value, (str, int, float, bool, list, dict)):
+            body[key] = value
+    return size + len(json.dumps(body, default=str).encode())
+
+class FakeRest:
+    """Simulated REST layer: records requests, rate-limits them per bucket and adds latency"""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        route_limits: Optional[Dict[str, Tuple[int, float]]] = None,
+        global_limit: Optional[int] = GLOBAL_LIMIT,
+        realtime: bool = True
+    ):
+        self.latency = latency
+        self.route_limits = ROUTE_LIMITS if route_limits is None else route_limits
+        self.global_limit = global_limit
+        self.realtime = realtime
+        self.clock = 0.0  # Virtual time, only advanced when not realtime
+        self.log: List[RestCall] = []
+        self.calls: Counter = Counter()  # route -> requests
+        self._buckets: Dict[Tuple[str, Any], RateLimitBucket] = {}
+        self._global = RateLimitBucket(global_limit, 1.0) if global_limit else None
+
+    def now(self) -> float:
+        return time.monotonic() if self.realtime else self.clock
+
+    async def request(self, route: str, payload: Optional[Dict[str, Any]] = None, **params) -> RestCall:
+        now = self.now()
+        wait = 0.0
+        limit = self.route_limits.get(route)
+        if limit:
+            major = next((params[key] for key in MAJOR_PARAMETERS if key in params), None)
+            bucket = self._buckets.get((route, major))
+            if bucket is None:
+                bucket = self._buckets[(route, major)] = RateLimitBucket(*limit)
+            wait = bucket.acquire(now)
+        if self._global and not route.startswith('POST /interactions'):
+            wait += self._global.acquire(now + wait)
+
+        call = RestCall(route, params, payload_size(payload), wait, now)
+        self.log.append(call)
+        self.calls[route] += 1
+
+        delay = wait + self.latency
+        if self.realtime:
+            await asyncio.sleep(delay)
+        else:
+            self.clock += delay
+            # Still yield, a real request never completes synchronously
+            await asyncio.sleep(0)
+        return call
+
+    @property
+    def total(self) -> int:
+        return len(self.log)
+
+    def count(self, route: Optional[str] = None) -> int:
+        """Requests made, to one route or in total"""
+        return self.calls[route] if route else self.total
+
+    def summary(self, since: int = 0) -> Dict[str, Any]:
+        """Requests, bytes and rate-limit waits, optionally from log index ``since`` onwards"""
+        calls = self.log[since:]
+        return {
+            'calls': len(calls),
+            'bytes': sum(call.bytes for call in calls),
+            'rate_limit_waits': sum(1 for call in calls if call.waited),
+            'waited': sum(call.waited for call in calls),
+            'routes': dict(Counter(call.route for call in calls).most_common())
+        }
+
+    def reset(self):
+        """Forget recorded calls and rate-limit state"""
+        self.log.clear()
+        self.calls.clear()
+        self._buckets.clear()
+        if self.global_limit:
+            self._global = RateLimitBucket(self.global_limit, 1.0)
+
+class FakeRole:
+    def __init__(self, guild: 'FakeGuild', name: str, role_id: Optional[int] = None):
+        self.guild = guild
+        self.id = role_id or next_id()
+        self.name = name
+
+    @property
+    def mention(self) -> str:
+        return f"<@&{self.id}>"
+
+class FakeMember:
+    def __init__(self, guild: 'FakeGuild', name: str, roles: Iterable[FakeRole] = (), bot: bool = False):
+        self.guild = guild
+        self.id = next_id()
+        self.name = name
+        self.display_name = name
+        self.roles = [guild.default_role, *roles]
+        self.bot = bot
+        self.dm_channel: Optional['FakeDMChannel'] = None
+
+    @property
+    def mention(self) -> str:
+        return f"<@{self.id}>"
+
+    def __str__(self) -> str:
+        return self.name
+
+    async def create_dm(self) -> 'FakeDMChannel':
+        if self.dm_channel is None:
+            await self.guild.rest.request('POST /users/@me/channels')
+            self.dm_channel = FakeDMChannel(self)
+        return self.dm_channel
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> 'FakeMessage':
+        channel = await self.create_dm()
+        return await channel.send(content, **kwargs)
+
+    async def add_roles(self, *roles: FakeRole, reason: Optional[str] = None):
+        for role in roles:
+            await self.guild.rest.request(
+                'PUT /guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                guild_id=self.guild.id, user_id=self.id, role_id=role.id
+            )
+            if role not in self.roles:
+                self.roles.append(role)
+
+    async def remove_roles(self, *roles: FakeRole, reason: Optional[str] = None):
+        for role in roles:
+            await self.guild.rest.request(
+                'DELETE /guilds/{guild_id}/members/{user_id}/roles/{role_id}',
+                guild_id=self.guild.id, user_id=self.id, role_id=role.id
+            )
+            if role in self.roles:
+                self.roles.remove(role)
+
+class FakeMessage:
+    def __init__(self, channel, author: FakeMember, content: Optional[str] = None, **kwargs):
+        self.id = next_id()
+        self.channel = channel
+        self.author = author
+        self.content = content or ""
+        self.embeds = kwargs.get('embeds') or ([kwargs['embed']] if kwargs.get('embed') else [])
+        self.view: Optional[discord.ui.View] = kwargs.get('view')
+        self.mentions: List[FakeMember] = []
+        self.attachments: List[Any] = list(kwargs.get('attachments') or [])
+        self.reactions: List[str] = []
+        self.interaction: Optional['FakeInteraction'] = None  # Set on interaction responses and followups
+
+    @property
+    def guild(self) -> Optional['FakeGuild']:
+        return getattr(self.channel, 'guild', None)
+
+    @property
+    def _rest(self) -> FakeRest:
+        return self.author.guild.rest
+
+    def _apply(self, kwargs: Dict[str, Any]):
+        if 'content' in kwargs:
+            self.content = kwargs['content'] or ""
+        if 'embed' in kwargs or 'embeds' in kwargs:
+            self.embeds = kwargs.get('embeds') or ([kwargs['embed']] if kwargs.get('embed') else [])
+        if 'view' in kwargs:
+            self.view = kwargs['view']
+
+    async def add_reaction(self, emoji: str):
+        await self._rest.request(
+            'PUT /channels/{channel_id}/messages/{message_id}/reactions/{emoji}/@me',
+            channel_id=self.channel.id, message_id=self.id, emoji=emoji
+        )
+        self.reactions.append(emoji)
+
+    async def reply(self, content: Optional[str] = None, **kwargs) -> 'FakeMessage':
+        return await self.channel.send(content, **kwargs)
+
+    async def edit(self, **kwargs) -> 'FakeMessage':
+        if self.interaction:
+            # Interaction messages are edited through the interaction webhook
+            await self._rest.request(
+                'PATCH /webhooks/{application_id}/{interaction_token}/messages/{message_id}', kwargs,
+                interaction_token=self.interaction.token, message_id=self.id
+            )
+        else:
+            await self._rest.request(
+                'PATCH /channels/{channel_id}/messages/{message_id}', kwargs,
+                channel_id=self.channel.id, message_id=self.id
+            )
+        self._apply(kwargs)
+        return self
+
+    async def delete(self):
+        await self._rest.request(
+            'DELETE /channels/{channel_id}/messages/{message_id}',
+            channel_id=self.channel.id, message_id=self.id
+        )
+        if self in self.channel.messages:
+            self.channel.messages.remove(self)
+
+class FakeMessageable:
+    """Sending and receiving for text channels, threads and DMs"""
+
+    async def send(self, content: Optional[str] = None, **kwargs) -> FakeMessage:
+        await self.guild.rest.request(
+            'POST /channels/{channel_id}/messages', {'content': content, **kwargs}, channel_id=self.id
+        )
+        message = FakeMessage(self, self.guild.me, content, **kwargs)
+        self.messages.append(message)
+        return message
+
+    def receive(self, author: FakeMember, content: str = "", attachments: Iterable[Any] = ()) -> FakeMessage:
+        """A message from a user, as the gateway would deliver it (no REST call)"""
+        message = FakeMessage(self, author, content, attachments=attachments)
+        self.messages.append(message)
+        return message
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.guild.rest.request(
+            'GET /channels/{channel_id}/messages/{message_id}', channel_id=self.id, message_id=message_id
+        )
+        for message in self.messages:
+            if message.id == message_id:
+                return message
+        raise LookupError(f"Unknown message {message_id}")
+
+    @property
+    def mention(self) -> str:
+        return f"<#{self.id}>"
+
+    @property
+    def last_message(self) -> Optional[FakeMessage]:
+        return self.messages[-1] if self.messages else None
+
+class FakeDMChannel(FakeMessageable):
+    def __init__(self, recipient: FakeMember):
+        self.id = next_id()
+        self.recipient = recipient
+        self.guild = recipient.guild  # Only used to reach the REST layer
+        self.messages: List[FakeMessage] = []
+
+class FakeThread(FakeMessageable):
+    def __init__(self, parent: 'FakeTextChannel', name: str):
+        self.id = next_id()
+        self.name = name
+        self.parent = parent
+        self.guild = parent.guild
+        self.messages: List[FakeMessage] = []
+        self.members: List[FakeMember] = []
+        self.archived = False
+
+    async def add_user(self, member: FakeMember):
+        await self.guild.rest.request(
+            'PUT /channels/{channel_id}/thread-members/{user_id}', channel_id=self.id, user_id=member.id
+        )
+        self.members.append(member)
+
+    async def edit(self, **kwargs) -> 'FakeThread':
+        await self.guild.rest.request('PATCH /channels/{channel_id}', kwargs, channel_id=self.id)
+        self.archived = kwargs.get('archived', self.archived)
+        self.name = kwargs.get('name', self.name)
+        return self
+
+class FakeTextChannel(FakeMessageable):
+    def __init__(self, guild: 'FakeGuild', name: str, category: Optional['FakeCategory'] = None, overwrites=None):
+        self.id = next_id()
+        self.name = name
+        self.guild = guild
+        self.category = category
+        self.category_id = category.id if category else None
+        self.overwrites = dict(overwrites or {})
+        self.messages: List[FakeMessage] = []
+        self.threads: List[FakeThread] = []
+
+    async def create_thread(self, name: str, **kwargs) -> FakeThread:
+        await self.guild.rest.request('POST /channels/{channel_id}/threads', {'name': name}, channel_id=self.id)
+        thread = FakeThread(self, name)
+        self.threads.append(thread)
+        self.guild._channels[thread.id] = thread
+        return thread
+
+    async def set_permissions(self, target, *, overwrite=None, reason: Optional[str] = None, **permissions):
+        await self.guild.rest.request(
+            'PUT /channels/{channel_id}/permissions/{overwrite_id}', channel_id=self.id, overwrite_id=target.id
+        )
+        self.overwrites[target] = overwrite if overwrite is not None else discord.PermissionOverwrite(**permissions)
+
+    async def edit(self, **kwargs) -> 'FakeTextChannel':
+        await self.guild.rest.request('PATCH /channels/{channel_id}', kwargs, channel_id=self.id)
+        self.name = kwargs.get('name', self.name)
+        return self
+
+    async def delete(self, reason: Optional[str] = None):
+        await self.guild.rest.request('DELETE /channels/{channel_id}', channel_id=self.id)
+        self.guild._remove_channel(self)
+
+class FakeCategory(discord.CategoryChannel):
+    """A category that passes the resolver's ``isinstance`` checks"""
+
+    def __init__(self, guild: 'FakeGuild', name: str, overwrites=None):
+        # State lives here, discord.py's own attributes are never initialised
+        self.guild = guild
+        self.id = next_id()
+        self.name = name
+        self.category_id = None
+        self._fake_overwrites = dict(overwrites or {})
+        self._fake_channels: List[FakeTextChannel] = []
+
+    @property
+    def overwrites(self) -> Dict:
+        return dict(self._fake_overwrites)
+
+    @property
+    def channels(self) -> List[FakeTextChannel]:
+        return list(self._fake_channels)
+
+    def __repr__(self) -> str:
+        return f"<FakeCategory id={self.id} name={self.name!r}>"
+
+    async def create_text_channel(self, name: str, overwrites=None, **kwargs) -> FakeTextChannel:
+        await self.guild.rest.request('POST /guilds/{guild_id}/channels', {'name': name}, guild_id=self.guild.id)
+        return self.guild._add_text_channel(name, self, overwrites)
+
+class FakeGuild:
+    def __init__(self, rest: FakeRest, name: str = "Blackspire Nation"):
+        self.rest = rest
+        self.id = next_id()
+        self.name = name
+        self.icon = None
+        self._channels: Dict[int, Any] = {}
+        self._members: Dict[int, FakeMember] = {}
+        self._roles: Dict[int, FakeRole] = {}
+        self.categories: List[FakeCategory] = []
+        self.default_role = FakeRole(self, "@everyone", role_id=self.id)
+        self._roles[self.default_role.id] = self.default_role
+        self.me = self.add_member("Blackspire", bot=True)
+
+    @property
+    def text_channels(self) -> List[FakeTextChannel]:
+        return [channel for channel in self._channels.values() if isinstance(channel, FakeTextChannel)]
+
+    @property
+    def roles(self) -> List[FakeRole]:
+        return list(self._roles.values())
+
+    @property
+    def members(self) -> List[FakeMember]:
+        return list(self._members.values())
+
+    def get_channel(self, channel_id: int):
+        return self._channels.get(channel_id)
+
+    def get_member(self, user_id: int) -> Optional[FakeMember]:
+        return self._members.get(user_id)
+
+    def get_role(self, role_id: int) -> Optional[FakeRole]:
+        return self._roles.get(role_id)
+
+    def add_role(self, name: str) -> FakeRole:
+        """Add a role without a REST call, as if it came from the gateway"""
+        role = FakeRole(self, name)
+        self._roles[role.id] = role
+        return role
+
+    def add_member(self, name: str, roles: Iterable[FakeRole] = (), bot: bool = False) -> FakeMember:
+        """Add a member without a REST call, as if it came from the gateway"""
+        member = FakeMember(self, name, roles, bot)
+        self._members[member.id] = member
+        return member
+
+    def add_text_channel(self, name: str, category: Optional[FakeCategory] = None) -> FakeTextChannel:
+        """Add a channel without a REST call, as if it came from the gateway"""
+        return self._add_text_channel(name, category)
+
+    async def create_category(self, name: str, overwrites=None, **kwargs) -> FakeCategory:
+        await self.rest.request('POST /guilds/{guild_id}/channels', {'name': name}, guild_id=self.id)
+        category = FakeCategory(self, name, overwrites)
+        self.categories.append(category)
+        self._channels[category.id] = category
+        return category
+
+    def _add_text_channel(self, name: str, category: Optional[FakeCategory], overwrites=None) -> FakeTextChannel:
+        channel = FakeTextChannel(self, name, category, overwrites)
+        self._channels[channel.id] = channel
+        if category:
+            category._fake_channels.append(channel)
+        return channel
+
+    def _remove_channel(self, channel: FakeTextChannel):
+        self._channels.pop(channel.id, None)
+        for thread in channel.threads:
+            self._channels.pop(thread.id, None)
+        if channel.category and channel in channel.category._fake_channels:
+            channel.category._fake_channels.remove(channel)
+
+class FakeInteractionResponse:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+        self._done = False
+
+    def is_done(self) -> bool:
+        return self._done
+
+    async def _respond(self, payload: Optional[Dict[str, Any]] = None):
+        if self._done:
+            raise RuntimeError("This interaction has already been responded to before")
+        self._done = True
+        interaction = self._interaction
+        await interaction.guild.rest.request(
+            'POST /interactions/{interaction_id}/{interaction_token}/callback', payload,
+            interaction_id=interaction.id, interaction_token=interaction.token
+        )
+
+    async def defer(self, **kwargs):
+        await self._respond()
+
+    async def send_message(self, content: Optional[str] = None, *, ephemeral: bool = False, **kwargs):
+        await self._respond({'content': content, **kwargs})
+        interaction = self._interaction
+        message = FakeMessage(interaction.channel, interaction.guild.me, content, **kwargs)
+        message.interaction = interaction
+        interaction._original = message
+        if not ephemeral and interaction.channel is not None:
+            interaction.channel.messages.append(message)
+
+    async def edit_message(self, **kwargs):
+        await self._respond(kwargs)
+        if self._interaction.message is not None:
+            self._interaction.message._apply(kwargs)
+
+    async def send_modal(self, modal: discord.ui.Modal):
+        await self._respond()
+        self._interaction.modal = modal
+
+class FakeFollowup:
+    def __init__(self, interaction: 'FakeInteraction'):
+        self._interaction = interaction
+
+    async def send(self, content: Optional[str] = None, *, ephemeral: bool = False, **kwargs) -> FakeMessage:
+        interaction = self._interaction
+        await interaction.guild.rest.request(
+            'POST /webhooks/{application_id}/{interaction_token}', {'content': content, **kwargs},
+            interaction_token=interaction.token
+        )
+        message = FakeMessage(interaction.channel, interaction.guild.me, content, **kwargs)
+        message.interaction = interaction
+        interaction.followups.append(message)
+        if not ephemeral and interaction.channel is not None:
+            interaction.channel.messages.append(message)
+        return message
+
+class FakeInteraction:
+    """A component or command interaction from ``user`` in ``channel``"""
+
+    def __init__(
+        self,
+        guild: FakeGuild,
+        user: FakeMember,
+        channel,
+        message: Optional[FakeMessage] = None,
+        data: Optional[Dict] = None,
+        client=None
+    ):
+        self.id = next_id()
+        self.token = f"token-{self.id}"
+        self.client = client
+        self.guild = guild
+        self.guild_id = guild.id
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id if channel else None
+        self.message = message
+        self.data = data or {}
+        self.response = FakeInteractionResponse(self)
+        self.followup = FakeFollowup(self)
+        self.followups: List[FakeMessage] = []
+        self.modal: Optional[discord.ui.Modal] = None
+        self._original: Optional[FakeMessage] = None
+
+    @property
+    def response_message(self) -> Optional[FakeMessage]:
+        """The message sent as the interaction's response, without a REST call"""
+        return self._original
+
+    async def original_response(self) -> FakeMessage:
+        await self.guild.rest.request(
+            'GET /webhooks/{application_id}/{interaction_token}/messages/@original', interaction_token=self.token
+        )
+        if self._original is None:
+            raise LookupError("The interaction has no response message")
+        return self._original
+
+    async def edit_original_response(self, **kwargs) -> FakeMessage:
+        message = await self.original_response()
+        return await message.edit(**kwargs)
+
+def find_item(view: discord.ui.View, name: str) -> discord.ui.Item:
+    """Find a view's component by label, custom ID or callback name"""
+    for item in view.children:
+        # Decorated callbacks are wrapped, the wrapper keeps the function
+        callback = getattr(item.callback, 'callback', item.callback)
+        if name in (getattr(item, 'label', None), getattr(item, 'custom_id', None), getattr(callback, '__name__', None)):
+            return item
+    raise LookupError(f"{type(view).__name__} has no component {name!r}")
+
+async def click(
+    view: discord.ui.View,
+    name: str,
+    interaction: FakeInteraction,
+    values: Optional[Iterable[str]] = None
+):
+    """Use a button, or pick ``values`` in a select, the way discord.py dispatches it"""
+    item = find_item(view, name)
+    interaction.data = {'custom_id': getattr(item, 'custom_id', None), 'component_type': item.type.value}
+    if values is not None:
+        interaction.data['values'] = list(values)
+        item._values = list(values)
+    if await view.interaction_check(interaction):
+        await item.callback(interaction)
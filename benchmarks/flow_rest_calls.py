@@ -0,0 +1,134 @@
+"""
+Report: Discord REST calls spent by each user-facing flow, driven offline.
+
+Runs the real views and handlers through the fake transport in
+benchmarks/fake_discord.py with a virtual clock, so every run records the
+same calls. Flows are chained the way a user meets them: the join-clan
+panel button, the application submission, the clan leader's accept, and
+deploying an individual panel from the main dashboard. For each flow it
+prints requests, request bytes, rate-limit waits and the simulated time at
+--latency-ms per request. tests/test_flow_rest_calls.py pins the same
+counts.
+
+    python -m benchmarks.flow_rest_calls --routes
+"""
+import argparse
+import asyncio
+import json
+from typing import Awaitable, Callable, Dict
+import discord
+
+from benchmarks.clash_king_stub import player_stats_payload
+from benchmarks.fake_discord import FakeInteraction, FakeMessage, FakeRest, click
+from benchmarks.flows_bench import APPLICATION_CLAN_TYPES, Environment, connect_mongo
+from cogs.dashboards.main_dashboard.TICKETS.join_clan import ClanDecisionView, FinalConfirmationView, JoinClanTicket
+from cogs.dashboards.main_dashboard.main_dashboard import MainDashboardView
+
+async def measure(rest: FakeRest, flow: Callable[[], Awaitable[None]]) -> Dict:
+    """Run one flow and summarise the requests it made"""
+    since, started = rest.total, rest.clock
+    await flow()
+    summary = rest.summary(since)
+    summary['simulated_ms'] = (rest.clock - started) * 1000
+    return summary
+
+def make_clan(n: int, leader, leadership_role) -> Dict:
+    return {
+        '_id': f"clan-{n}",
+        'name': f"BSN {n + 1}",
+        'clan_type': APPLICATION_CLAN_TYPES[n % len(APPLICATION_CLAN_TYPES)],
+        'min_town_hall': 10,
+        'leader_id': leader.id,
+        'leadership_role_id': leadership_role.id,
+        'invite_link': f"https://link.clashofclans.com/en?action=OpenClanProfile&tag=2BSN{n}"
+    }
+
+async def run(args: argparse.Namespace) -> Dict[str, Dict]:
+    mongo, _, db_name = await connect_mongo(args.mongo_uri)
+    rest = FakeRest(args.latency_ms / 1000, realtime=False)
+    env = Environment(mongo, rest)
+    guild = env.guild
+    leadership_role = guild.add_role("BSN Leadership")
+    leader = guild.add_member("clan-leader", roles=[leadership_role])
+    applicant = guild.add_member("applicant")
+    await mongo.add_ticket_staff('join_clan', guild.id, role_id=env.staff_role.id)
+    handler = JoinClanTicket(env.bot)
+    results = {}
+
+    try:
+        async def panel_button():
+            await handler.start_ticket(FakeInteraction(guild, applicant, env.panel))
+
+        results['join_clan_panel_button'] = await measure(rest, panel_button)
+        channel = discord.utils.get(guild.text_channels, name=f"{handler.get_ticket_type()}-{applicant.name}")
+        thread = channel.threads[0]
+
+        # The answers collected by the earlier application steps
+        player_data = [handler.parse_player_data(player_stats_payload(f"P{n}")) for n in range(args.accounts)]
+        selected_clans = [make_clan(n, leader, leadership_role) for n in range(args.accounts)]
+        confirmation = FakeMessage(channel, guild.me, view=FinalConfirmationView(
+            env.bot, handler, 'Europe', '17-25', player_data,
+            [clan['clan_type'] for clan in selected_clans], thread, selected_clans
+        ))
+
+        async def submission():
+            await click(confirmation.view, "Confirm & Submit", FakeInteraction(guild, applicant, channel, confirmation))
+
+        results['join_clan_submission'] = await measure(rest, submission)
+        decision = next(message for message in thread.messages if isinstance(message.view, ClanDecisionView))
+
+        async def accept():
+            await click(decision.view, "Accept Player", FakeInteraction(guild, leader, thread, decision))
+
+        results['clan_accept'] = await measure(rest, accept)
+
+        async def panel_deployment():
+            interaction = FakeInteraction(guild, env.staff, env.panel)
+            await click(MainDashboardView(env.bot), "Deploy Panels", interaction)
+            message = interaction.response_message
+
+            interaction = FakeInteraction(guild, env.staff, env.panel, message)
+            await click(message.view, "Deploy Individual Panels", interaction)
+            message = interaction.response_message
+
+            await click(
+                message.view, "individual_panel_callback",
+                FakeInteraction(guild, env.staff, env.panel, message), values=["deploy_help_support"]
+            )
+            await click(
+                message.view, "item_selected",
+                FakeInteraction(guild, env.staff, env.panel, message), values=[str(env.panel.id)]
+            )
+
+        results['panel_deployment'] = await measure(rest, panel_deployment)
+    finally:
+        await mongo.client.drop_database(db_name)
+        mongo.client.close()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Count the Discord REST calls of each flow")
+    parser.add_argument('--mongo-uri', default=None, help="Local mongod, default mongomock-motor")
+    parser.add_argument('--latency-ms', type=float, default=100.0, help="Simulated REST round trip")
+    parser.add_argument('--accounts', type=int, default=3, help="Player accounts in the application")
+    parser.add_argument('--routes', action='store_true', help="List requests per route")
+    parser.add_argument('--output', help="Also write the results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    print(f"{'flow':<24} {'calls':>5} {'bytes':>7} {'waits':>5} {'simulated':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:<24} {result['calls']:>5} {result['bytes']:>7} "
+            f"{result['rate_limit_waits']:>5} {result['simulated_ms']:>7.0f} ms"
+        )
+        if args.routes:
+            for route, count in result['routes'].items():
+                print(f"    {count:>3}  {route}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
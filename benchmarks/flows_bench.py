@@ -0,0 +1,358 @@
+"""
+Benchmark: the bot's core flows end to end, with latency percentiles and throughput.
+
+Drives the real cog and handler code against MongoDB and fake Discord objects:
+- counting bursts through CountingSystem.on_message, one ordered burst per channel
+- concurrent dashboard and command permission checks
+- ticket open/close cycles through BaseTicketHandler.start_ticket and /close_ticket
+- join-clan applications: ticket, Clash King stats from a local stub, clan
+  ranking and the staff summary
+
+MongoDB is a local mongod when --mongo-uri (or BENCH_MONGO_URI) is given,
+otherwise mongomock-motor; a throwaway database is dropped afterwards.
+Discord REST calls take --rest-latency-ms each and only wait on rate-limit
+buckets with --rate-limits, so by default the numbers are the bot's own
+cost. Results are printed and written as JSON, so runs before and after a
+change can be compared.
+
+    python -m benchmarks.flows_bench --output before.json
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+import discord
+
+from benchmarks.clan_ranking_bench import make_clans
+from benchmarks.clash_king_stub import ClashKingStub
+from benchmarks.fake_discord import FakeGuild, FakeInteraction, FakeMessage, FakeRest, FakeRole
+from cogs.counting_system.counting_system import CountingSystem
+from cogs.dashboards.main_dashboard.TICKETS.join_clan import FinalConfirmationView, JoinClanTicket
+from cogs.slash_commands.close_ticket import CloseTicket
+from utils.clan_catalog import ClanCatalog
+from utils.data_manager import DataManager
+from utils.mongo_manager import MongoManager
+from utils.questionnaire import QuestionnaireEngine
+from utils.reply_dispatcher import ReplyDispatcher
+from utils.staff_roster import StaffRosterCache
+from utils.ticket_categories import TicketCategoryResolver
+
+APPLICATION_CLAN_TYPES = ['regular', 'cruise', 'fwa/gfl']
+
+class FakeTranscripts:
+    """Deletes closed ticket channels in the background instead of exporting them"""
+
+    def __init__(self):
+        self._tasks = set()
+
+    def enqueue(self, channel, delete_after: bool = False) -> bool:
+        if delete_after:
+            task = asyncio.create_task(channel.delete())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def drain(self):
+        await asyncio.gather(*self._tasks)
+
+class BenchBot:
+    """The parts of BlackspireBot the benchmarked flows use, wired like setup_hook"""
+
+    def __init__(self, mongo_manager, guild: FakeGuild):
+        self.mongo_manager = mongo_manager
+        self.guilds = [guild]
+        self.clan_catalog = ClanCatalog(mongo_manager)
+        self.data_manager = DataManager(mongo_manager, self.clan_catalog)
+        self.ticket_categories = TicketCategoryResolver(mongo_manager)
+        self.staff_rosters = StaffRosterCache(mongo_manager)
+        self.reply_dispatcher = ReplyDispatcher()
+        self.questionnaires = QuestionnaireEngine(self)
+        self.transcripts = FakeTranscripts()
+
+class Environment:
+    def __init__(self, mongo_manager, rest: FakeRest):
+        self.mongo = mongo_manager
+        self.rest = rest
+        self.guild = FakeGuild(rest)
+        self.staff_role = FakeRole(self.guild, "Staff")
+        self.staff = self.guild.add_member("staff", roles=[self.staff_role])
+        self.panel = self.guild.add_text_channel("tickets")
+        self.bot = BenchBot(mongo_manager, self.guild)
+
+def percentile(ordered: List[float], q: float) -> float:
+    """Nearest-rank percentile of sorted values"""
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+def summarize(latencies: List[float], wall: float, rest_calls: int = 0) -> Dict[str, float]:
+    ordered = sorted(latencies)
+    if not ordered:
+        return {'operations': 0}
+    return {
+        'operations': len(ordered),
+        'p50_ms': percentile(ordered, 0.50) * 1000,
+        'p99_ms': percentile(ordered, 0.99) * 1000,
+        'mean_ms': statistics.fmean(ordered) * 1000,
+        'max_ms': ordered[-1] * 1000,
+        'throughput_per_s': len(ordered) / wall if wall else 0.0,
+        'rest_calls_per_op': rest_calls / len(ordered),
+        'wall_s': wall
+    }
+
+async def run_concurrent(
+    operation: Callable[[int], Awaitable[None]],
+    count: int,
+    concurrency: int
+) -> Tuple[List[float], float]:
+    """Run ``operation(i)`` for every i with at most ``concurrency`` in flight, timing each"""
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(i: int):
+        async with semaphore:
+            started = time.perf_counter()
+            await operation(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(timed(i) for i in range(count)))
+    return latencies, time.perf_counter() - started
+
+async def bench_counting(env: Environment, channels: int, messages: int) -> Dict:
+    """Ordered bursts in several counting channels at once, alternating two counters"""
+    counting_channels = [env.guild.add_text_channel(f"counting-{i}") for i in range(channels)]
+    for channel in counting_channels:
+        await env.mongo.setup_counting(env.guild.id, channel.id)
+    cog = CountingSystem(env.bot)
+    await cog._initialize_cache()
+    counters = [env.guild.add_member("counter-a"), env.guild.add_member("counter-b")]
+
+    latencies = []
+    rest_before = env.rest.total
+
+    async def burst(channel):
+        for number in range(1, messages + 1):
+            message = FakeMessage(channel, counters[number % 2], str(number))
+            started = time.perf_counter()
+            await cog.on_message(message)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(burst(channel) for channel in counting_channels))
+    result = summarize(latencies, time.perf_counter() - started, env.rest.total - rest_before)
+    # A wrong number resets the count, so anything short of the full burst means an error path ran
+    result['valid'] = all(cog.channel_counts.get(channel.id) == messages for channel in counting_channels)
+    return result
+
+async def bench_permissions(env: Environment, checks: int, concurrency: int) -> Dict:
+    """Dashboard and command checks for a mix of staff and regular members"""
+    await env.mongo.add_dashboard_permission('clan_dashboard', env.guild.id, role_id=env.staff_role.id)
+    await env.mongo.db.command_permissions.insert_one({
+        'command_name': 'close_ticket',
+        'guild_id': env.guild.id,
+        'role_id': env.staff_role.id
+    })
+    members = [
+        env.guild.add_member(f"member-{i}", roles=[env.staff_role] if i % 2 else [])
+        for i in range(50)
+    ]
+
+    async def check(i: int):
+        member = members[(i // 2) % len(members)]
+        roles = [role.id for role in member.roles]
+        if i % 2:
+            await env.mongo.check_dashboard_permission('clan_dashboard', member.id, roles, env.guild.id)
+        else:
+            await env.mongo.check_command_permission('close_ticket', member.id, roles, env.guild.id)
+
+    latencies, wall = await run_concurrent(check, checks, concurrency)
+    return summarize(latencies, wall)
+
+async def bench_tickets(env: Environment, cycles: int, concurrency: int) -> Dict[str, Dict]:
+    """Open a join-clan ticket from the panel, then close it as staff"""
+    handler = JoinClanTicket(env.bot)
+    close_cog = CloseTicket(env.bot)
+    opens, closes = [], []
+    failures = 0
+    rest_before = env.rest.total
+
+    async def cycle(i: int):
+        nonlocal failures
+        user = env.guild.add_member(f"ticket-user-{i}")
+        started = time.perf_counter()
+        await handler.start_ticket(FakeInteraction(env.guild, user, env.panel))
+        opened = time.perf_counter()
+
+        channel = discord.utils.get(env.guild.text_channels, name=f"{handler.get_ticket_type()}-{user.name}")
+        if channel is None:
+            failures += 1
+            return
+        closing = time.perf_counter()
+        await close_cog.close_ticket.callback(close_cog, FakeInteraction(env.guild, env.staff, channel), "Benchmark")
+        opens.append(opened - started)
+        closes.append(time.perf_counter() - closing)
+
+    latencies, wall = await run_concurrent(cycle, cycles, concurrency)
+    await env.bot.transcripts.drain()
+    result = {
+        'ticket_cycle': summarize(latencies, wall, env.rest.total - rest_before),
+        'ticket_open': summarize(opens, wall),
+        'ticket_close': summarize(closes, wall)
+    }
+    result['ticket_cycle']['failures'] = failures
+    return result
+
+async def bench_applications(
+    env: Environment,
+    applications: int,
+    concurrency: int,
+    accounts: int,
+    clash_king_url: str
+) -> Dict:
+    """A full join-clan submission with ``accounts`` player tags"""
+    handler = JoinClanTicket(env.bot)
+    handler.clash_king_base = clash_king_url
+    for clan in make_clans():
+        await env.mongo.save_clan_data(clan, env.guild.id)
+    await env.mongo.add_ticket_staff('join_clan', env.guild.id, role_id=env.staff_role.id)
+    rest_before = env.rest.total
+
+    async def apply(i: int):
+        user = env.guild.add_member(f"applicant-{i}")
+        await handler.start_ticket(FakeInteraction(env.guild, user, env.panel))
+        channel = discord.utils.get(env.guild.text_channels, name=f"{handler.get_ticket_type()}-{user.name}")
+        thread = channel.threads[0] if channel.threads else channel
+
+        # Tags are entered one at a time, so stats are fetched one after another
+        player_data = [await handler.get_player_stats(f"#P{i}A{n}") for n in range(accounts)]
+        clan_types = [APPLICATION_CLAN_TYPES[n % len(APPLICATION_CLAN_TYPES)] for n in range(accounts)]
+        matches = await env.bot.clan_catalog.ranked_matches(
+            env.guild.id,
+            [(clan_type, player['town_hall_level']) for player, clan_type in zip(player_data, clan_types)],
+            continent='Europe'
+        )
+        selected_clans = [ranked[0] if ranked else {} for ranked in matches]
+
+        view = FinalConfirmationView(
+            env.bot, handler, 'Europe', '17-25', player_data, clan_types, thread, selected_clans
+        )
+        await view.confirm_application.callback(FakeInteraction(env.guild, user, channel))
+
+    latencies, wall = await run_concurrent(apply, applications, concurrency)
+    return summarize(latencies, wall, env.rest.total - rest_before)
+
+async def connect_mongo(uri: Optional[str]) -> Tuple[MongoManager, str, str]:
+    """A MongoManager on a throwaway database of a local mongod or mongomock-motor"""
+    os.environ.setdefault('MONGO_URI', uri or 'mongodb://localhost:27017')
+    os.environ.setdefault('MONGO_DB_NAME', 'blackspire_bench')
+    os.environ.setdefault('BOT_OWNER_ID', '0')
+    mongo = MongoManager()
+
+    if uri:
+        from motor import motor_asyncio
+        mongo.client = motor_asyncio.AsyncIOMotorClient(uri)
+        backend = 'mongod'
+    else:
+        try:
+            from mongomock_motor import AsyncMongoMockClient
+        except ImportError:
+            raise SystemExit("Install mongomock-motor or pass --mongo-uri for a local mongod")
+        mongo.client = AsyncMongoMockClient()
+        backend = 'mongomock-motor'
+
+    db_name = f"blackspire_bench_{os.getpid()}"
+    mongo.db = mongo.client[db_name]
+    await mongo._initialize_collections()
+    return mongo, backend, db_name
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def make_rest(args: argparse.Namespace) -> FakeRest:
+    if args.rate_limits:
+        return FakeRest(args.rest_latency_ms / 1000)
+    return FakeRest(args.rest_latency_ms / 1000, route_limits={}, global_limit=None)
+
+async def run(args: argparse.Namespace) -> Dict:
+    mongo, backend, db_name = await connect_mongo(args.mongo_uri)
+    stub = ClashKingStub(args.clash_king_latency_ms / 1000)
+    clash_king_url = await stub.start()
+    results = {}
+    try:
+        # Each scenario gets its own guild so earlier data does not skew later ones
+        results['counting'] = await bench_counting(
+            Environment(mongo, make_rest(args)), args.counting_channels, args.counting_messages
+        )
+        results['permission_checks'] = await bench_permissions(
+            Environment(mongo, make_rest(args)), args.permission_checks, args.permission_concurrency
+        )
+        results.update(await bench_tickets(
+            Environment(mongo, make_rest(args)), args.tickets, args.ticket_concurrency
+        ))
+        results['join_clan_application'] = await bench_applications(
+            Environment(mongo, make_rest(args)),
+            args.applications, args.application_concurrency, args.accounts, clash_king_url
+        )
+    finally:
+        await stub.stop()
+        await mongo.client.drop_database(db_name)
+        mongo.client.close()
+
+    return {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'mongo_backend': backend,
+            'parameters': vars(args)
+        },
+        'results': results
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the bot's core flows")
+    parser.add_argument('--output', default='flows_bench.json', help="JSON results file")
+    parser.add_argument('--mongo-uri', default=os.getenv('BENCH_MONGO_URI'), help="Local mongod, default mongomock-motor")
+    parser.add_argument('--rest-latency-ms', type=float, default=0.0, help="Simulated Discord REST round trip")
+    parser.add_argument('--rate-limits', action='store_true', help="Wait on simulated Discord rate-limit buckets")
+    parser.add_argument('--clash-king-latency-ms', type=float, default=0.0, help="Clash King stub response delay")
+    parser.add_argument('--counting-channels', type=int, default=10)
+    parser.add_argument('--counting-messages', type=int, default=200, help="Messages per counting channel")
+    parser.add_argument('--permission-checks', type=int, default=5000)
+    parser.add_argument('--permission-concurrency', type=int, default=100)
+    parser.add_argument('--tickets', type=int, default=200)
+    parser.add_argument('--ticket-concurrency', type=int, default=20)
+    parser.add_argument('--applications', type=int, default=100)
+    parser.add_argument('--application-concurrency', type=int, default=10)
+    parser.add_argument('--accounts', type=int, default=2, help="Player tags per application")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    for name, result in report['results'].items():
+        if not result.get('operations'):
+            print(f"{name:<24} no operations")
+            continue
+        print(
+            f"{name:<24} {result['operations']:>6} ops  p50 {result['p50_ms']:8.2f} ms  "
+            f"p99 {result['p99_ms']:8.2f} ms  {result['throughput_per_s']:9.1f} ops/s  "
+            f"{result['rest_calls_per_op']:5.1f} REST/op"
+        )
+
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"results written to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: per-message listener cost with 1,000 pending reply waits.
+
+Compares discord.py's wait_for model (every pending predicate is evaluated
+for every message) with ReplyDispatcher (one dict lookup per message).
+
+    python -m benchmarks.reply_dispatcher_bench
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from utils.reply_dispatcher import ReplyDispatcher
+
+PENDING_WAITS = 1000
+MESSAGES = 20000
+
+def make_message(channel_id: int, user_id: int):
+    return SimpleNamespace(
+        channel=SimpleNamespace(id=channel_id),
+        author=SimpleNamespace(id=user_id),
+        content="hello",
+        mentions=[],
+        attachments=[]
+    )
+
+def bench_predicate_scan() -> float:
+    """wait_for style: evaluate every pending check against each message"""
+    checks = []
+    for i in range(PENDING_WAITS):
+        def check(m, channel_id=i, user_id=i):
+            return m.author.id == user_id and m.channel.id == channel_id and m.mentions
+        checks.append(check)
+
+    # Unrelated traffic: no waiter matches
+    message = make_message(-1, -1)
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        for check in checks:
+            check(message)
+    return (time.perf_counter() - start) / MESSAGES
+
+async def bench_dispatcher() -> float:
+    """ReplyDispatcher: one dict lookup per message"""
+    dispatcher = ReplyDispatcher()
+    tasks = [
+        asyncio.create_task(dispatcher.wait_for_reply(i, i, check=lambda m: m.mentions))
+        for i in range(PENDING_WAITS)
+    ]
+    await asyncio.sleep(0)
+    assert dispatcher.pending == PENDING_WAITS
+
+    message = make_message(-1, -1)
+    start = time.perf_counter()
+    for _ in range(MESSAGES):
+        dispatcher.dispatch(message)
+    elapsed = (time.perf_counter() - start) / MESSAGES
+
+    # Resolve every waiter so the tasks finish cleanly
+    for i in range(PENDING_WAITS):
+        reply = make_message(i, i)
+        reply.mentions = [object()]
+        dispatcher.dispatch(reply)
+    await asyncio.gather(*tasks)
+    assert dispatcher.pending == 0
+    return elapsed
+
+def main():
+    scan = bench_predicate_scan()
+    lookup = asyncio.run(bench_dispatcher())
+    print(f"pending waits:        {PENDING_WAITS}")
+    print(f"wait_for predicates:  {scan * 1e6:9.2f} µs/message")
+    print(f"ReplyDispatcher:      {lookup * 1e6:9.2f} µs/message")
+    print(f"speedup:              {scan / lookup:9.0f}x")
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,18 @@
+import logging
 import discord
 from discord.ext import commands
 import asyncio
+import time
 from typing import Dict, Set, Optional
+from utils.metrics import FAST_BUCKETS, metrics
+from utils.structured_logging import bind_interaction
+
+log = logging.getLogger(__name__)
+
+# Resolved once so recording a sample stays a single call
+COUNTING_MESSAGE_SECONDS = metrics.histogram(
+    'counting_message_seconds', 'Time to handle a message in a counting channel', buckets=FAST_BUCKETS
+)
 
 class CountingSystem(commands.Cog):
     def __init__(self, bot):
@@ -25,9 +36,9 @@ class CountingSystem(commands.Cog):
                 for channel in channels:
                     self.channel_counts[channel['channel_id']] = channel['current_count']
                     self.last_counters[channel['channel_id']] = channel.get('last_counter')
-            print("Counting system cache initialized successfully")
+            log.info("Counting system cache initialized successfully")
         except Exception as e:
-            print(f"Error initializing counting cache: {str(e)}")
+            log.error("Error initializing counting cache: %s", e)
 
     @commands.Cog.listener()
     async def on_message(self, message: discord.Message):
@@ -40,6 +51,8 @@ class CountingSystem(commands.Cog):
            message.channel.id not in self.counting_channels[message.guild.id]:
             return
 
+        started = time.perf_counter()
+        bind_interaction(message)
         try:
             # Try to convert message to number
             try:
@@ -84,7 +97,7 @@ class CountingSystem(commands.Cog):
             # Update count in cache and database
             self.channel_counts[message.channel.id] = number
             self.last_counters[message.channel.id] = message.author.id
-            await self.mongo.update_count(message.channel.id, number, message.author.id)
+            await self.mongo.update_count(message.guild.id, message.channel.id, number, message.author.id)
 
             # Add success reaction
             await message.add_reaction('✅')
@@ -97,7 +110,9 @@ class CountingSystem(commands.Cog):
                 await message.reply(f"🎉 Congratulations! You've reached {number}!")
 
         except Exception as e:
-            print(f"Error in counting system: {str(e)}")
+            log.error("Error in counting system: %s", e)
+        finally:
+            COUNTING_MESSAGE_SECONDS.observe(time.perf_counter() - started)
 
     @commands.command(name="countingstats")
     async def counting_stats(self, ctx):
@@ -156,7 +171,7 @@ class CountingSystem(commands.Cog):
             await ctx.reply(embed=embed)
 
         except Exception as e:
-            print(f"Error showing counting stats: {str(e)}")
+            log.error("Error showing counting stats: %s", e)
             await ctx.reply("An error occurred while getting counting statistics.")
 
     @commands.Cog.listener()
@@ -6,6 +6,7 @@ from discord.ext import commands
 from discord import app_commands
 import asyncio
 import os
+from datetime import timezone
 
 class AdminDashboard(commands.Cog):
     def __init__(self, bot):
@@ -79,8 +80,9 @@ class AdminMainView(discord.ui.View):
     @discord.ui.button(label="System Statistics", style=discord.ButtonStyle.secondary, emoji="📊")
     async def system_stats(self, interaction: discord.Interaction, button: discord.ui.Button):
         try:
-            # Get stats asynchronously
+            # One cached round of aggregations, repeated clicks within 30s are free
             stats = await self.mongo.get_system_stats()
+            collections = stats.get('collections', {})
 
             embed = discord.Embed(
                 title="📊 System Statistics",
@@ -93,20 +95,76 @@ class AdminMainView(discord.ui.View):
             embed.add_field(name="👥 Total Users", value=len(self.bot.users), inline=True)
             embed.add_field(name="🔧 Commands Loaded", value=len(self.bot.tree.get_commands()), inline=True)
 
-            # Get database stats asynchronously
-            dashboard_perms = await self.mongo.db.dashboard_permissions.count_documents({})
-            command_perms = await self.mongo.db.command_permissions.count_documents({})
-            ticket_configs = await self.mongo.db.ticket_config.count_documents({})
+            embed.add_field(name="🔐 Dashboard Permissions", value=collections.get('dashboard_permissions', 'N/A'), inline=True)
+            embed.add_field(name="⚡ Command Permissions", value=collections.get('command_permissions', 'N/A'), inline=True)
+            embed.add_field(name="🎫 Ticket Configurations", value=collections.get('ticket_config', 'N/A'), inline=True)
 
-            embed.add_field(name="🔐 Dashboard Permissions", value=dashboard_perms, inline=True)
-            embed.add_field(name="⚡ Command Permissions", value=command_perms, inline=True)  
-            embed.add_field(name="🎫 Ticket Configurations", value=ticket_configs, inline=True)
+            embed.add_field(
+                name="🎟️ Tickets by Status",
+                value=self._format_counts(stats.get('tickets_by_status', {})) +
+                      f"\n📦 Archived: {collections.get('tickets_archive', 'N/A')}",
+                inline=True
+            )
+            embed.add_field(
+                name="🗂️ Tickets by Type",
+                value=self._format_counts(stats.get('tickets_by_type', {})),
+                inline=True
+            )
+
+            clans_per_guild = {
+                (self.bot.get_guild(guild_id).name if self.bot.get_guild(guild_id) else str(guild_id)): count
+                for guild_id, count in stats.get('clans_per_guild', {}).items()
+            }
+            embed.add_field(name="⚔️ Clans per Server", value=self._format_counts(clans_per_guild), inline=True)
+
+            counting = stats.get('counting', {})
+            last_activity = counting.get('last_activity')
+            embed.add_field(
+                name="🔢 Counting Activity",
+                value=(
+                    f"Channels: {counting.get('enabled', 0)}/{counting.get('channels', 0)} enabled\n"
+                    f"Total Counted: {counting.get('total_counted', 0)}\n"
+                    f"Last Count: {discord.utils.format_dt(last_activity.replace(tzinfo=timezone.utc), 'R') if last_activity else 'Never'}"
+                ),
+                inline=True
+            )
+
+            embed.add_field(name="🧠 Cache Hit Rates", value=self._format_cache_rates(), inline=True)
+
+            if stats.get('computed_at'):
+                embed.set_footer(text=f"Database stats from {stats['computed_at'].strftime('%H:%M:%S')} UTC")
 
             await interaction.response.send_message(embed=embed, view=self, ephemeral=True)
             
         except Exception as e:
             await interaction.followup.send(f"Error fetching stats: {str(e)}", ephemeral=True)
 
+    @staticmethod
+    def _format_counts(counts: dict, limit: int = 10) -> str:
+        """Format a name -> count mapping, largest first"""
+        if not counts:
+            return "None"
+        ordered = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+        lines = [f"{str(name).replace('_', ' ').title()}: {count}" for name, count in ordered[:limit]]
+        if len(ordered) > limit:
+            lines.append(f"...and {len(ordered) - limit} more")
+        return "\n".join(lines)
+
+    def _format_cache_rates(self) -> str:
+        """Hit rates of the in-process caches"""
+        lines = []
+        for name, cache in (
+            ("Staff Rosters", self.bot.staff_rosters),
+            ("Ticket Categories", self.bot.ticket_categories),
+            ("Clan Catalog", self.bot.clan_catalog)
+        ):
+            lookups = cache.hits + cache.misses if cache else 0
+            if lookups:
+                lines.append(f"{name}: {cache.hits / lookups:.0%} of {lookups}")
+            else:
+                lines.append(f"{name}: No lookups")
+        return "\n".join(lines)
+
 class DashboardUserManagementView(discord.ui.View):
     def __init__(self, bot):
         super().__init__(timeout=300)
@@ -262,10 +320,12 @@ class DashboardDropdown(discord.ui.Select):
             await interaction.response.edit_message(embed=embed, view=None)
 
             def check(m):
-                return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.mentions
+                return m.mentions
 
             try:
-                msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+                msg = await self.bot.reply_dispatcher.wait_for_reply(
+                    interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+                )
                 user = msg.mentions[0]
                 await self.mongo.add_dashboard_permission(dashboard_name, interaction.guild.id, user_id=user.id)
 
@@ -293,10 +353,12 @@ class DashboardDropdown(discord.ui.Select):
             await interaction.response.edit_message(embed=embed, view=None)
 
             def check(m):
-                return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.role_mentions
+                return m.role_mentions
 
             try:
-                msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+                msg = await self.bot.reply_dispatcher.wait_for_reply(
+                    interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+                )
                 role = msg.role_mentions[0]
                 await self.mongo.add_dashboard_permission(dashboard_name, interaction.guild.id, role_id=role.id)
 
@@ -364,6 +426,7 @@ class CommandDropdown(discord.ui.Select):
             discord.SelectOption(label="Disable Counting", value="disable_counting", emoji="❌"),
             discord.SelectOption(label="Add to Ticket", value="add_to_ticket", emoji="➕"),
             discord.SelectOption(label="Reject Player", value="reject_player", emoji="🚫"),
+            discord.SelectOption(label="Close Ticket", value="close_ticket", emoji="🔒"),
             discord.SelectOption(label="Help", value="help", emoji="❓")
         ]
 
@@ -381,10 +444,12 @@ class CommandDropdown(discord.ui.Select):
             await interaction.response.edit_message(embed=embed, view=None)
 
             def check(m):
-                return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.mentions
+                return m.mentions
 
             try:
-                msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+                msg = await self.bot.reply_dispatcher.wait_for_reply(
+                    interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+                )
                 user = msg.mentions[0]
                 await self.mongo.add_dashboard_permission(command_name, interaction.guild.id, user_id=user.id)
 
@@ -412,10 +477,12 @@ class CommandDropdown(discord.ui.Select):
             await interaction.response.edit_message(embed=embed, view=None)
 
             def check(m):
-                return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.role_mentions
+                return m.role_mentions
 
             try:
-                msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+                msg = await self.bot.reply_dispatcher.wait_for_reply(
+                    interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+                )
                 role = msg.role_mentions[0]
                 await self.mongo.add_dashboard_permission(command_name, interaction.guild.id, role_id=role.id)
 
@@ -73,12 +73,12 @@ class PanelDeploymentView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.attachments)
+            return m.attachments
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             image_url = msg.attachments[0].url
             
             await self.mongo.save_panel_image(self.panel_type, image_url, self.guild_id)
@@ -230,12 +230,12 @@ class BoosterDashboardView(discord.ui.View):
         await interaction.followup.send(embed=embed, ephemeral=True)
 
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.attachments)
+            return m.attachments
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             image_url = msg.attachments[0].url
 
             await self.mongo.save_panel_image('booster_panel', image_url, interaction.guild_id)
@@ -426,12 +426,12 @@ class ColorRoleManagementView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=None)
 
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.role_mentions)
+            return m.role_mentions
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             role = msg.role_mentions[0]
 
             await self.mongo.add_color_role(role.id, interaction.guild.id)
@@ -565,12 +565,12 @@ class BoosterRoleManagementView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=None)
 
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.role_mentions)
+            return m.role_mentions
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             role = msg.role_mentions[0]
 
             self.mongo.add_booster_role(role.id)
@@ -40,7 +40,10 @@ class ClanDashboard(commands.Cog):
             return
 
         # Get current clans
-        clans = await self.mongo.get_all_clans(interaction.guild_id)
+        clans = await self.mongo.get_clans_page(
+            interaction.guild_id, 5,
+            projection={'name': 1, 'min_town_hall': 1, 'clan_type': 1, 'added_by': 1}
+        )
 
         embed = discord.Embed(
             title="⚔️ BLACKSPIRE NATION - Clan Dashboard",
@@ -54,7 +57,7 @@ class ClanDashboard(commands.Cog):
         )
 
         if clans:
-            for clan in clans[:5]:  # Show first 5 clans
+            for clan in clans:  # Show first 5 clans
                 embed.add_field(
                     name=f"{clan.get('name', 'Unknown')}",
                     value=(
@@ -93,9 +96,9 @@ class ClanDashboardView(discord.ui.View):
 
     @discord.ui.button(label="Manage Existing Clan", style=discord.ButtonStyle.primary, emoji="🔧")
     async def manage_existing_clan(self, interaction: discord.Interaction, button: discord.ui.Button):
-        clans = await self.mongo.get_all_clans(interaction.guild_id)
+        view = ClanListView(self.bot, interaction.guild_id, manage=True)
 
-        if not clans:
+        if not await view.load():
             embed = discord.Embed(
                 title="❌ No Clans",
                 description="No clans found. Add a clan first!",
@@ -104,31 +107,157 @@ class ClanDashboardView(discord.ui.View):
             await interaction.response.send_message(embed=embed, ephemeral=True)
             return
 
-        embed = discord.Embed(
-            title="🔧 Manage Clan",
-            description="Select a clan to manage:",
-            color=0xff6600
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
+
+    @discord.ui.button(label="View All Clans", style=discord.ButtonStyle.secondary, emoji="📋")
+    async def view_clans(self, interaction: discord.Interaction, button: discord.ui.Button):
+        view = ClanListView(self.bot, interaction.guild_id)
+        await view.load()
+        await interaction.response.send_message(embed=view.build_embed(), view=view, ephemeral=True)
+
+# Fields shown in clan listings, the rest of each document is never fetched
+CLAN_LIST_PROJECTION = {'name': 1, 'min_town_hall': 1, 'clan_type': 1, 'leader_id': 1, 'leadership_role_id': 1}
+CLAN_SELECT_PROJECTION = {'name': 1, 'min_town_hall': 1, 'clan_type': 1}
+CLANS_PER_PAGE = 9
+CLANS_PER_SELECT = 25  # Discord limit
+
+class ClanListView(discord.ui.View):
+    """Pages through a guild's clans, fetching only the page on screen"""
+
+    def __init__(self, bot, guild_id: int, manage: bool = False):
+        super().__init__(timeout=300)
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self.guild_id = guild_id
+        self.manage = manage
+        self.page_size = CLANS_PER_SELECT if manage else CLANS_PER_PAGE
+        self.page = 0
+        self.clans = []
+        self.snapshots = {}
+        self.select = None
+
+    async def load(self, after: Optional[tuple] = None, before: Optional[tuple] = None) -> bool:
+        """Load the page after or before a (name, _id) key, the first page by default"""
+        # One extra clan tells whether there is another page in that direction
+        clans = await self.mongo.get_clans_page(
+            self.guild_id,
+            self.page_size + 1,
+            after=after,
+            before=before,
+            projection=CLAN_SELECT_PROJECTION if self.manage else CLAN_LIST_PROJECTION
         )
+        if before is not None:
+            self.previous_page.disabled = len(clans) <= self.page_size
+            self.next_page.disabled = False
+            clans = clans[-self.page_size:]
+        else:
+            self.previous_page.disabled = after is None
+            self.next_page.disabled = len(clans) <= self.page_size
+            clans = clans[:self.page_size]
+        self.clans = clans
+
+        if self.manage:
+            self._refresh_select()
+        elif clans:
+            # Live stats come from the synced Clash King snapshots, not the API
+            self.snapshots = {
+                snapshot['clan_id']: snapshot
+                for snapshot in await self.mongo.get_clan_snapshots(
+                    clan_ids=[str(clan['_id']) for clan in clans]
+                )
+            }
+        return bool(clans)
+
+    def _refresh_select(self):
+        if self.select:
+            self.remove_item(self.select)
+            self.select = None
+        if not self.clans:
+            return
 
         options = []
-        for clan in clans[:25]:  # Discord limit
+        for clan in self.clans:
             options.append(discord.SelectOption(
                 label=clan.get('name', 'Unknown'),
                 description=f"TH{clan.get('min_town_hall', '?')} - {clan.get('clan_type', 'Unknown')}",
                 value=str(clan.get('_id', 'unknown'))
             ))
 
-        select = discord.ui.Select(
+        self.select = discord.ui.Select(
             placeholder="Choose a clan to manage...",
             options=options,
             min_values=1,
-            max_values=1
+            max_values=1,
+            row=0
         )
-        select.callback = self.clan_selected
+        self.select.callback = self.clan_selected
+        self.add_item(self.select)
 
-        view = discord.ui.View(timeout=300)
-        view.add_item(select)
-        await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
+    def build_embed(self) -> discord.Embed:
+        """Embed for the current page"""
+        if self.manage:
+            embed = discord.Embed(
+                title="🔧 Manage Clan",
+                description="Select a clan to manage:",
+                color=0xff6600
+            )
+        else:
+            embed = discord.Embed(
+                title="📋 All Clans",
+                description="Complete list of registered clans:",
+                color=0x3498db
+            )
+            for clan in self.clans:
+                value = (
+                    f"Min TH: {clan.get('min_town_hall', 'N/A')}\n"
+                    f"Type: {clan.get('clan_type', 'N/A').title()}\n"
+                    f"Leader: <@{clan.get('leader_id', 'Not set')}>\n"
+                    f"Leadership Role: <@&{clan.get('leadership_role_id', 'Not set')}>"
+                )
+                snapshot = self.snapshots.get(str(clan.get('_id')))
+                if snapshot:
+                    value += (
+                        f"\n👥 Members: {snapshot.get('member_count', '?')}/50"
+                        f"\n⚔️ War Streak: {snapshot.get('war_win_streak', 0)}"
+                        f" • {snapshot.get('war_league') or 'Unranked'}"
+                    )
+                embed.add_field(
+                    name=f"{clan.get('name', 'Unknown')}",
+                    value=value,
+                    inline=True
+                )
+
+        if not self.clans:
+            embed.add_field(
+                name="No Clans",
+                value="No clans registered yet.",
+                inline=False
+            )
+        embed.set_footer(text=f"Page {self.page + 1}")
+        return embed
+
+    @staticmethod
+    def _key(clan: dict) -> tuple:
+        return clan.get('name'), clan['_id']
+
+    @discord.ui.button(label="Previous", style=discord.ButtonStyle.secondary, emoji="◀️", row=1, disabled=True)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.clans and await self.load(before=self._key(self.clans[0])):
+            self.page = max(0, self.page - 1)
+        else:
+            # The page before is gone (clans were deleted), start over
+            self.page = 0
+            await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
+
+    @discord.ui.button(label="Next", style=discord.ButtonStyle.secondary, emoji="▶️", row=1, disabled=True)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.clans and await self.load(after=self._key(self.clans[-1])):
+            self.page += 1
+        else:
+            self.page = 0
+            await self.load()
+        await interaction.response.edit_message(embed=self.build_embed(), view=self)
 
     async def clan_selected(self, interaction: discord.Interaction):
         clan_id = interaction.data["values"][0]
@@ -156,37 +285,6 @@ class ClanDashboardView(discord.ui.View):
         view = ClanManagementView(self.bot, clan_id)
         await interaction.response.edit_message(embed=embed, view=view)
 
-    @discord.ui.button(label="View All Clans", style=discord.ButtonStyle.secondary, emoji="📋")
-    async def view_clans(self, interaction: discord.Interaction, button: discord.ui.Button):
-        clans = await self.mongo.get_all_clans(interaction.guild_id)
-
-        embed = discord.Embed(
-            title="📋 All Clans",
-            description="Complete list of registered clans:",
-            color=0x3498db
-        )
-
-        if clans:
-            for clan in clans:
-                embed.add_field(
-                    name=f"{clan.get('name', 'Unknown')}",
-                    value=(
-                        f"Min TH: {clan.get('min_town_hall', 'N/A')}\n"
-                        f"Type: {clan.get('clan_type', 'N/A').title()}\n"
-                        f"Leader: <@{clan.get('leader_id', 'Not set')}>\n"
-                        f"Leadership Role: <@&{clan.get('leadership_role_id', 'Not set')}>"
-                    ),
-                    inline=True
-                )
-        else:
-            embed.add_field(
-                name="No Clans",
-                value="No clans registered yet.",
-                inline=False
-            )
-
-        await interaction.response.send_message(embed=embed, ephemeral=True)
-
 class AddClanModal(discord.ui.Modal, title="Add New Clan"):
     """Modal for adding a new clan"""
     
@@ -237,7 +335,7 @@ class AddClanModal(discord.ui.Modal, title="Add New Clan"):
                 'created_at': datetime.utcnow()
             }
             
-            success = await self.mongo.save_clan_data(clan_data, interaction.guild_id)
+            success = await self.bot.clan_catalog.save_clan(clan_data, interaction.guild_id)
             
             if success:
                 embed = discord.Embed(
@@ -285,13 +383,15 @@ class ClanManagementView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
         def check(m):
-            return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.mentions
+            return m.mentions
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             leader = msg.mentions[0]
             
-            success = await self.mongo.update_clan_field(self.clan_id, 'leader_id', leader.id)
+            success = await self.bot.clan_catalog.update_clan_field(interaction.guild_id, self.clan_id, 'leader_id', leader.id)
             
             if success:
                 embed = discord.Embed(
@@ -326,13 +426,15 @@ class ClanManagementView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
         def check(m):
-            return m.author.id == interaction.user.id and m.channel.id == interaction.channel.id and m.role_mentions
+            return m.role_mentions
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             role = msg.role_mentions[0]
             
-            success = await self.mongo.update_clan_field(self.clan_id, 'leadership_role_id', role.id)
+            success = await self.bot.clan_catalog.update_clan_field(interaction.guild_id, self.clan_id, 'leadership_role_id', role.id)
             
             if success:
                 embed = discord.Embed(
@@ -367,12 +469,12 @@ class ClanManagementView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.attachments)
+            return m.attachments
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             attachment = msg.attachments[0]
             
             if not attachment.content_type.startswith('image/'):
@@ -384,7 +486,7 @@ class ClanManagementView(discord.ui.View):
                 await interaction.followup.send(embed=embed, ephemeral=True)
                 return
             
-            success = await self.mongo.update_clan_field(self.clan_id, 'icon_url', attachment.url)
+            success = await self.bot.clan_catalog.update_clan_field(interaction.guild_id, self.clan_id, 'icon_url', attachment.url)
             
             if success:
                 embed = discord.Embed(
@@ -507,7 +609,7 @@ class EditClanModal(discord.ui.Modal, title="Edit Clan Information"):
                 await interaction.response.send_message("❌ No changes provided!", ephemeral=True)
                 return
             
-            success = await self.mongo.update_clan_data(self.clan_id, updates)
+            success = await self.bot.clan_catalog.update_clan_data(interaction.guild_id, self.clan_id, updates)
             
             if success:
                 embed = discord.Embed(
@@ -543,7 +645,7 @@ class ConfirmDeleteView(discord.ui.View):
 
     @discord.ui.button(label="Confirm Delete", style=discord.ButtonStyle.danger, emoji="🗑️")
     async def confirm_delete(self, interaction: discord.Interaction, button: discord.ui.Button):
-        success = await self.mongo.delete_clan(self.clan_id)
+        success = await self.bot.clan_catalog.delete_clan(interaction.guild_id, self.clan_id)
         
         if success:
             embed = discord.Embed(
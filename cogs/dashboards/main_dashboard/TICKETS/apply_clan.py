@@ -1,12 +1,17 @@
+import logging
 import discord
 from discord.ext import commands
-import asyncio
 from typing import Dict, Optional
+from .views.question_views import QuestionFormContinueView, open_question_form
+
+log = logging.getLogger(__name__)
 
 class TicketHandler:
     def __init__(self, bot):
         self.bot = bot
         self.mongo = bot.mongo_manager
+        bot.questionnaires.register_handler('apply_clan', self)
+        bot.add_view(QuestionFormContinueView(bot.questionnaires, 'apply_clan'))
 
     async def handle_ticket(self, interaction: discord.Interaction, ticket_data: Dict):
         try:
@@ -17,40 +22,43 @@ class TicketHandler:
             )
 
             # Get the questions configured for this ticket type
-            questions = await self.mongo.get_ticket_questions('apply_clan')
-            responses = {}
-
-            # Send initial embed
-            embed = discord.Embed(
-                title="🛡️ Clan Application",
-                description="Welcome! Please answer the following questions about your clan.",
-                color=0x2b2d31
+            questions = await self.mongo.get_ticket_questions('apply_clan', interaction.guild_id)
+
+            # Answers are typed into modal pages and checkpointed by the questionnaire engine
+            started = await self.bot.questionnaires.start(
+                interaction.channel,
+                interaction.user,
+                'apply_clan',
+                questions,
+                color=0x2b2d31,
+                context={'thread_id': thread.id},
+                form_title="🛡️ Clan Application"
             )
-            await interaction.response.send_message(embed=embed, ephemeral=False)
-
-            # Ask each question
-            for i, question in enumerate(questions, 1):
-                question_embed = discord.Embed(
-                    title=f"Question {i}/{len(questions)}",
-                    description=question,
-                    color=0x2b2d31
+            if not started:
+                await interaction.response.send_message(
+                    "❌ Could not start your application. Please try again later.",
+                    ephemeral=True
                 )
-                await interaction.followup.send(embed=question_embed)
+                return
+            await open_question_form(self.bot.questionnaires, interaction)
 
-                def check(m):
-                    return m.author == interaction.user and m.channel == interaction.channel
+        except Exception as e:
+            await interaction.response.send_message(
+                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
+                ephemeral=True
+            )
+            raise
 
-                try:
-                    response = await self.bot.wait_for('message', timeout=300.0, check=check)
-                    responses[question] = response.content
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("Application timed out. Please try again.", ephemeral=True)
-                    return
+    async def complete_questionnaire(self, channel: discord.TextChannel, user: Optional[discord.Member], session: Dict):
+        """Send the finished application to staff"""
+        try:
+            responses = self.bot.questionnaires.get_responses(session)
+            thread = await self.bot.questionnaires.get_thread(channel.guild, session['context']['thread_id'])
 
             # Create summary embed for staff
             summary_embed = discord.Embed(
                 title="📝 New Clan Application",
-                description=f"Applicant: {interaction.user.mention}",
+                description=f"Applicant: <@{session['user_id']}>",
                 color=0x00ff00
             )
 
@@ -70,25 +78,19 @@ class TicketHandler:
             )
 
             # Notify applicant
-            await interaction.followup.send(
-                "Your clan application has been submitted! Our staff will review it shortly.",
-                ephemeral=False
-            )
+            await channel.send("Your clan application has been submitted! Our staff will review it shortly.")
 
             # Save application to database
             await self.mongo.save_ticket('apply_clan', {
-                'user_id': interaction.user.id,
+                'user_id': session['user_id'],
                 'responses': responses,
                 'thread_id': thread.id,
                 'status': 'pending'
             })
 
         except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
-                ephemeral=True
-            )
-            raise
+            log.error("Error completing clan application: %s", e)
+            await channel.send("❌ An error occurred while submitting your application. Please contact staff.")
 
 class ClanApplicationControls(discord.ui.View):
     def __init__(self, bot):
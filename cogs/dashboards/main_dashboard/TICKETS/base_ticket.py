@@ -1,7 +1,18 @@
+import logging
 import discord
 from discord.ext import commands
 from typing import Dict, List, Optional
 from abc import ABC, abstractmethod
+import asyncio
+import time
+from utils.metrics import metrics
+from utils.structured_logging import bind, bind_interaction
+
+log = logging.getLogger(__name__)
+
+TICKET_OPEN_SECONDS = metrics.histogram(
+    'ticket_open_seconds', 'Time from the ticket button to a ready ticket channel', ('ticket_type',)
+)
 
 class BaseTicketHandler(ABC):
     """Base class for all ticket handlers"""
@@ -12,43 +23,104 @@ class BaseTicketHandler(ABC):
 
     async def start_ticket(self, interaction: discord.Interaction):
         """Start the ticket process"""
+        started = time.perf_counter()
+        bind_interaction(interaction)
+        ticket_id, ticket_channel = None, None
         try:
+            # Channel creation can take longer than the interaction window
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+            # Insert first: the unique index on open tickets rejects double clicks
+            ticket_id = await self.mongo.reserve_ticket(
+                guild_id=interaction.guild_id,
+                user_id=interaction.user.id,
+                ticket_type=self.get_ticket_type()
+            )
+            if not ticket_id:
+                await interaction.followup.send(
+                    await self._reservation_failed_message(interaction),
+                    ephemeral=True
+                )
+                return
+            bind(ticket_id=str(ticket_id))
+
             # Create the ticket channel
             ticket_channel = await self._create_ticket_channel(interaction)
             if not ticket_channel:
-                await interaction.response.send_message(
+                await self.mongo.release_ticket(ticket_id)
+                await interaction.followup.send(
                     "❌ Failed to create ticket channel. Please try again.",
                     ephemeral=True
                 )
                 return
 
-            # Create ticket in database
-            success = await self.mongo.create_ticket(
-                guild_id=interaction.guild_id,
-                channel_id=ticket_channel.id,
-                user_id=interaction.user.id,
-                ticket_type=self.get_ticket_type()
+            # Welcome message and thread do not depend on each other
+            _, thread = await asyncio.gather(
+                self._send_initial_message(interaction, ticket_channel),
+                self._create_ticket_thread(interaction, ticket_channel)
             )
 
+            success = await self.mongo.attach_ticket_channel(
+                ticket_id,
+                channel_id=ticket_channel.id,
+                thread_id=thread.id if thread else None
+            )
             if not success:
-                await ticket_channel.delete()
-                await interaction.response.send_message(
+                await self._abandon_ticket(ticket_id, ticket_channel)
+                await interaction.followup.send(
                     "❌ Failed to create ticket. Please try again.",
                     ephemeral=True
                 )
                 return
 
-            # Send initial message
-            await self._send_initial_message(interaction, ticket_channel)
-            
-            # Start the actual ticket process
-            await self._start_ticket_process(interaction, ticket_channel)
+            TICKET_OPEN_SECONDS.labels(self.get_ticket_type()).observe(time.perf_counter() - started)
+            await interaction.followup.send(
+                f"✅ Your ticket has been created: {ticket_channel.mention}",
+                ephemeral=True
+            )
 
         except Exception as e:
-            await interaction.response.send_message(
+            log.error("Error starting ticket: %s", e)
+            # A reservation left open would lock the user out until the reaper runs
+            if ticket_id:
+                await self._abandon_ticket(ticket_id, ticket_channel)
+            await interaction.followup.send(
                 f"❌ An error occurred: {str(e)}",
                 ephemeral=True
             )
+            return
+
+        # The ticket is announced now, a failing question flow must not tear it down
+        try:
+            await self._start_ticket_process(interaction, ticket_channel, thread)
+        except Exception as e:
+            log.error("Error starting ticket process: %s", e)
+            try:
+                await ticket_channel.send(
+                    "❌ An error occurred while starting this ticket. A staff member will assist you shortly."
+                )
+            except Exception as e:
+                log.error("Error reporting ticket process failure: %s", e)
+
+    async def _abandon_ticket(self, ticket_id, channel: Optional[discord.TextChannel]):
+        """Delete a half-created ticket channel and release its reservation"""
+        if channel:
+            try:
+                await channel.delete()
+            except Exception as e:
+                log.error("Error deleting abandoned ticket channel: %s", e)
+        await self.mongo.release_ticket(ticket_id)
+
+    async def _reservation_failed_message(self, interaction: discord.Interaction) -> str:
+        """Explain why a ticket could not be reserved"""
+        existing_ticket = await self.mongo.get_active_ticket(
+            guild_id=interaction.guild_id,
+            user_id=interaction.user.id,
+            ticket_type=self.get_ticket_type()
+        )
+        if existing_ticket:
+            return f"❌ You already have an active {self.get_ticket_type().replace('_', ' ')} ticket!"
+        return "❌ Failed to create ticket. Please try again."
 
     @abstractmethod
     def get_ticket_type(self) -> str:
@@ -56,10 +128,23 @@ class BaseTicketHandler(ABC):
         pass
 
     @abstractmethod
-    async def _start_ticket_process(self, interaction: discord.Interaction, channel: discord.TextChannel):
+    async def _start_ticket_process(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        thread: Optional[discord.Thread] = None
+    ):
         """Start the actual ticket process"""
         pass
 
+    async def _create_ticket_thread(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel
+    ) -> Optional[discord.Thread]:
+        """Create the ticket's thread, if this ticket type uses one"""
+        return None
+
     async def _create_ticket_channel(self, interaction: discord.Interaction) -> Optional[discord.TextChannel]:
         """Create a ticket channel"""
         try:
@@ -71,53 +156,45 @@ class BaseTicketHandler(ABC):
             # Create channel name
             channel_name = f"{self.get_ticket_type()}-{interaction.user.name}"
 
-            # Create channel with proper permissions
+            # Create channel with its overwrites in a single request
             channel = await category.create_text_channel(
                 name=channel_name,
+                overwrites=self._build_ticket_overwrites(interaction, category),
                 reason=f"Ticket created by {interaction.user}"
             )
 
-            # Set permissions
-            await channel.set_permissions(
-                interaction.guild.default_role,
-                read_messages=False
-            )
-            await channel.set_permissions(
-                interaction.user,
-                read_messages=True,
-                send_messages=True
-            )
-            await channel.set_permissions(
-                interaction.guild.me,
-                read_messages=True,
-                send_messages=True,
-                manage_channels=True,
-                manage_permissions=True
-            )
-
             return channel
 
         except Exception as e:
-            print(f"Error creating ticket channel: {e}")
+            log.error("Error creating ticket channel: %s", e)
             return None
 
-    async def _get_tickets_category(self, guild: discord.Guild) -> Optional[discord.CategoryChannel]:
-        """Get or create the tickets category"""
-        try:
-            # Look for existing category
-            for category in guild.categories:
-                if category.name.lower() == "tickets":
-                    return category
-
-            # Create new category if not found
-            return await guild.create_category(
-                name="Tickets",
-                reason="Ticket system setup"
-            )
+    def _build_ticket_overwrites(
+        self,
+        interaction: discord.Interaction,
+        category: discord.CategoryChannel
+    ) -> Dict[discord.abc.Snowflake, discord.PermissionOverwrite]:
+        """Build the permission overwrites for a new ticket channel"""
+        # Keep the category's overwrites (staff roles etc.) like a synced channel would
+        overwrites = dict(category.overwrites)
+        overwrites[interaction.guild.default_role] = discord.PermissionOverwrite(
+            read_messages=False
+        )
+        overwrites[interaction.user] = discord.PermissionOverwrite(
+            read_messages=True,
+            send_messages=True
+        )
+        overwrites[interaction.guild.me] = discord.PermissionOverwrite(
+            read_messages=True,
+            send_messages=True,
+            manage_channels=True,
+            manage_permissions=True
+        )
+        return overwrites
 
-        except Exception as e:
-            print(f"Error getting tickets category: {e}")
-            return None
+    async def _get_tickets_category(self, guild: discord.Guild) -> Optional[discord.CategoryChannel]:
+        """Get the category this ticket type is created in"""
+        return await self.bot.ticket_categories.resolve(guild, self.get_ticket_type())
 
     async def _send_initial_message(self, interaction: discord.Interaction, channel: discord.TextChannel):
         """Send initial ticket message"""
@@ -1,12 +1,16 @@
+import logging
 import discord
 from discord.ext import commands
-import asyncio
 from typing import Dict, Optional
+from utils.attachments import attachment_reference
+
+log = logging.getLogger(__name__)
 
 class TicketHandler:
     def __init__(self, bot):
         self.bot = bot
         self.mongo = bot.mongo_manager
+        bot.questionnaires.register_handler('esports_application', self)
 
     async def handle_ticket(self, interaction: discord.Interaction, ticket_data: Dict):
         try:
@@ -17,8 +21,7 @@ class TicketHandler:
             )
 
             # Get esports application questions
-            questions = await self.mongo.get_ticket_questions('esports_application')
-            responses = {}
+            questions = await self.mongo.get_ticket_questions('esports_application', interaction.guild_id)
 
             # Send initial embed
             embed = discord.Embed(
@@ -33,44 +36,53 @@ class TicketHandler:
             )
             await interaction.response.send_message(embed=embed, ephemeral=False)
 
-            # Ask each question
-            for i, question in enumerate(questions, 1):
-                question_embed = discord.Embed(
-                    title=f"Question {i}/{len(questions)}",
-                    description=question,
-                    color=0xf1c40f
-                )
-                await interaction.followup.send(embed=question_embed)
-
-                def check(m):
-                    return m.author == interaction.user and m.channel == interaction.channel
-
-                try:
-                    # For questions asking for screenshots/media
-                    if any(keyword in question.lower() for keyword in ['screenshot', 'image', 'record', 'proof']):
-                        response_msg = await self.bot.wait_for('message', timeout=300.0, check=check)
-                        if response_msg.attachments:
-                            responses[question] = [att.url for att in response_msg.attachments]
-                        else:
-                            responses[question] = response_msg.content
-                    else:
-                        response_msg = await self.bot.wait_for('message', timeout=300.0, check=check)
-                        responses[question] = response_msg.content
-
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("Application timed out. Please try again.", ephemeral=True)
-                    return
+            # Answers are collected by the questionnaire engine
+            await self.bot.questionnaires.start(
+                interaction.channel,
+                interaction.user,
+                'esports_application',
+                questions,
+                color=0xf1c40f,
+                context={'thread_id': thread.id}
+            )
+
+        except Exception as e:
+            await interaction.followup.send(
+                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
+                ephemeral=True
+            )
+            raise
+
+    async def parse_answer(self, question: str, message: discord.Message):
+        """Keep attachments for questions asking for screenshots/media"""
+        if any(keyword in question.lower() for keyword in ['screenshot', 'image', 'record', 'proof']):
+            if message.attachments:
+                # Store the files now, CDN URLs expire before staff review
+                stored = await self.bot.attachments.ingest_many(message.attachments)
+                return [
+                    attachment_reference(attachment, metadata)
+                    for attachment, metadata in zip(message.attachments, stored)
+                ]
+        return message.content
+
+    async def complete_questionnaire(self, channel: discord.TextChannel, user: Optional[discord.Member], session: Dict):
+        """Send the finished application to staff"""
+        try:
+            responses = self.bot.questionnaires.get_responses(session)
+            thread = await self.bot.questionnaires.get_thread(channel.guild, session['context']['thread_id'])
 
             # Create summary embed for staff
             summary_embed = discord.Embed(
                 title="🎮 New Esports Application",
-                description=f"From: {interaction.user.mention}",
+                description=f"From: <@{session['user_id']}>",
                 color=0xf1c40f
             )
 
+            media = []
             for question, answer in responses.items():
                 if isinstance(answer, list):  # For attachments
-                    value = "\n".join(answer)
+                    value = "\n".join(f"📎 {reference['filename']}" for reference in answer)
+                    media.extend(answer)
                 else:
                     value = answer
                 
@@ -82,32 +94,33 @@ class TicketHandler:
 
             # Add esports review controls
             view = EsportsApplicationControls(self.bot)
+            # Ping the staff assigned to this ticket type (cached roster)
+            roster = await self.bot.staff_rosters.get(channel.guild.id, 'esports_application')
             await thread.send(
-                content="New esports application received!",
+                content=f"{roster.mention} New esports application received!" if roster else "New esports application received!",
+                allowed_mentions=roster.allowed_mentions,
                 embed=summary_embed,
                 view=view
             )
 
+            # Re-upload stored screenshots so the review thread keeps working images
+            if media:
+                await self.bot.attachments.send_images(thread, "📸 Submitted Media", media, color=0xf1c40f)
+
             # Notify applicant
-            await interaction.followup.send(
-                "Your esports application has been submitted! Our team will review it shortly.",
-                ephemeral=False
-            )
+            await channel.send("Your esports application has been submitted! Our team will review it shortly.")
 
             # Save application to database
             await self.mongo.save_ticket('esports_application', {
-                'user_id': interaction.user.id,
+                'user_id': session['user_id'],
                 'responses': responses,
                 'thread_id': thread.id,
                 'status': 'pending'
             })
 
         except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
-                ephemeral=True
-            )
-            raise
+            log.error("Error completing esports application: %s", e)
+            await channel.send("❌ An error occurred while submitting your application. Please contact staff.")
 
 class EsportsApplicationControls(discord.ui.View):
     def __init__(self, bot):
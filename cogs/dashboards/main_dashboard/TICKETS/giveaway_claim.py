@@ -1,13 +1,18 @@
+import logging
 import discord
 from discord.ext import commands
-import asyncio
 from typing import Dict, Optional
 from datetime import datetime
+from .views.question_views import QuestionFormContinueView, open_question_form
+
+log = logging.getLogger(__name__)
 
 class TicketHandler:
     def __init__(self, bot):
         self.bot = bot
         self.mongo = bot.mongo_manager
+        bot.questionnaires.register_handler('giveaway_claim', self)
+        bot.add_view(QuestionFormContinueView(bot.questionnaires, 'giveaway_claim'))
 
     async def handle_ticket(self, interaction: discord.Interaction, ticket_data: Dict):
         try:
@@ -17,50 +22,44 @@ class TicketHandler:
                 type=discord.ChannelType.private_thread
             )
 
-            # Initial embed
-            embed = discord.Embed(
-                title="🎁 Giveaway Prize Claim",
-                description="Congratulations on winning! Let's process your prize claim.",
-                color=0xe74c3c
-            )
-            await interaction.response.send_message(embed=embed, ephemeral=False)
-
             # Get claim questions
-            questions = await self.mongo.get_ticket_questions('giveaway_claim')
-            responses = {}
-
-            # Get giveaway details
-            details_embed = discord.Embed(
-                title="🏆 Prize Details",
-                description="Please provide the following information:",
-                color=0xe74c3c
+            questions = await self.mongo.get_ticket_questions('giveaway_claim', interaction.guild_id)
+
+            # Answers are typed into modal pages and checkpointed by the questionnaire engine
+            started = await self.bot.questionnaires.start(
+                interaction.channel,
+                interaction.user,
+                'giveaway_claim',
+                questions,
+                color=0xe74c3c,
+                context={'thread_id': thread.id},
+                form_title="🎁 Giveaway Prize Claim"
             )
-            await interaction.followup.send(embed=details_embed)
-
-            # Ask each question
-            for i, question in enumerate(questions, 1):
-                question_embed = discord.Embed(
-                    title=f"Question {i}/{len(questions)}",
-                    description=question,
-                    color=0xe74c3c
+            if not started:
+                await interaction.response.send_message(
+                    "❌ Could not start your claim. Please try again later.",
+                    ephemeral=True
                 )
-                await interaction.followup.send(embed=question_embed)
+                return
+            await open_question_form(self.bot.questionnaires, interaction)
 
-                def check(m):
-                    return m.author == interaction.user and m.channel == interaction.channel
-
-                try:
-                    response = await self.bot.wait_for('message', timeout=300.0, check=check)
-                    responses[question] = response.content
+        except Exception as e:
+            await interaction.response.send_message(
+                f"An error occurred while processing your claim. Please try again later.\nError: {str(e)}",
+                ephemeral=True
+            )
+            raise
 
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("Claim process timed out. Please try again.", ephemeral=True)
-                    return
+    async def complete_questionnaire(self, channel: discord.TextChannel, user: Optional[discord.Member], session: Dict):
+        """Send the finished claim to staff"""
+        try:
+            responses = self.bot.questionnaires.get_responses(session)
+            thread = await self.bot.questionnaires.get_thread(channel.guild, session['context']['thread_id'])
 
             # Create summary embed for staff
             summary_embed = discord.Embed(
                 title="🎁 New Giveaway Claim",
-                description=f"Winner: {interaction.user.mention}",
+                description=f"Winner: <@{session['user_id']}>",
                 color=0xe74c3c,
                 timestamp=datetime.utcnow()
             )
@@ -81,14 +80,11 @@ class TicketHandler:
             )
 
             # Notify winner
-            await interaction.followup.send(
-                "Your claim has been submitted! Our staff will process it shortly.",
-                ephemeral=False
-            )
+            await channel.send("Your claim has been submitted! Our staff will process it shortly.")
 
             # Save claim to database
             await self.mongo.save_ticket('giveaway_claim', {
-                'user_id': interaction.user.id,
+                'user_id': session['user_id'],
                 'responses': responses,
                 'thread_id': thread.id,
                 'status': 'pending',
@@ -96,11 +92,8 @@ class TicketHandler:
             })
 
         except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while processing your claim. Please try again later.\nError: {str(e)}",
-                ephemeral=True
-            )
-            raise
+            log.error("Error completing giveaway claim: %s", e)
+            await channel.send("❌ An error occurred while submitting your claim. Please contact staff.")
 
 class GiveawayClaimControls(discord.ui.View):
     def __init__(self, bot):
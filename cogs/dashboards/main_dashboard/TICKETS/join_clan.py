@@ -6,6 +6,7 @@ Join Clan Ticket System for Blackspire Nation
 - Handles continent selection, age brackets, multiple accounts
 - Creates threads and manages clan selection with TH matching
 """
+import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -14,17 +15,24 @@ from typing import Optional, Dict, List, Any
 import aiohttp
 import asyncio
 import json
+import time
 from .views.question_views import QuestionSelectView, QuestionTextView
 from .base_ticket import BaseTicketHandler
+from utils.attachments import attachment_reference
+from utils.metrics import record_clash_king
+from utils.flow_budget import tracked_flow
 
 from .base_ticket import BaseTicketHandler
 
+log = logging.getLogger(__name__)
+
 class JoinClanTicket(BaseTicketHandler):
     """Join Clan ticket handler with Clash King integration"""
     
     def __init__(self, bot):
         super().__init__(bot)
         self.data_manager = bot.data_manager
+        self.clash_king_base = "https://api.clashking.ing"
         
         # Continent options from PLAN
         self.continents = [
@@ -64,21 +72,24 @@ class JoinClanTicket(BaseTicketHandler):
 
     async def get_player_stats(self, player_tag: str) -> Optional[Dict[str, Any]]:
         """Get player stats from Clash King API"""
+        started = time.perf_counter()
         try:
             # Remove # if present and URL encode
             clean_tag = player_tag.replace("#", "").replace("+", "%2B")
-            url = f"https://api.clashking.ing/player/{clean_tag}/stats"
+            url = f"{self.clash_king_base}/player/{clean_tag}/stats"
             
             async with aiohttp.ClientSession() as session:
                 async with session.get(url) as response:
+                    record_clash_king('player_stats', response.status, time.perf_counter() - started)
                     if response.status == 200:
                         data = await response.json()
                         return self.parse_player_data(data)
                     else:
-                        print(f"Clash King API error: {response.status}")
+                        log.error("Clash King API error: %s", response.status)
                         return None
         except Exception as e:
-            print(f"Error fetching player stats: {str(e)}")
+            record_clash_king('player_stats', 'error', time.perf_counter() - started)
+            log.error("Error fetching player stats: %s", e)
             return None
 
     def parse_player_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
@@ -100,13 +111,33 @@ class JoinClanTicket(BaseTicketHandler):
                 'siege_machines': self.extract_siege_machines(data.get('siegeMachines', []))
             }
         except Exception as e:
-            print(f"Error parsing player data: {str(e)}")
+            log.error("Error parsing player data: %s", e)
             
     def get_ticket_type(self) -> str:
         """Get the ticket type identifier"""
         return "join_clan"
         
-    async def _start_ticket_process(self, interaction: discord.Interaction, channel: discord.TextChannel):
+    async def _create_ticket_thread(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel
+    ) -> Optional[discord.Thread]:
+        """Create the private thread for the application"""
+        try:
+            return await channel.create_thread(
+                name=f"Join Clan - {interaction.user.name}",
+                type=discord.ChannelType.private_thread
+            )
+        except Exception as e:
+            log.error("Error creating application thread: %s", e)
+            return None
+
+    async def _start_ticket_process(
+        self,
+        interaction: discord.Interaction,
+        channel: discord.TextChannel,
+        thread: Optional[discord.Thread] = None
+    ):
         """Start the join clan application process"""
         try:
             # Get saved questions
@@ -139,23 +170,18 @@ class JoinClanTicket(BaseTicketHandler):
                     }
                 ]
 
-            # Store questions in database if they don't exist
-            await self.mongo.update_questions(interaction.guild_id, "join_clan", questions)
+                # Store the defaults so staff can edit them later
+                await self.mongo.update_questions(interaction.guild_id, "join_clan", questions)
 
-            # Create thread for the application
-            thread = await channel.create_thread(
-                name=f"Join Clan - {interaction.user.name}",
-                type=discord.ChannelType.private_thread
-            )
-
-            # Update ticket with thread ID
-            await self.mongo.update_ticket_thread(channel.id, thread.id)
+            if not thread:
+                # Thread creation failed during setup, ask in the ticket channel instead
+                thread = channel
 
             # Start the question flow
             await self._ask_next_question(interaction, thread, questions, {})
             
         except Exception as e:
-            print(f"Error starting ticket process: {e}")
+            log.error("Error starting ticket process: %s", e)
             await interaction.followup.send(
                 "❌ An error occurred while starting your application. Please try again.",
                 ephemeral=True
@@ -206,7 +232,7 @@ class JoinClanTicket(BaseTicketHandler):
             await thread.send(embed=embed, view=view)
             
         except Exception as e:
-            print(f"Error asking question: {e}")
+            log.error("Error asking question: %s", e)
             await thread.send("❌ An error occurred. Please contact staff for assistance.")
             
     async def _handle_completion(
@@ -255,7 +281,7 @@ class JoinClanTicket(BaseTicketHandler):
             )
             
         except Exception as e:
-            print(f"Error handling completion: {e}")
+            log.error("Error handling completion: %s", e)
             await thread.send("❌ An error occurred while finalizing your application. Please contact staff for assistance.")
             return {}
 
@@ -552,12 +578,12 @@ class PlayerTagInputView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=None)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.content and not m.content.startswith('/'))
+            return m.content and not m.content.startswith('/')
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=120.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=120.0
+            )
             player_tag = msg.content.replace("#", "").strip()
             
             if not player_tag:
@@ -615,12 +641,12 @@ class PlayerTagInputView(discord.ui.View):
         await interaction.followup.send(embed=embed, ephemeral=True)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.content and not m.content.startswith('/'))
+            return m.content and not m.content.startswith('/')
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=120.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=120.0
+            )
             player_tag = msg.content.replace("#", "").strip()
             
             if not player_tag:
@@ -786,22 +812,23 @@ class BaseScreenshotView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=None)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.attachments and 
-                   m.attachments[0].content_type.startswith('image/'))
+            return m.attachments and m.attachments[0].content_type.startswith('image/')
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=120.0)
-            screenshot_url = msg.attachments[0].url
-            self.screenshots.append(screenshot_url)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=120.0
+            )
+            attachment = msg.attachments[0]
+            # Keep our own copy, the CDN URL expires before staff review
+            metadata = await self.bot.attachments.ingest(attachment)
+            self.screenshots.append(attachment_reference(attachment, metadata))
             
             embed = discord.Embed(
                 title="✅ Screenshot Received",
                 description=f"Screenshot received for **{player_name}**",
                 color=0x00ff00
             )
-            embed.set_image(url=screenshot_url)
+            embed.set_image(url=attachment.url)
             await interaction.followup.send(embed=embed, ephemeral=True)
             
             if self.current_account < len(self.player_data):
@@ -825,22 +852,23 @@ class BaseScreenshotView(discord.ui.View):
         await interaction.followup.send(embed=embed, ephemeral=True)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.attachments and 
-                   m.attachments[0].content_type.startswith('image/'))
+            return m.attachments and m.attachments[0].content_type.startswith('image/')
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=120.0)
-            screenshot_url = msg.attachments[0].url
-            self.screenshots.append(screenshot_url)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=120.0
+            )
+            attachment = msg.attachments[0]
+            # Keep our own copy, the CDN URL expires before staff review
+            metadata = await self.bot.attachments.ingest(attachment)
+            self.screenshots.append(attachment_reference(attachment, metadata))
             
             embed = discord.Embed(
                 title="✅ Screenshot Received",
                 description=f"Screenshot received for **{player_name}**",
                 color=0x00ff00
             )
-            embed.set_image(url=screenshot_url)
+            embed.set_image(url=attachment.url)
             await interaction.followup.send(embed=embed, ephemeral=True)
             
             if self.current_account < len(self.player_data):
@@ -868,13 +896,10 @@ class BaseScreenshotView(discord.ui.View):
                 stats_embed = self.ticket_handler.create_player_stats_embed(player_data, i + 1)
                 await thread.send(embed=stats_embed)
                 
-                # Send screenshot
-                screenshot_embed = discord.Embed(
-                    title=f"📸 Base Screenshot - Account {i + 1}",
-                    color=0x3498db
+                # Send screenshot from the attachment cache
+                await self.bot.attachments.send_images(
+                    thread, f"📸 Base Screenshot - Account {i + 1}", [screenshot], color=0x3498db
                 )
-                screenshot_embed.set_image(url=screenshot)
-                await thread.send(embed=screenshot_embed)
             
             # Now continue with questions in main channel
             embed = discord.Embed(
@@ -940,12 +965,12 @@ class ApplicationQuestionsView(discord.ui.View):
         await interaction.response.edit_message(embed=embed, view=None)
         
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   m.content and not m.content.startswith('/'))
+            return m.content and not m.content.startswith('/')
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=300.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=300.0
+            )
             answer = msg.content
             answers.append(answer)
             
@@ -1016,9 +1041,19 @@ class ClanSelectionView(discord.ui.View):
         self.thread = thread
         self.current_account = 1
         self.selected_clans = []
+        self.matches = []
 
     @discord.ui.button(label="Start Clan Selection", style=discord.ButtonStyle.primary, emoji="🏰")
     async def start_clan_selection(self, interaction: discord.Interaction, button: discord.ui.Button):
+        # Match and rank every account in one pass over the cached clan catalog
+        self.matches = await self.bot.clan_catalog.ranked_matches(
+            interaction.guild.id,
+            [
+                (clan_type, player_data.get('town_hall_level', 0))
+                for player_data, clan_type in zip(self.player_data, self.clan_types)
+            ],
+            continent=self.continent
+        )
         await self.select_clan_for_account(interaction)
 
     async def select_clan_for_account(self, interaction: discord.Interaction):
@@ -1027,8 +1062,8 @@ class ClanSelectionView(discord.ui.View):
         player_name = player_data.get('name', f'Account {self.current_account}')
         th_level = player_data.get('town_hall_level', 0)
         
-        # Get clans that match the criteria
-        available_clans = await self.ticket_handler.mongo.get_clans_by_type_and_th(clan_type, th_level, interaction.guild.id)
+        # Clans that match the criteria were found when selection started
+        available_clans = self.matches[self.current_account - 1]
         
         if not available_clans:
             embed = discord.Embed(
@@ -1040,10 +1075,11 @@ class ClanSelectionView(discord.ui.View):
             return
         
         options = []
-        for clan in available_clans[:25]:  # Discord limit
+        for clan in available_clans[:25]:  # Discord limit, best fits first
+            members = f" • Members: {clan['member_count']}/50" if clan.get('member_count') is not None else ""
             options.append(discord.SelectOption(
                 label=clan.get('name', 'Unknown'),
-                description=f"Min TH: {clan.get('min_town_hall', 'N/A')} • Type: {clan.get('clan_type', 'Unknown')}",
+                description=f"Min TH: {clan.get('min_town_hall', 'N/A')} • Type: {clan.get('clan_type', 'Unknown')}{members}",
                 value=str(clan.get('_id', ''))
             ))
         
@@ -1068,7 +1104,7 @@ class ClanSelectionView(discord.ui.View):
 
     async def clan_selected(self, interaction: discord.Interaction):
         clan_id = interaction.data["values"][0]
-        clan = await self.ticket_handler.mongo.get_clan_by_id(clan_id)
+        clan = await self.bot.clan_catalog.get_clan(interaction.guild.id, clan_id)
         
         if not clan:
             await interaction.response.send_message("❌ Clan not found!", ephemeral=True)
@@ -1099,6 +1135,69 @@ class ClanSelectionView(discord.ui.View):
         view = FinalConfirmationView(self.bot, self.ticket_handler, self.continent, self.age_bracket, self.player_data, self.clan_types, self.thread, self.selected_clans)
         await interaction.response.edit_message(embed=embed, view=view)
 
+# Discord limits for a single message
+MAX_EMBEDS_PER_MESSAGE = 10
+MAX_EMBED_CHARS_PER_MESSAGE = 6000
+MAX_CONTENT_CHARS = 2000
+
+# Room kept on every page for the "Page n/m" footer added after packing
+PAGE_FOOTER_CHARS = len("Page 999/999")
+
+def build_application_embeds(player_data: List[Dict], selected_clans: List[Dict]) -> List[discord.Embed]:
+    """Build the header embed and one embed per account for staff review"""
+    embeds = [discord.Embed(
+        title="🎯 NEW CLAN APPLICATION",
+        description="A new clan application has been submitted!",
+        color=0x00ff00
+    )]
+    
+    for i, (player, clan) in enumerate(zip(player_data, selected_clans)):
+        app_embed = discord.Embed(
+            title=f"📋 Account {i + 1} Application",
+            color=0x3498db
+        )
+        app_embed.add_field(name="Player", value=player.get('name', 'Unknown'), inline=True)
+        app_embed.add_field(name="Tag", value=player.get('tag', 'Unknown'), inline=True)
+        app_embed.add_field(name="Town Hall", value=str(player.get('town_hall_level', 0)), inline=True)
+        app_embed.add_field(name="Selected Clan", value=clan.get('name', 'Unknown'), inline=True)
+        app_embed.add_field(name="Clan Type", value=clan.get('clan_type', 'Unknown').title(), inline=True)
+        app_embed.add_field(name="Min TH Required", value=str(clan.get('min_town_hall', 'N/A')), inline=True)
+        embeds.append(app_embed)
+    
+    return embeds
+
+def paginate_embeds(embeds: List[discord.Embed]) -> List[List[discord.Embed]]:
+    """Pack embeds into pages that fit in one message each"""
+    pages = [[]]
+    chars = 0
+    for embed in embeds:
+        if pages[-1] and (
+            len(pages[-1]) >= MAX_EMBEDS_PER_MESSAGE or
+            chars + len(embed) > MAX_EMBED_CHARS_PER_MESSAGE - PAGE_FOOTER_CHARS
+        ):
+            pages.append([])
+            chars = 0
+        pages[-1].append(embed)
+        chars += len(embed)
+    
+    if len(pages) > 1:
+        for number, page in enumerate(pages, start=1):
+            page[-1].set_footer(text=f"Page {number}/{len(pages)}")
+    return pages
+
+def pack_mentions(mentions: List[str], suffix: str) -> List[str]:
+    """Split mentions into message contents that fit, the first one ends with ``suffix``"""
+    contents, line = [], ""
+    limit = MAX_CONTENT_CHARS - len(suffix) - 1
+    for mention in dict.fromkeys(mentions):
+        if line and len(line) + 1 + len(mention) > limit:
+            contents.append(line)
+            line, limit = "", MAX_CONTENT_CHARS
+        line = f"{line} {mention}" if line else mention
+    contents.append(line)
+    contents[0] = f"{contents[0]} {suffix}".strip()
+    return contents
+
 class FinalConfirmationView(discord.ui.View):
     """View for final confirmation and clan invitation"""
     
@@ -1114,54 +1213,40 @@ class FinalConfirmationView(discord.ui.View):
         self.selected_clans = selected_clans
 
     @discord.ui.button(label="Confirm & Submit", style=discord.ButtonStyle.success, emoji="✅")
+    @tracked_flow("join_clan_submission")
     async def confirm_application(self, interaction: discord.Interaction, button: discord.ui.Button):
-        # Send application to thread with staff mentions
-        embed = discord.Embed(
-            title="🎯 NEW CLAN APPLICATION",
-            description="A new clan application has been submitted!",
-            color=0x00ff00
-        )
+        # Get staff roster for join_clan ticket (cached, no database read)
+        roster = await self.bot.staff_rosters.get(interaction.guild.id, "join_clan")
         
-        # Get staff roles for join_clan ticket
-        staff_list = await self.ticket_handler.mongo.get_ticket_staff("join_clan", interaction.guild.id)
-        
-        mentions = []
-        for staff in staff_list:
-            if 'user_id' in staff:
-                mentions.append(f"<@{staff['user_id']}>")
-            elif 'role_id' in staff:
-                mentions.append(f"<@&{staff['role_id']}>")
+        mentions = roster.mention.split() if roster else []
+        leader_ids, leadership_role_ids = [], []
         
         # Add clan leadership mentions
         for clan in self.selected_clans:
             if 'leadership_role_id' in clan:
                 mentions.append(f"<@&{clan['leadership_role_id']}>")
+                leadership_role_ids.append(clan['leadership_role_id'])
             if 'leader_id' in clan:
                 mentions.append(f"<@{clan['leader_id']}>")
+                leader_ids.append(clan['leader_id'])
         
-        if mentions:
-            await self.thread.send(" ".join(mentions))
-        
-        await self.thread.send(embed=embed)
-        
-        # Send detailed application info
-        for i, (player_data, clan) in enumerate(zip(self.player_data, self.selected_clans)):
-            app_embed = discord.Embed(
-                title=f"📋 Account {i + 1} Application",
-                color=0x3498db
-            )
-            app_embed.add_field(name="Player", value=player_data.get('name', 'Unknown'), inline=True)
-            app_embed.add_field(name="Tag", value=player_data.get('tag', 'Unknown'), inline=True)
-            app_embed.add_field(name="Town Hall", value=str(player_data.get('town_hall_level', 0)), inline=True)
-            app_embed.add_field(name="Selected Clan", value=clan.get('name', 'Unknown'), inline=True)
-            app_embed.add_field(name="Clan Type", value=clan.get('clan_type', 'Unknown').title(), inline=True)
-            app_embed.add_field(name="Min TH Required", value=str(clan.get('min_town_hall', 'N/A')), inline=True)
-            
-            await self.thread.send(embed=app_embed)
-        
-        # Create clan acceptance/rejection view
+        # Header and every account go out in as few messages as possible,
+        # the first one carries the mentions and the decision buttons
+        pages = paginate_embeds(build_application_embeds(self.player_data, self.selected_clans))
+        contents = pack_mentions(mentions, "**Staff Decision Required:**")
+        allowed_mentions = roster.allowed_mentions_with(leader_ids, leadership_role_ids)
         view = ClanDecisionView(self.bot, self.ticket_handler, self.player_data, self.selected_clans, interaction.user)
-        await self.thread.send("**Staff Decision Required:**", view=view)
+        await self.thread.send(
+            content=contents[0],
+            embeds=pages[0],
+            view=view,
+            allowed_mentions=allowed_mentions
+        )
+        # Mentions past the content limit still need to ping
+        for content in contents[1:]:
+            await self.thread.send(content=content, allowed_mentions=allowed_mentions)
+        for page in pages[1:]:
+            await self.thread.send(embeds=page)
         
         # Confirm in main channel
         embed = discord.Embed(
@@ -1183,6 +1268,7 @@ class ClanDecisionView(discord.ui.View):
         self.applicant = applicant
 
     @discord.ui.button(label="Accept Player", style=discord.ButtonStyle.success, emoji="✅")
+    @tracked_flow("clan_accept")
     async def accept_player(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if user has permission to accept for any of the selected clans
         user_roles = [role.id for role in interaction.user.roles]
@@ -1247,16 +1333,18 @@ class ClanDecisionView(discord.ui.View):
                 )
                 view.add_item(button)
             
-            await self.thread.send(embed=invite_embed, view=view)
+            # The decision buttons live in the application thread
+            await interaction.channel.send(embed=invite_embed, view=view)
         
         embed = discord.Embed(
             title="✅ Player Accepted",
             description=f"Application accepted by {interaction.user.mention}",
             color=0x00ff00
         )
-        await interaction.response.edit_message(embed=embed, view=None)
+        await self.show_decision(interaction, embed)
 
     @discord.ui.button(label="Pass On Player", style=discord.ButtonStyle.danger, emoji="❌")
+    @tracked_flow("clan_reject")
     async def reject_player(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Check if user has permission to reject for any of the selected clans
         user_roles = [role.id for role in interaction.user.roles]
@@ -1289,4 +1377,14 @@ class ClanDecisionView(discord.ui.View):
         )
         embed.set_footer(text="Decision made by staff")
         
-        await interaction.response.edit_message(embed=embed, view=None)
\ No newline at end of file
+        await self.show_decision(interaction, embed)
+
+    async def show_decision(self, interaction: discord.Interaction, embed: discord.Embed):
+        """Add the decision below the application summary and remove the buttons"""
+        embeds = list(interaction.message.embeds)
+        if (len(embeds) < MAX_EMBEDS_PER_MESSAGE and
+                sum(len(e) for e in embeds) + len(embed) <= MAX_EMBED_CHARS_PER_MESSAGE):
+            await interaction.response.edit_message(embeds=embeds + [embed], view=None)
+        else:
+            await interaction.response.edit_message(view=None)
+            await interaction.followup.send(embed=embed)
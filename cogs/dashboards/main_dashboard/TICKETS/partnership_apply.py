@@ -1,12 +1,15 @@
+import logging
 import discord
 from discord.ext import commands
-import asyncio
 from typing import Dict, Optional
 
+log = logging.getLogger(__name__)
+
 class TicketHandler:
     def __init__(self, bot):
         self.bot = bot
         self.mongo = bot.mongo_manager
+        bot.questionnaires.register_handler('partnership_application', self)
 
     async def handle_ticket(self, interaction: discord.Interaction, ticket_data: Dict):
         try:
@@ -17,8 +20,7 @@ class TicketHandler:
             )
 
             # Get partnership questions
-            questions = await self.mongo.get_ticket_questions('partnership_application')
-            responses = {}
+            questions = await self.mongo.get_ticket_questions('partnership_application', interaction.guild_id)
 
             # Send initial embed
             embed = discord.Embed(
@@ -33,42 +35,46 @@ class TicketHandler:
             )
             await interaction.response.send_message(embed=embed, ephemeral=False)
 
-            # Ask each question
-            for i, question in enumerate(questions, 1):
-                question_embed = discord.Embed(
-                    title=f"Question {i}/{len(questions)}",
-                    description=question,
-                    color=0x9b59b6
-                )
-                await interaction.followup.send(embed=question_embed)
-
-                def check(m):
-                    return m.author == interaction.user and m.channel == interaction.channel
-
-                try:
-                    response = await self.bot.wait_for('message', timeout=300.0, check=check)
-                    responses[question] = response.content
-
-                    # If this is asking for server invite, validate it
-                    if 'invite' in question.lower() or 'link' in question.lower():
-                        try:
-                            invite = await self.bot.fetch_invite(response.content)
-                            responses['server_info'] = {
-                                'name': invite.guild.name,
-                                'member_count': invite.guild.member_count if invite.guild.member_count else 'Unknown',
-                                'verified': invite.guild.verified if hasattr(invite.guild, 'verified') else False
-                            }
-                        except:
-                            pass  # If invite validation fails, continue without server info
-
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("Application timed out. Please try again.", ephemeral=True)
-                    return
+            # Answers are collected by the questionnaire engine
+            await self.bot.questionnaires.start(
+                interaction.channel,
+                interaction.user,
+                'partnership_application',
+                questions,
+                color=0x9b59b6,
+                context={'thread_id': thread.id}
+            )
+
+        except Exception as e:
+            await interaction.followup.send(
+                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
+                ephemeral=True
+            )
+            raise
+
+    async def complete_questionnaire(self, channel: discord.TextChannel, user: Optional[discord.Member], session: Dict):
+        """Send the finished application to staff"""
+        try:
+            responses = self.bot.questionnaires.get_responses(session)
+            thread = await self.bot.questionnaires.get_thread(channel.guild, session['context']['thread_id'])
+
+            # If a question asked for the server invite, validate it
+            for question, answer in list(responses.items()):
+                if 'invite' in question.lower() or 'link' in question.lower():
+                    try:
+                        invite = await self.bot.fetch_invite(answer)
+                        responses['server_info'] = {
+                            'name': invite.guild.name,
+                            'member_count': invite.guild.member_count if invite.guild.member_count else 'Unknown',
+                            'verified': invite.guild.verified if hasattr(invite.guild, 'verified') else False
+                        }
+                    except:
+                        pass  # If invite validation fails, continue without server info
 
             # Create summary embed for staff
             summary_embed = discord.Embed(
                 title="🤝 New Partnership Application",
-                description=f"From: {interaction.user.mention}",
+                description=f"From: <@{session['user_id']}>",
                 color=0x9b59b6
             )
 
@@ -91,32 +97,29 @@ class TicketHandler:
 
             # Add partnership review controls
             view = PartnershipControls(self.bot)
+            # Ping the staff assigned to this ticket type (cached roster)
+            roster = await self.bot.staff_rosters.get(channel.guild.id, 'partnership_application')
             await thread.send(
-                content="New partnership application received!",
+                content=f"{roster.mention} New partnership application received!" if roster else "New partnership application received!",
+                allowed_mentions=roster.allowed_mentions,
                 embed=summary_embed,
                 view=view
             )
 
             # Notify applicant
-            await interaction.followup.send(
-                "Your partnership application has been submitted! Our team will review it shortly.",
-                ephemeral=False
-            )
+            await channel.send("Your partnership application has been submitted! Our team will review it shortly.")
 
             # Save application to database
             await self.mongo.save_ticket('partnership_application', {
-                'user_id': interaction.user.id,
+                'user_id': session['user_id'],
                 'responses': responses,
                 'thread_id': thread.id,
                 'status': 'pending'
             })
 
         except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
-                ephemeral=True
-            )
-            raise
+            log.error("Error completing partnership application: %s", e)
+            await channel.send("❌ An error occurred while submitting your application. Please contact staff.")
 
 class PartnershipControls(discord.ui.View):
     def __init__(self, bot):
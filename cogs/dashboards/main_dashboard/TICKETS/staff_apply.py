@@ -1,12 +1,17 @@
+import logging
 import discord
 from discord.ext import commands
-import asyncio
 from typing import Dict, Optional
+from .views.question_views import QuestionFormContinueView, open_question_form
+
+log = logging.getLogger(__name__)
 
 class TicketHandler:
     def __init__(self, bot):
         self.bot = bot
         self.mongo = bot.mongo_manager
+        bot.questionnaires.register_handler('staff_application', self)
+        bot.add_view(QuestionFormContinueView(bot.questionnaires, 'staff_application'))
 
     async def handle_ticket(self, interaction: discord.Interaction, ticket_data: Dict):
         try:
@@ -17,50 +22,53 @@ class TicketHandler:
             )
 
             # Get staff application questions
-            questions = await self.mongo.get_ticket_questions('staff_application')
-            responses = {}
-
-            # Send initial embed
-            embed = discord.Embed(
-                title="👥 Staff Application",
-                description="Welcome to the staff application process! Please answer each question thoughtfully.",
-                color=0x7289da
+            questions = await self.mongo.get_ticket_questions('staff_application', interaction.guild_id)
+
+            # Answers are typed into modal pages and checkpointed by the questionnaire engine
+            started = await self.bot.questionnaires.start(
+                interaction.channel,
+                interaction.user,
+                'staff_application',
+                questions,
+                color=0x7289da,
+                context={'thread_id': thread.id},
+                form_title="👥 Staff Application"
             )
-            await interaction.response.send_message(embed=embed, ephemeral=False)
-
-            # Ask each question
-            for i, question in enumerate(questions, 1):
-                question_embed = discord.Embed(
-                    title=f"Question {i}/{len(questions)}",
-                    description=question,
-                    color=0x7289da
+            if not started:
+                await interaction.response.send_message(
+                    "❌ Could not start your application. Please try again later.",
+                    ephemeral=True
                 )
-                await interaction.followup.send(embed=question_embed)
+                return
+            await open_question_form(self.bot.questionnaires, interaction)
 
-                def check(m):
-                    return m.author == interaction.user and m.channel == interaction.channel
+        except Exception as e:
+            await interaction.response.send_message(
+                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
+                ephemeral=True
+            )
+            raise
 
-                try:
-                    response = await self.bot.wait_for('message', timeout=600.0, check=check)
-                    responses[question] = response.content
-                except asyncio.TimeoutError:
-                    await interaction.followup.send("Application timed out. Please try again.", ephemeral=True)
-                    return
+    async def complete_questionnaire(self, channel: discord.TextChannel, user: Optional[discord.Member], session: Dict):
+        """Send the finished application to staff"""
+        try:
+            responses = self.bot.questionnaires.get_responses(session)
+            thread = await self.bot.questionnaires.get_thread(channel.guild, session['context']['thread_id'])
 
             # Create summary embed for staff review
             summary_embed = discord.Embed(
                 title="👥 New Staff Application",
-                description=f"Applicant: {interaction.user.mention}",
+                description=f"Applicant: <@{session['user_id']}>",
                 color=0x7289da
             )
             summary_embed.add_field(
                 name="Joined Server",
-                value=discord.utils.format_dt(interaction.user.joined_at, 'R') if interaction.user.joined_at else "Unknown",
+                value=discord.utils.format_dt(user.joined_at, 'R') if getattr(user, 'joined_at', None) else "Unknown",
                 inline=True
             )
             summary_embed.add_field(
                 name="Account Created",
-                value=discord.utils.format_dt(interaction.user.created_at, 'R'),
+                value=discord.utils.format_dt(user.created_at, 'R') if user else "Unknown",
                 inline=True
             )
 
@@ -73,34 +81,31 @@ class TicketHandler:
 
             # Add staff review controls
             view = StaffApplicationControls(self.bot)
+            # Ping the staff assigned to this ticket type (cached roster)
+            roster = await self.bot.staff_rosters.get(channel.guild.id, 'staff_application')
             await thread.send(
-                content="New staff application received!",
+                content=f"{roster.mention} New staff application received!" if roster else "New staff application received!",
+                allowed_mentions=roster.allowed_mentions,
                 embed=summary_embed,
                 view=view
             )
 
             # Notify applicant
-            await interaction.followup.send(
-                "Your staff application has been submitted! Our admin team will review it shortly.",
-                ephemeral=False
-            )
+            await channel.send("Your staff application has been submitted! Our admin team will review it shortly.")
 
             # Save application to database
             await self.mongo.save_ticket('staff_application', {
-                'user_id': interaction.user.id,
+                'user_id': session['user_id'],
                 'responses': responses,
                 'thread_id': thread.id,
                 'status': 'pending',
-                'joined_at': interaction.user.joined_at.isoformat() if interaction.user.joined_at else None,
-                'created_at': interaction.user.created_at.isoformat()
+                'joined_at': user.joined_at.isoformat() if getattr(user, 'joined_at', None) else None,
+                'created_at': user.created_at.isoformat() if user else None
             })
 
         except Exception as e:
-            await interaction.followup.send(
-                f"An error occurred while processing your application. Please try again later.\nError: {str(e)}",
-                ephemeral=True
-            )
-            raise
+            log.error("Error completing staff application: %s", e)
+            await channel.send("❌ An error occurred while submitting your application. Please contact staff.")
 
 class StaffApplicationControls(discord.ui.View):
     def __init__(self, bot):
@@ -1,5 +1,8 @@
+import logging
 import discord
-from typing import List, Dict, Tuple, Any
+from typing import List, Dict, Tuple, Any, Optional
+
+log = logging.getLogger(__name__)
 
 class QuestionSelectView(discord.ui.View):
     """View for handling select-type questions"""
@@ -128,4 +131,166 @@ class QuestionTextModal(discord.ui.Modal):
             await interaction.response.send_message(
                 f"❌ An error occurred: {str(e)}",
                 ephemeral=True
-            )
\ No newline at end of file
+            )
+
+# Discord allows at most five text inputs per modal
+FORM_QUESTIONS_PER_PAGE = 5
+# Answers end up as embed field values
+FORM_ANSWER_MAX_LENGTH = 1024
+
+class QuestionForm:
+    """Multi-page modal form over a questionnaire session.
+
+    Questions are packed five per modal page. Each submitted page is
+    checkpointed into the session through the questionnaire engine, which
+    hands the finished session to the ticket handler, so a form interrupted
+    by a restart carries on from its first unanswered question.
+    """
+
+    def __init__(self, engine, session: Dict[str, Any]):
+        self.engine = engine
+        self.session = session
+        self.title = session.get('form_title') or "Application"
+        count = len(session['questions'])
+        self.pages = [
+            list(range(i, min(i + FORM_QUESTIONS_PER_PAGE, count)))
+            for i in range(0, count, FORM_QUESTIONS_PER_PAGE)
+        ]
+
+    async def open(self, interaction: discord.Interaction, page: Optional[int] = None):
+        """Show a page of the form, by default the one with the first unanswered question"""
+        if page is None:
+            page = min(self.session['current_index'] // FORM_QUESTIONS_PER_PAGE, len(self.pages) - 1)
+        await interaction.response.send_modal(QuestionFormModal(self, page))
+
+    def answer(self, index: int) -> Optional[str]:
+        """Get the saved answer to a question"""
+        answers = self.session['answers']
+        entry = answers[index] if index < len(answers) else None
+        return entry['answer'] if entry else None
+
+    def validate(self, values: Dict[int, str]) -> List[str]:
+        """Validate a page of answers, returning error messages"""
+        errors = []
+        for index, value in values.items():
+            question = self.session['questions'][index]
+            if not value.strip():
+                errors.append(f"**{question}** needs an answer.")
+            elif len(value) > FORM_ANSWER_MAX_LENGTH:
+                errors.append(f"**{question}** must be at most {FORM_ANSWER_MAX_LENGTH} characters.")
+        return errors
+
+    async def submit_page(self, interaction: discord.Interaction, page: int, values: Dict[int, str]):
+        """Checkpoint a submitted page and move to the next one"""
+        ticket_type = self.session['ticket_type']
+        errors = self.validate(values)
+        if errors:
+            embed = discord.Embed(
+                title="❌ Please fix your answers",
+                description="\n".join(errors),
+                color=0xff0000
+            )
+            await interaction.response.send_message(
+                embed=embed,
+                view=QuestionFormContinueView(self.engine, ticket_type, label="Edit Answers"),
+                ephemeral=True
+            )
+            return
+
+        last_page = page + 1 >= len(self.pages)
+        if last_page:
+            # Finishing hands the session to the ticket handler, which can take a while
+            await interaction.response.defer(ephemeral=True, thinking=True)
+
+        saved = await self.engine.submit_answers(
+            interaction.channel,
+            {index: value.strip() for index, value in values.items()}
+        )
+        if not saved:
+            message = "❌ Your answers could not be saved. Please try again."
+            view = QuestionFormContinueView(self.engine, ticket_type, label="Try Again")
+            if interaction.response.is_done():
+                await interaction.followup.send(message, view=view, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, view=view, ephemeral=True)
+            return
+
+        if last_page:
+            await interaction.followup.send("✅ Your answers have been submitted.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"✅ Page {page + 1}/{len(self.pages)} saved",
+            description="Continue to the next set of questions.",
+            color=0x00ff00
+        )
+        await interaction.response.send_message(
+            embed=embed,
+            view=QuestionFormContinueView(self.engine, ticket_type),
+            ephemeral=True
+        )
+
+async def open_question_form(engine, interaction: discord.Interaction):
+    """Open the form of the session waiting for this user in the channel"""
+    session = engine.get_session(interaction.channel.id)
+    if not session or not session.get('form_title') or session['user_id'] != interaction.user.id:
+        await interaction.response.send_message("✅ There are no questions waiting for you here.", ephemeral=True)
+        return
+    await QuestionForm(engine, session).open(interaction)
+
+class QuestionFormModal(discord.ui.Modal):
+    """One page (up to five questions) of a QuestionForm"""
+
+    def __init__(self, form: QuestionForm, page: int):
+        title = form.title
+        if len(form.pages) > 1:
+            title = f"{title} ({page + 1}/{len(form.pages)})"
+        super().__init__(title=title[:45])
+        self.form = form
+        self.page = page
+        self.inputs: List[Tuple[int, discord.ui.TextInput]] = []
+
+        for index in form.pages[page]:
+            question = form.session['questions'][index]
+            # Labels are capped at 45 characters, the placeholder carries the rest
+            text_input = discord.ui.TextInput(
+                label=question if len(question) <= 45 else f"{question[:44]}…",
+                placeholder=question[:100] if len(question) > 45 else None,
+                default=form.answer(index),
+                style=discord.TextStyle.paragraph,
+                required=True,
+                max_length=FORM_ANSWER_MAX_LENGTH
+            )
+            # Answers are keyed by index, so repeated questions keep separate answers
+            self.inputs.append((index, text_input))
+            self.add_item(text_input)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        try:
+            values = {index: text_input.value for index, text_input in self.inputs}
+            await self.form.submit_page(interaction, self.page, values)
+        except Exception as e:
+            log.error("Error submitting question form page: %s", e)
+            # The page may already have been answered or deferred
+            if interaction.response.is_done():
+                await interaction.followup.send(f"❌ An error occurred: {str(e)}", ephemeral=True)
+            else:
+                await interaction.response.send_message(f"❌ An error occurred: {str(e)}", ephemeral=True)
+
+class QuestionFormContinueView(discord.ui.View):
+    """Persistent button that opens the current page of a channel's QuestionForm.
+
+    The button only carries the ticket type, the form is rebuilt from the
+    questionnaire session, so it keeps working after a restart once the
+    view is registered with ``bot.add_view``.
+    """
+
+    def __init__(self, engine, ticket_type: str, label: str = "Continue"):
+        super().__init__(timeout=None)
+        self.engine = engine
+        self.continue_button.label = label
+        self.continue_button.custom_id = f"question_form:{ticket_type}"
+
+    @discord.ui.button(label="Continue", style=discord.ButtonStyle.primary, emoji="📝")
+    async def continue_button(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await open_question_form(self.engine, interaction)
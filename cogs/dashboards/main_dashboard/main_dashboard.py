@@ -66,6 +66,8 @@ class MainDashboard(commands.Cog):
             "host_giveaway": HostGiveawayTicket(bot),
             "sponsorship": SponsorshipTicket(bot)
         }
+        # Panel buttons look handlers up on the bot
+        bot.ticket_handlers = self.ticket_handlers
 
     @app_commands.command(
         name="main_dashboard",
@@ -461,22 +463,22 @@ class StaffManagementView(discord.ui.View):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
         def check(m):
-            return (m.author.id == interaction.user.id and 
-                   m.channel.id == interaction.channel.id and 
-                   (m.mentions or m.role_mentions))
+            return (m.mentions or m.role_mentions)
 
         try:
-            msg = await self.bot.wait_for('message', check=check, timeout=60.0)
+            msg = await self.bot.reply_dispatcher.wait_for_reply(
+                interaction.channel.id, interaction.user.id, check=check, timeout=60.0
+            )
             
             if msg.mentions:
                 user = msg.mentions[0]
-                success = await self.mongo.add_ticket_staff(
+                success = await self.bot.staff_rosters.add_staff(
                     self.ticket_type, interaction.guild.id, user_id=user.id
                 )
                 target = user.mention
             elif msg.role_mentions:
                 role = msg.role_mentions[0]
-                success = await self.mongo.add_ticket_staff(
+                success = await self.bot.staff_rosters.add_staff(
                     self.ticket_type, interaction.guild.id, role_id=role.id
                 )
                 target = role.mention
@@ -592,13 +594,13 @@ class StaffManagementView(discord.ui.View):
         
         if selection.startswith("user_"):
             user_id = int(selection.replace("user_", ""))
-            success = await self.mongo.remove_ticket_staff(
+            success = await self.bot.staff_rosters.remove_staff(
                 self.ticket_type, interaction.guild.id, user_id=user_id
             )
             target = f"<@{user_id}>"
         elif selection.startswith("role_"):
             role_id = int(selection.replace("role_", ""))
-            success = await self.mongo.remove_ticket_staff(
+            success = await self.bot.staff_rosters.remove_staff(
                 self.ticket_type, interaction.guild.id, role_id=role_id
             )
             target = f"<@&{role_id}>"
@@ -745,6 +747,7 @@ class CategorySelectionView(discord.ui.View):
         )
         
         if success:
+            self.bot.ticket_categories.invalidate(interaction.guild.id, ticket_type)
             embed = discord.Embed(
                 title="✅ Category Set",
                 description=f"Set {item.mention} as ticket category for {ticket_type.replace('_', ' ').title()}",
@@ -1,6 +1,7 @@
 import discord
 from typing import Dict, List, Optional
 from datetime import datetime
+from utils.flow_budget import tracked_flow
 
 class MainPanelView(discord.ui.View):
     """Persistent view for the main ticket panel"""
@@ -38,26 +39,13 @@ class MainPanelView(discord.ui.View):
 class TicketButton(discord.ui.Button):
     """Custom button class for ticket creation"""
     
+    @tracked_flow("ticket_panel_button")
     async def callback(self, interaction: discord.Interaction):
         """Handle button clicks"""
         try:
             # Get ticket type from custom_id
             ticket_type = self.custom_id.replace("ticket_", "")
             
-            # Check if user has existing tickets
-            existing_ticket = await self.view.mongo.get_active_ticket(
-                guild_id=interaction.guild_id,
-                user_id=interaction.user.id,
-                ticket_type=ticket_type
-            )
-            
-            if existing_ticket:
-                await interaction.response.send_message(
-                    f"❌ You already have an active {ticket_type.replace('_', ' ')} ticket!",
-                    ephemeral=True
-                )
-                return
-
             # Get ticket handler
             ticket_handler = self.view.bot.ticket_handlers.get(ticket_type)
             if not ticket_handler:
@@ -67,7 +55,7 @@ class TicketButton(discord.ui.Button):
                 )
                 return
 
-            # Start ticket process
+            # Start ticket process; duplicate tickets are rejected by the insert itself
             await ticket_handler.start_ticket(interaction)
 
         except Exception as e:
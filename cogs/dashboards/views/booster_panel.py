@@ -1,6 +1,7 @@
 import discord
 from discord.ext import commands
 from typing import List, Optional
+from utils.flow_budget import tracked_flow
 
 class BoosterPanelView(discord.ui.View):
     def __init__(self, bot, color_roles: List[dict], panel_image: Optional[str] = None):
@@ -15,6 +16,7 @@ class BoosterPanelView(discord.ui.View):
         max_values=1,
         row=0
     )
+    @tracked_flow("color_selection")
     async def select_color(self, interaction: discord.Interaction, select: discord.ui.Select):
         try:
             selected_role_id = int(select.values[0])
@@ -0,0 +1,79 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+
+class CloseTicket(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+
+    @app_commands.command(name="close_ticket", description="🔒 Close this ticket and archive its transcript")
+    async def close_ticket(self, interaction: discord.Interaction, reason: str = None):
+        """Close the current ticket channel"""
+        # Check permissions
+        user_roles = [role.id for role in interaction.user.roles]
+        has_permission = await self.mongo.check_command_permission(
+            command_name="close_ticket",
+            user_id=interaction.user.id,
+            user_roles=user_roles,
+            guild_id=interaction.guild_id
+        )
+
+        if not has_permission:
+            embed = discord.Embed(
+                title="❌ Access Denied",
+                description="You don't have permission to use this command.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        ticket = await self.mongo.get_ticket_by_channel(interaction.channel.id)
+        # Closed tickets whose transcript never got queued can be retried
+        if not ticket or (ticket.get('status') != 'open' and ticket.get('transcript')):
+            embed = discord.Embed(
+                title="❌ Invalid Usage",
+                description="This command can only be used in an open ticket channel.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if ticket.get('status') == 'open':
+            await self.mongo.close_ticket(
+                interaction.guild_id,
+                interaction.channel.id,
+                interaction.user.id,
+                reason or "No reason provided"
+            )
+        # Unanswered questions must not be asked again after a restart
+        await self.bot.questionnaires.cancel(interaction.channel.id, ticket.get('thread_id'))
+
+        embed = discord.Embed(
+            title="🔒 Ticket Closed",
+            description=f"Closed by {interaction.user.mention}",
+            color=0xe67e22,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(
+            name="📋 Reason",
+            value=reason or "No reason provided",
+            inline=False
+        )
+        embed.add_field(
+            name="📜 Transcript",
+            value="Archiving the conversation, this channel will be deleted once it is saved.",
+            inline=False
+        )
+        embed.set_footer(text="Blackspire Nation Ticket System")
+
+        await interaction.response.send_message(embed=embed)
+
+        # Transcript is exported in the background, the channel is deleted once it is saved
+        if not self.bot.transcripts.enqueue(interaction.channel, delete_after=True):
+            await interaction.followup.send(
+                "⚠️ The transcript queue is full, this channel will be kept. Please run the command again later."
+            )
+
+async def setup(bot):
+    await bot.add_cog(CloseTicket(bot))
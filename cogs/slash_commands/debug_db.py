@@ -0,0 +1,99 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import json
+import os
+from utils.mongo_instrumentation import InstrumentedMongoManager
+
+class DebugDB(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+
+    def is_bot_owner(self, user_id: int) -> bool:
+        """Check if user is bot owner"""
+        return user_id == int(os.getenv('BOT_OWNER_ID'))
+
+    @app_commands.command(name="debug_db", description="🩺 Show the slowest database calls (Bot Owner Only)")
+    @app_commands.describe(limit="How many methods to show", sort_by="Order methods by")
+    @app_commands.choices(sort_by=[
+        app_commands.Choice(name="p99 latency", value="p99"),
+        app_commands.Choice(name="Average latency", value="avg"),
+        app_commands.Choice(name="Max latency", value="max"),
+        app_commands.Choice(name="Total time", value="total"),
+        app_commands.Choice(name="Calls", value="calls")
+    ])
+    async def debug_db(
+        self,
+        interaction: discord.Interaction,
+        limit: app_commands.Range[int, 1, 25] = 10,
+        sort_by: str = "p99"
+    ):
+        """Show per-method Mongo timings and recent slow queries"""
+        if not self.is_bot_owner(interaction.user.id):
+            embed = discord.Embed(
+                title="❌ Access Denied",
+                description="Only the bot owner can use this command.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if not isinstance(self.mongo, InstrumentedMongoManager):
+            await interaction.response.send_message(
+                "❌ Database instrumentation is disabled (MONGO_INSTRUMENTATION=0).",
+                ephemeral=True
+            )
+            return
+
+        rows = self.mongo.top_methods(limit, sort_by)
+        embed = discord.Embed(
+            title="🩺 Database Call Timings",
+            color=0x0099ff,
+            timestamp=discord.utils.utcnow()
+        )
+
+        if rows:
+            lines = [f"{'method':<30} {'calls':>6} {'err':>4} {'avg':>7} {'p99':>7} {'max':>7} {'docs':>5}"]
+            for row in rows:
+                p99 = f"{row['p99'] * 1000:.0f}" if row['p99'] != float('inf') else "inf"
+                lines.append(
+                    f"{row['method'][:30]:<30} {row['calls']:>6} {row['errors']:>4} "
+                    f"{row['avg'] * 1000:>7.1f} {p99:>7} {row['max'] * 1000:>7.1f} {row['documents']:>5.1f}"
+                )
+            embed.description = "Times in ms, p99 is a bucket bound\n```\n" + "\n".join(lines)[:3900] + "\n```"
+        else:
+            embed.description = "No database calls recorded yet."
+
+        embed.add_field(
+            name=f"🐢 Slow Calls (≥ {self.mongo.slow_seconds * 1000:.0f} ms)",
+            value=self._format_samples(
+                f"{sample['seconds'] * 1000:.0f} ms {sample['method']}"
+                f"({json.dumps(sample['args'])[:80]}, {json.dumps(sample['kwargs'])[:80]})"
+                for sample in list(self.mongo.slow_calls)[-5:]
+            ),
+            inline=False
+        )
+        embed.add_field(
+            name="🐢 Slow Server Commands",
+            value=self._format_samples(
+                f"{sample['seconds'] * 1000:.0f} ms {sample['command']} {sample['collection']} "
+                f"{json.dumps(sample['shape'])[:150]}"
+                for sample in list(self.mongo.slow_commands)[-5:]
+            ),
+            inline=False
+        )
+
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
+    @staticmethod
+    def _format_samples(samples) -> str:
+        """Format slow samples as a code block that fits in a field"""
+        lines = list(samples)
+        if not lines:
+            return "None"
+        text = "\n".join(reversed(lines))
+        return f"```\n{text[:1000]}\n```"
+
+async def setup(bot):
+    await bot.add_cog(DebugDB(bot))
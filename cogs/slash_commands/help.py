@@ -19,7 +19,7 @@ class Help(commands.Cog):
 
         embed.add_field(
             name="🎫 Ticket System",
-            value="`/main_dashboard` - Manage all ticket panels and configurations\n`/add_to_ticket` - Add members/roles to ticket channels\n`/reject_player` - Reject player applications (Staff Only)",
+            value="`/main_dashboard` - Manage all ticket panels and configurations\n`/add_to_ticket` - Add members/roles to ticket channels\n`/reject_player` - Reject player applications (Staff Only)\n`/close_ticket` - Close a ticket and archive its transcript (Staff Only)",
             inline=False
         )
 
@@ -43,7 +43,7 @@ class Help(commands.Cog):
 
         embed.add_field(
             name="🔐 Admin Panel",
-            value="`/admin_dashboard` - Manage permissions and access (Owner Only)",
+            value="`/admin_dashboard` - Manage permissions and access (Owner Only)\n`/debug_db` - Show the slowest database calls (Owner Only)\n`/profile` - Profile the running bot and upload a flamegraph (Owner Only)",
             inline=False
         )
 
@@ -0,0 +1,94 @@
+import discord
+from discord.ext import commands
+from discord import app_commands
+import io
+import json
+import logging
+import os
+from datetime import datetime
+from utils.profiler import SamplingProfiler
+
+log = logging.getLogger(__name__)
+
+class Profile(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        self.running = False
+
+    def is_bot_owner(self, user_id: int) -> bool:
+        """Check if user is bot owner"""
+        return user_id == int(os.getenv('BOT_OWNER_ID'))
+
+    @app_commands.command(name="profile", description="🔬 Profile the running bot and upload a flamegraph (Bot Owner Only)")
+    @app_commands.describe(
+        seconds="How long to sample for",
+        interval_ms="Milliseconds between samples",
+        output="File format to upload"
+    )
+    @app_commands.choices(output=[
+        app_commands.Choice(name="Speedscope (speedscope.app)", value="speedscope"),
+        app_commands.Choice(name="Collapsed stacks (flamegraph.pl)", value="collapsed")
+    ])
+    async def profile(
+        self,
+        interaction: discord.Interaction,
+        seconds: app_commands.Range[int, 1, 120] = 30,
+        interval_ms: app_commands.Range[int, 1, 100] = 5,
+        output: str = "speedscope"
+    ):
+        """Sample the event loop thread and upload the profile"""
+        if not self.is_bot_owner(interaction.user.id):
+            embed = discord.Embed(
+                title="❌ Access Denied",
+                description="Only the bot owner can use this command.",
+                color=0xff0000
+            )
+            await interaction.response.send_message(embed=embed, ephemeral=True)
+            return
+
+        if self.running:
+            await interaction.response.send_message("❌ A profile is already running.", ephemeral=True)
+            return
+
+        self.running = True
+        try:
+            await interaction.response.defer(thinking=True)
+            # Created here so it samples the event loop thread
+            profiler = await SamplingProfiler(interval=interval_ms / 1000).profile(seconds)
+        except Exception as e:
+            log.error("Error profiling the bot: %s", e)
+            if interaction.response.is_done():
+                embed = discord.Embed(
+                    title="❌ Profile Failed",
+                    description=f"Sampling stopped with an error: {e}",
+                    color=0xff0000
+                )
+                await interaction.followup.send(embed=embed)
+            return
+        finally:
+            self.running = False
+
+        stamp = datetime.utcnow().strftime('%Y%m%d-%H%M%S')
+        if output == "collapsed":
+            data = profiler.collapsed().encode('utf-8')
+            filename = f"profile-{stamp}.collapsed.txt"
+        else:
+            data = json.dumps(profiler.speedscope(f"Blackspire bot {stamp}")).encode('utf-8')
+            filename = f"profile-{stamp}.speedscope.json"
+
+        embed = discord.Embed(
+            title="🔬 Profile Complete",
+            description=f"Sampled the event loop for **{profiler.duration:.1f}s** every **{interval_ms} ms**.",
+            color=0x0099ff,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(name="📊 Samples", value=str(profiler.sample_count), inline=True)
+        embed.add_field(name="🧵 Unique Stacks", value=str(len(profiler.samples)), inline=True)
+        top = "\n".join(f"{count:>5} {name[:80]}" for name, count in profiler.top_functions(8))
+        if top:
+            embed.add_field(name="🔥 Top Functions (self samples)", value=f"```\n{top[:1000]}\n```", inline=False)
+
+        await interaction.followup.send(embed=embed, file=discord.File(io.BytesIO(data), filename=filename))
+
+async def setup(bot):
+    await bot.add_cog(Profile(bot))
@@ -1,14 +1,40 @@
+import logging
 import discord
 from discord.ext import commands
+from discord import app_commands
 import asyncio
 import os
 from dotenv import load_dotenv
 from utils.mongo_manager import MongoManager
+from utils.mongo_instrumentation import InstrumentedMongoManager
+from utils.metrics import install_discord_ratelimit_metrics
+from utils.flow_budget import install_flow_budget
+from utils.metrics_server import MetricsServer
+from utils.structured_logging import bind_interaction, setup_logging, shutdown_logging
 from utils.data_manager import DataManager
+from utils.ticket_categories import TicketCategoryResolver
+from utils.staff_roster import StaffRosterCache
+from utils.clan_catalog import ClanCatalog
+from utils.questionnaire import QuestionnaireEngine
+from utils.reply_dispatcher import ReplyDispatcher
+from utils.attachments import AttachmentPipeline
+from utils.transcripts import TranscriptExporter
+from utils.ticket_reaper import TicketReaper
+from utils.ticket_archive import TicketArchiver
+from utils.clan_sync import ClanRosterSync
+from utils.loop_monitor import LoopLagMonitor
+
+log = logging.getLogger(__name__)
 
 # Load environment variables
 load_dotenv()
 
+class BlackspireCommandTree(app_commands.CommandTree):
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        # Runs in the command's own task, so every log line of the command carries its context
+        bind_interaction(interaction)
+        return True
+
 class BlackspireBot(commands.Bot):
     def __init__(self):
         intents = discord.Intents.default()
@@ -19,28 +45,90 @@ class BlackspireBot(commands.Bot):
         super().__init__(
             command_prefix='!',
             intents=intents,
-            help_command=None
+            help_command=None,
+            tree_cls=BlackspireCommandTree
         )
 
         # Initialize managers
         self.mongo_manager = None  # Will be initialized in setup_hook
         self.data_manager = None   # Will be initialized in setup_hook
+        self.ticket_categories = None  # Will be initialized in setup_hook
+        self.staff_rosters = None      # Will be initialized in setup_hook
+        self.clan_catalog = None       # Will be initialized in setup_hook
+        self.questionnaires = None     # Will be initialized in setup_hook
+        self.attachments = None        # Will be initialized in setup_hook
+        self.transcripts = None        # Will be initialized in setup_hook
+        self.ticket_reaper = None      # Will be initialized in setup_hook
+        self.ticket_archiver = None    # Will be initialized in setup_hook
+        self.clan_sync = None          # Will be initialized in setup_hook
+        self.metrics_server = None     # Will be initialized in setup_hook
+        self.loop_monitor = None       # Will be initialized in setup_hook
+
+        # Replies awaited by dashboards and tickets, routed by (channel_id, user_id)
+        self.reply_dispatcher = ReplyDispatcher()
+        self.add_listener(self.reply_dispatcher.on_message, 'on_message')
 
     async def setup_hook(self):
         """Initialize bot systems and load all cogs"""
         try:
-            # Initialize MongoDB connection first
-            print("\n🔄 Initializing MongoDB connection...")
+            # Hooks go in before MongoDB connects, its client only picks up listeners registered earlier
+            install_discord_ratelimit_metrics()
+            install_flow_budget()
+
+            # Initialize MongoDB connection
+            log.info("🔄 Initializing MongoDB connection...")
             try:
+                # Every MongoManager call is instrumented through the proxy unless disabled
                 self.mongo_manager = MongoManager()
+                if os.getenv('MONGO_INSTRUMENTATION', '1').lower() not in ('0', 'false', 'no'):
+                    self.mongo_manager = InstrumentedMongoManager(self.mongo_manager)
                 await self.mongo_manager.initialize()
-                self.data_manager = DataManager(self.mongo_manager)
-                print("✅ MongoDB initialized with all collections")
+                self.clan_catalog = ClanCatalog(self.mongo_manager)
+                self.data_manager = DataManager(self.mongo_manager, self.clan_catalog)
+                self.ticket_categories = TicketCategoryResolver(self.mongo_manager)
+                self.staff_rosters = StaffRosterCache(self.mongo_manager)
+                self.questionnaires = QuestionnaireEngine(self)
+                await self.questionnaires.restore()
+                self.add_listener(self.questionnaires.on_message, 'on_message')
+                self.add_listener(self.questionnaires.on_channel_delete, 'on_guild_channel_delete')
+                self.attachments = AttachmentPipeline.from_env(self.mongo_manager)
+                self.transcripts = TranscriptExporter(self, directory=os.getenv('TRANSCRIPT_DIR', 'transcripts'))
+                self.transcripts.start()
+                self.ticket_reaper = TicketReaper(
+                    self,
+                    interval=float(os.getenv('TICKET_REAPER_INTERVAL', 3600)),
+                    dry_run=os.getenv('TICKET_REAPER_DRY_RUN', '').lower() in ('1', 'true', 'yes')
+                )
+                self.ticket_reaper.start()
+                self.ticket_archiver = TicketArchiver(self)
+                self.ticket_archiver.start()
+                self.clan_sync = ClanRosterSync(self, interval=float(os.getenv('CLAN_SYNC_INTERVAL', 1800)))
+                self.clan_sync.start()
+                log.info("✅ MongoDB initialized with all collections")
             except Exception as e:
-                print(f"❌ Failed to initialize MongoDB: {str(e)}")
+                log.error("❌ Failed to initialize MongoDB: %s", e)
                 raise SystemExit("Cannot continue without MongoDB connection")
             
-            print("\n🔄 Loading cogs...")
+            # Metrics are optional, a busy port must not stop the bot
+            try:
+                self.metrics_server = MetricsServer(
+                    host=os.getenv('METRICS_HOST', '127.0.0.1'),
+                    port=int(os.getenv('METRICS_PORT', 9108))
+                )
+                await self.metrics_server.start()
+            except Exception as e:
+                log.warning("⚠️ Metrics endpoint unavailable: %s", e)
+                self.metrics_server = None
+
+            # Watch for anything blocking the event loop
+            self.loop_monitor = LoopLagMonitor(
+                self,
+                threshold=float(os.getenv('LOOP_LAG_THRESHOLD', 0.25)),
+                alert_channel_id=int(os.getenv('OWNER_ALERT_CHANNEL_ID', 0)) or None
+            )
+            self.loop_monitor.start()
+
+            log.info("🔄 Loading cogs...")
             # Organized by category
             cogs_to_load = {
                 "Slash Commands": [
@@ -48,6 +136,9 @@ class BlackspireBot(commands.Bot):
                     'cogs.slash_commands.disable_counting',
                     'cogs.slash_commands.add_to_ticket',
                     'cogs.slash_commands.reject_player',
+                    'cogs.slash_commands.close_ticket',
+                    'cogs.slash_commands.debug_db',
+                    'cogs.slash_commands.profile',
                     'cogs.slash_commands.help'
                 ],
                 "Dashboards": [
@@ -64,26 +155,26 @@ class BlackspireBot(commands.Bot):
             # Load cogs by category
             failed_cogs = []
             for category, cogs in cogs_to_load.items():
-                print(f"\n📁 Loading {category}:")
+                log.info("📁 Loading %s:", category)
                 for cog in cogs:
                     try:
                         await self.load_extension(cog)
-                        print(f'  ✅ Loaded {cog}')
+                        log.info("✅ Loaded %s", cog)
                     except Exception as e:
-                        print(f'  ❌ Failed to load {cog}: {str(e)}')
+                        log.error("❌ Failed to load %s: %s", cog, e)
                         failed_cogs.append((cog, str(e)))
 
             # Summary
             if failed_cogs:
-                print("\n❌ Some cogs failed to load:")
+                log.error("❌ Some cogs failed to load:")
                 for cog, error in failed_cogs:
-                    print(f"  • {cog}: {error}")
+                    log.error("• %s: %s", cog, error)
                 raise RuntimeError("Not all cogs loaded successfully")
             else:
-                print("\n✅ All cogs loaded successfully")
+                log.info("✅ All cogs loaded successfully")
                     
         except Exception as e:
-            print(f'\n❌ Critical initialization error: {e}')
+            log.error("❌ Critical initialization error: %s", e)
             raise  # Re-raise the exception to prevent the bot from starting with incomplete initialization
 
     async def on_ready(self):
@@ -95,20 +186,41 @@ class BlackspireBot(commands.Bot):
             ),
             status=discord.Status.online
         )
-        print(f'✅ {self.user} is ready!')
+        log.info("✅ %s is ready!", self.user)
 
-        print(f'🚀 {self.user} is now online!')
-        print(f'📊 Connected to {len(self.guilds)} guild(s)')
+        log.info("🚀 %s is now online!", self.user)
+        log.info("📊 Connected to %s guild(s)", len(self.guilds))
 
         # Sync slash commands
         try:
             synced = await self.tree.sync()
-            print(f'🔄 Synced {len(synced)} command(s)')
+            log.info("🔄 Synced %s command(s)", len(synced))
         except Exception as e:
-            print(f'❌ Failed to sync commands: {e}')
+            log.error("❌ Failed to sync commands: %s", e)
+
+    async def close(self):
+        """Release shared HTTP sessions before shutting down"""
+        if self.loop_monitor:
+            await self.loop_monitor.stop()
+        if self.ticket_reaper:
+            await self.ticket_reaper.stop()
+        if self.ticket_archiver:
+            await self.ticket_archiver.stop()
+        if self.clan_sync:
+            await self.clan_sync.stop()
+        if self.transcripts:
+            await self.transcripts.stop()
+        if self.attachments:
+            await self.attachments.close()
+        if self.metrics_server:
+            await self.metrics_server.stop()
+        await super().close()
+        shutdown_logging()
 
 # Bot instance
 bot = BlackspireBot()
 
 if __name__ == "__main__":
-    bot.run(os.getenv('BOT_TOKEN'))
+    # JSON logs go through a background writer thread, discord.py's own handler is not needed
+    setup_logging()
+    bot.run(os.getenv('BOT_TOKEN'), log_handler=None)
@@ -0,0 +1,159 @@
+"""
+Discord REST calls of the user-facing flows, driven offline.
+
+Runs the same chain as benchmarks/flow_rest_calls.py against the fake
+transport on a virtual clock and pins the requests each flow makes, so a
+change that adds a call to a flow fails here instead of showing up as
+rate-limit waits in production.
+"""
+import asyncio
+from typing import Any, Dict
+
+import pytest
+
+pytest.importorskip('discord')
+pytest.importorskip('aiohttp')
+pytest.importorskip('mongomock_motor')
+
+import discord
+
+from benchmarks.clash_king_stub import player_stats_payload
+from benchmarks.fake_discord import FakeInteraction, FakeMessage, FakeRest, click
+from benchmarks.flow_rest_calls import make_clan, measure
+from benchmarks.flows_bench import Environment, connect_mongo
+from cogs.dashboards.main_dashboard.TICKETS.join_clan import ClanDecisionView, FinalConfirmationView, JoinClanTicket
+from cogs.dashboards.main_dashboard.main_dashboard import MainDashboardView
+
+ACCOUNTS = 3
+LATENCY = 0.1
+
+CALLBACK = 'POST /interactions/{interaction_id}/{interaction_token}/callback'
+FOLLOWUP = 'POST /webhooks/{application_id}/{interaction_token}'
+SEND_MESSAGE = 'POST /channels/{channel_id}/messages'
+CREATE_CHANNEL = 'POST /guilds/{guild_id}/channels'
+CREATE_THREAD = 'POST /channels/{channel_id}/threads'
+
+async def run_flows() -> Dict[str, Any]:
+    """Run every flow once in a fresh guild and keep what the tests look at"""
+    mongo, _, db_name = await connect_mongo(None)
+    rest = FakeRest(LATENCY, realtime=False)
+    env = Environment(mongo, rest)
+    guild = env.guild
+    leadership_role = guild.add_role("BSN Leadership")
+    leader = guild.add_member("clan-leader", roles=[leadership_role])
+    applicant = guild.add_member("applicant")
+    await mongo.add_ticket_staff('join_clan', guild.id, role_id=env.staff_role.id)
+    handler = JoinClanTicket(env.bot)
+    state: Dict[str, Any] = {'results': {}, 'leader': leader}
+    results = state['results']
+
+    try:
+        button = FakeInteraction(guild, applicant, env.panel)
+        results['panel_button'] = await measure(rest, lambda: handler.start_ticket(button))
+        channel = discord.utils.get(guild.text_channels, name=f"{handler.get_ticket_type()}-{applicant.name}")
+        thread = channel.threads[0]
+        state.update(
+            button=button, channel=channel, thread=thread,
+            ticket=await mongo.get_active_ticket(guild.id, applicant.id, handler.get_ticket_type())
+        )
+        state['questions'] = list(thread.messages)
+
+        player_data = [handler.parse_player_data(player_stats_payload(f"P{n}")) for n in range(ACCOUNTS)]
+        selected_clans = [make_clan(n, leader, leadership_role) for n in range(ACCOUNTS)]
+        confirmation = FakeMessage(channel, guild.me, view=FinalConfirmationView(
+            env.bot, handler, 'Europe', '17-25', player_data,
+            [clan['clan_type'] for clan in selected_clans], thread, selected_clans
+        ))
+        state['confirmation'] = confirmation
+
+        results['submission'] = await measure(rest, lambda: click(
+            confirmation.view, "Confirm & Submit", FakeInteraction(guild, applicant, channel, confirmation)
+        ))
+        decision = next(message for message in thread.messages if isinstance(message.view, ClanDecisionView))
+        state['decision'] = decision
+        state['decision_embeds'] = list(decision.embeds)
+
+        before = len(thread.messages)
+        results['accept'] = await measure(rest, lambda: click(
+            decision.view, "Accept Player", FakeInteraction(guild, leader, thread, decision)
+        ))
+        state['invites'] = thread.messages[before:]
+
+        async def panel_deployment():
+            interaction = FakeInteraction(guild, env.staff, env.panel)
+            await click(MainDashboardView(env.bot), "Deploy Panels", interaction)
+            message = interaction.response_message
+
+            interaction = FakeInteraction(guild, env.staff, env.panel, message)
+            await click(message.view, "Deploy Individual Panels", interaction)
+            message = interaction.response_message
+
+            await click(
+                message.view, "individual_panel_callback",
+                FakeInteraction(guild, env.staff, env.panel, message), values=["deploy_help_support"]
+            )
+            interaction = FakeInteraction(guild, env.staff, env.panel, message)
+            await click(message.view, "item_selected", interaction, values=[str(env.panel.id)])
+            state['deployed'] = interaction.response_message
+
+        results['panel_deployment'] = await measure(rest, panel_deployment)
+    finally:
+        await mongo.client.drop_database(db_name)
+        mongo.client.close()
+    return state
+
+@pytest.fixture(scope='module')
+def flows() -> Dict[str, Any]:
+    return asyncio.run(run_flows())
+
+def test_panel_button_opens_ticket(flows):
+    result = flows['results']['panel_button']
+    assert result['routes'] == {
+        CALLBACK: 1,
+        CREATE_CHANNEL: 2,
+        SEND_MESSAGE: 2,
+        CREATE_THREAD: 1,
+        FOLLOWUP: 1
+    }
+    assert result['calls'] == 7
+    assert result['rate_limit_waits'] == 0
+
+    assert flows['channel'].category.name == "Tickets"
+    assert flows['ticket']['channel_id'] == flows['channel'].id
+    assert flows['ticket']['thread_id'] == flows['thread'].id
+    assert flows['button'].followups[0].content.startswith("✅ Your ticket has been created")
+    assert [message.embeds[0].title for message in flows['questions']] == ["Question 1/4"]
+
+def test_submission_posts_one_decision_message(flows):
+    result = flows['results']['submission']
+    assert result['routes'] == {SEND_MESSAGE: 1, CALLBACK: 1}
+    assert result['calls'] == 2
+    assert result['rate_limit_waits'] == 0
+
+    decision = flows['decision']
+    assert flows['leader'].mention in decision.content
+    assert [embed.title for embed in flows['decision_embeds']] == [
+        "🎯 NEW CLAN APPLICATION", *(f"📋 Account {n + 1} Application" for n in range(ACCOUNTS))
+    ]
+    assert flows['confirmation'].embeds[0].title == "✅ Application Submitted"
+    assert flows['confirmation'].view is None
+
+def test_accept_sends_one_invite_per_account(flows):
+    result = flows['results']['accept']
+    assert result['routes'] == {SEND_MESSAGE: ACCOUNTS, CALLBACK: 1}
+    assert result['calls'] == ACCOUNTS + 1
+    assert result['rate_limit_waits'] == 0
+
+    assert [message.embeds[0].title for message in flows['invites']] == [
+        f"🏰 Clan Invitation for Player P{n}" for n in range(ACCOUNTS)
+    ]
+    decision = flows['decision']
+    assert decision.view is None
+    assert decision.embeds[-1].title == "✅ Player Accepted"
+
+def test_panel_deployment_only_answers_interactions(flows):
+    result = flows['results']['panel_deployment']
+    assert result['routes'] == {CALLBACK: 4}
+    assert result['calls'] == 4
+    assert result['rate_limit_waits'] == 0
+    assert flows['deployed'].embeds[0].title == "🚀 Panel Deployed"
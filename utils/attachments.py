@@ -0,0 +1,263 @@
+import logging
+import asyncio
+import hashlib
+import io
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import aiohttp
+import discord
+from gridfs.errors import FileExists, NoFile
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket
+
+log = logging.getLogger(__name__)
+
+try:
+    from PIL import Image
+except ImportError:  # Thumbnails are skipped without Pillow, originals are stored instead
+    Image = None
+
+# Largest attachment we download; bigger uploads keep their CDN URL
+MAX_ATTACHMENT_BYTES = 8 * 1024 * 1024
+THUMBNAIL_SIZE = (1024, 1024)
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+class LocalAttachmentStore:
+    """Stores attachment blobs as files in a directory (for development and testing)"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key)
+
+    async def put(self, key: str, data: bytes):
+        """Store a blob under a key"""
+        await asyncio.to_thread(self._write, self._path(key), data)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Load a blob by key"""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        return await asyncio.to_thread(self._read, path)
+
+    @staticmethod
+    def _write(path: str, data: bytes):
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @staticmethod
+    def _read(path: str) -> bytes:
+        with open(path, 'rb') as f:
+            return f.read()
+
+class GridFSAttachmentStore:
+    """Stores attachment blobs in a GridFS bucket"""
+
+    def __init__(self, db, bucket_name: str = 'attachment_blobs'):
+        self.bucket = AsyncIOMotorGridFSBucket(db, bucket_name=bucket_name)
+
+    async def put(self, key: str, data: bytes):
+        """Store a blob under a key, a blob already stored under it is kept"""
+        if await self.bucket.find({'_id': key}, limit=1).to_list(length=1):
+            return
+        try:
+            await self.bucket.upload_from_stream_with_id(key, key, data)
+        except FileExists:
+            # Chunks left by an interrupted upload, the file document is only written last
+            try:
+                await self.bucket.delete(key)
+            except NoFile:
+                pass
+            await self.bucket.upload_from_stream_with_id(key, key, data)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Load a blob by key"""
+        try:
+            stream = await self.bucket.open_download_stream(key)
+            return await stream.read()
+        except Exception:
+            return None
+
+class AttachmentPipeline:
+    """Downloads, deduplicates and stores ticket attachments.
+
+    Attachments are streamed into a SHA-256 hash with a bounded number of
+    concurrent downloads. Each hash is stored once (image uploads as a
+    compact thumbnail) and referenced by a small metadata document, so
+    review embeds can re-upload the image long after the CDN URL expires.
+    """
+
+    def __init__(self, mongo_manager, store, max_concurrency: int = 4):
+        self.mongo = mongo_manager
+        self.store = store
+        self.session = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._inflight: Dict[str, asyncio.Future] = {}  # sha256 -> metadata being stored
+
+    @classmethod
+    def from_env(cls, mongo_manager) -> 'AttachmentPipeline':
+        """Use a local store when ATTACHMENT_STORE_PATH is set, GridFS otherwise"""
+        path = os.getenv('ATTACHMENT_STORE_PATH')
+        store = LocalAttachmentStore(path) if path else GridFSAttachmentStore(mongo_manager.db)
+        return cls(mongo_manager, store)
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get or create aiohttp session"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def close(self):
+        """Close the aiohttp session"""
+        if self.session and not self.session.closed:
+            await self.session.close()
+
+    async def ingest(self, attachment: discord.Attachment) -> Optional[Dict[str, Any]]:
+        """Store one attachment and get its metadata, or None if it was not stored"""
+        if attachment.size > MAX_ATTACHMENT_BYTES:
+            return None
+
+        try:
+            data, sha256 = await self._download(attachment.url)
+        except Exception as e:
+            log.error("Error downloading attachment %s: %s", attachment.filename, e)
+            return None
+        if data is None:
+            return None
+
+        # Same file already being stored by another task
+        pending = self._inflight.get(sha256)
+        if pending:
+            return await pending
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[sha256] = future
+        try:
+            # Same file stored earlier, reuse it
+            metadata = await self.mongo.get_attachment(sha256)
+            if not metadata:
+                metadata = await self._store(sha256, data, attachment)
+            future.set_result(metadata)
+            return metadata
+        except Exception as e:
+            log.error("Error storing attachment %s: %s", attachment.filename, e)
+            future.set_result(None)
+            return None
+        finally:
+            # Cancelled while storing, waiters on the same file must not hang
+            if not future.done():
+                future.set_result(None)
+            del self._inflight[sha256]
+
+    async def ingest_many(self, attachments: List[discord.Attachment]) -> List[Optional[Dict[str, Any]]]:
+        """Store several attachments concurrently, keeping their order"""
+        return await asyncio.gather(*(self.ingest(attachment) for attachment in attachments))
+
+    async def _download(self, url: str):
+        """Stream a file into memory while hashing it"""
+        async with self._semaphore:
+            session = await self._get_session()
+            async with session.get(url) as response:
+                response.raise_for_status()
+                digest = hashlib.sha256()
+                buffer = io.BytesIO()
+                async for chunk in response.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                    if buffer.tell() + len(chunk) > MAX_ATTACHMENT_BYTES:
+                        return None, None
+                    digest.update(chunk)
+                    buffer.write(chunk)
+        return buffer.getvalue(), digest.hexdigest()
+
+    async def _store(self, sha256: str, data: bytes, attachment: discord.Attachment) -> Optional[Dict[str, Any]]:
+        """Write the blob and its metadata, or None if the metadata could not be saved"""
+        content_type = attachment.content_type or 'application/octet-stream'
+        filename = stored_filename(sha256, attachment.filename)
+        width = height = None
+
+        if content_type.startswith('image/') and Image is not None:
+            data, width, height = await asyncio.to_thread(self._make_thumbnail, data)
+            content_type = 'image/webp'
+            filename = stored_filename(sha256, 'thumbnail.webp')
+
+        await self.store.put(sha256, data)
+        metadata = {
+            'sha256': sha256,
+            'filename': filename,
+            'original_filename': attachment.filename,
+            'content_type': content_type,
+            'size': len(data),
+            'original_size': attachment.size,
+            'width': width,
+            'height': height,
+            'created_at': datetime.utcnow()
+        }
+        # The blob is kept either way, storing it again is a no-op
+        if not await self.mongo.save_attachment(metadata):
+            return None
+        return metadata
+
+    @staticmethod
+    def _make_thumbnail(data: bytes):
+        """Downscale an image and re-encode it as WebP"""
+        with Image.open(io.BytesIO(data)) as image:
+            image.thumbnail(THUMBNAIL_SIZE)
+            if image.mode not in ('RGB', 'RGBA'):
+                image = image.convert('RGBA')
+            output = io.BytesIO()
+            image.save(output, format='WEBP', quality=80)
+            return output.getvalue(), image.width, image.height
+
+    async def get_file(self, metadata: Dict[str, Any]) -> Optional[discord.File]:
+        """Load a stored attachment as a file ready to upload"""
+        data = await self.store.get(metadata['sha256'])
+        if data is None:
+            return None
+        # Named by hash, metadata stored before this may carry the user's original name
+        return discord.File(io.BytesIO(data), filename=stored_filename(metadata['sha256'], metadata['filename']))
+
+    async def send_images(
+        self,
+        destination: discord.abc.Messageable,
+        title: str,
+        references: List[Dict[str, Any]],
+        color: int = 0x3498db
+    ):
+        """Send one image embed per attachment reference, ten embeds per message.
+
+        Stored attachments are re-uploaded from the cache; references that
+        were never stored fall back to their original URL.
+        """
+        for start in range(0, len(references), 10):
+            embeds, files = [], {}
+            for i, reference in enumerate(references[start:start + 10], start=start + 1):
+                embed = discord.Embed(
+                    title=f"{title} ({i}/{len(references)})" if len(references) > 1 else title,
+                    color=color
+                )
+                metadata = await self.mongo.get_attachment(reference['sha256']) if reference.get('sha256') else None
+                file = None
+                if metadata:
+                    file = files.get(metadata['sha256']) or await self.get_file(metadata)
+                if file:
+                    # Duplicate uploads share one file in the message
+                    files[metadata['sha256']] = file
+                    embed.set_image(url=f"attachment://{file.filename}")
+                elif reference.get('url'):
+                    embed.set_image(url=reference['url'])
+                embeds.append(embed)
+            await destination.send(embeds=embeds, files=list(files.values()))
+
+def stored_filename(sha256: str, original: str) -> str:
+    """Name a stored file by its hash, so different uploads never share a name"""
+    return f"{sha256[:16]}{os.path.splitext(original)[1].lower()}"
+
+def attachment_reference(attachment: discord.Attachment, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Small reference to an attachment, stored in tickets instead of the raw URL"""
+    return {
+        'sha256': metadata['sha256'] if metadata else None,
+        'filename': attachment.filename,
+        'url': attachment.url
+    }
@@ -0,0 +1,159 @@
+import asyncio
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+from .clan_ranking import ClanFeatures, rank_clans
+
+class ClanCatalog:
+    """In-memory clan catalog per guild, indexed for Town Hall matching.
+
+    Each guild's clans are grouped by clan type and sorted by
+    ``min_town_hall``, so the clans a player qualifies for are a prefix
+    found with one bisect. The catalog is loaded once per guild and kept
+    fresh by routing clan writes through it (write-through). A failed load
+    is not kept, the guild looks empty for that call and is read again on
+    the next one.
+    """
+
+    def __init__(self, mongo_manager):
+        self.mongo = mongo_manager
+        self._clans: Dict[int, Dict[str, Dict]] = {}  # guild_id -> clan_id -> clan
+        self._index: Dict[int, Dict[str, Tuple[List[int], List[Dict]]]] = {}  # guild_id -> type -> (min THs, clans)
+        self._features: Dict[int, Tuple[List[int], List[ClanFeatures]]] = {}  # guild_id -> (min THs, features)
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, guild_id: int):
+        """Drop a guild's catalog so it is reloaded on next use"""
+        self._clans.pop(guild_id, None)
+        self._index.pop(guild_id, None)
+        self._features.pop(guild_id, None)
+
+    async def _ensure_loaded(self, guild_id: int):
+        if guild_id in self._index:
+            self.hits += 1
+            return
+        self.misses += 1
+        lock = self._locks.setdefault(guild_id, asyncio.Lock())
+        async with lock:
+            if guild_id in self._index:
+                return
+            clans = await self.mongo.get_all_clans(guild_id)
+            if clans is None:
+                return
+            self._clans[guild_id] = {str(clan['_id']): clan for clan in clans}
+            for snapshot in await self.mongo.get_clan_snapshots(guild_id):
+                self._merge_snapshot(guild_id, snapshot)
+            self._reindex(guild_id)
+
+    def _reindex(self, guild_id: int):
+        """Rebuild the per-type sorted index of a guild"""
+        by_type: Dict[str, List[Dict]] = {}
+        for clan in self._clans.get(guild_id, {}).values():
+            by_type.setdefault(str(clan.get('clan_type', 'regular')).lower(), []).append(clan)
+
+        index = {}
+        for clan_type, clans in by_type.items():
+            clans.sort(key=self._min_town_hall)
+            index[clan_type] = ([self._min_town_hall(clan) for clan in clans], clans)
+        self._index[guild_id] = index
+
+        # Ranking features for every clan, sorted by minimum Town Hall
+        features = sorted(
+            (ClanFeatures(clan) for clan in self._clans.get(guild_id, {}).values()),
+            key=lambda clan_features: clan_features.min_town_hall
+        )
+        self._features[guild_id] = ([clan_features.min_town_hall for clan_features in features], features)
+
+    @staticmethod
+    def _min_town_hall(clan: Dict) -> int:
+        try:
+            return int(clan.get('min_town_hall') or 1)
+        except (TypeError, ValueError):
+            return 1
+
+    def _merge_snapshot(self, guild_id: int, snapshot: Dict[str, Any]) -> bool:
+        clan = self._clans.get(guild_id, {}).get(snapshot['clan_id'])
+        if clan is None:
+            return False
+        clan['snapshot'] = snapshot
+        clan['member_count'] = snapshot.get('member_count')
+        return True
+
+    def apply_snapshot(self, snapshot: Dict[str, Any]):
+        """Update a loaded clan with a fresh Clash King snapshot"""
+        guild_id = snapshot.get('guild_id')
+        if guild_id in self._clans and self._merge_snapshot(guild_id, snapshot):
+            self._reindex(guild_id)
+
+    # Queries
+    async def get_all(self, guild_id: int) -> List[Dict]:
+        """Get every clan of a guild"""
+        await self._ensure_loaded(guild_id)
+        return list(self._clans.get(guild_id, {}).values())
+
+    async def get_clan(self, guild_id: int, clan_id: str) -> Optional[Dict]:
+        """Get a clan by ID"""
+        await self._ensure_loaded(guild_id)
+        return self._clans.get(guild_id, {}).get(str(clan_id))
+
+    async def eligible(self, guild_id: int, clan_type: str, town_hall: int) -> List[Dict]:
+        """Get clans of a type whose minimum Town Hall the player meets"""
+        await self._ensure_loaded(guild_id)
+        return self._eligible(guild_id, clan_type, town_hall)
+
+    async def match_accounts(self, guild_id: int, accounts: List[Tuple[str, int]]) -> List[List[Dict]]:
+        """Get eligible clans for several (clan_type, town_hall) accounts at once"""
+        await self._ensure_loaded(guild_id)
+        return [self._eligible(guild_id, clan_type, town_hall) for clan_type, town_hall in accounts]
+
+    async def ranked_matches(
+        self,
+        guild_id: int,
+        accounts: List[Tuple[str, int]],
+        continent: Optional[str] = None
+    ) -> List[List[Dict]]:
+        """Get eligible clans for several (clan_type, town_hall) accounts, best fit first"""
+        await self._ensure_loaded(guild_id)
+        min_town_halls, features = self._features.get(guild_id, ([], []))
+        return [
+            rank_clans(features[:bisect_right(min_town_halls, town_hall or 0)], clan_type, town_hall or 0, continent)
+            for clan_type, town_hall in accounts
+        ]
+
+    def _eligible(self, guild_id: int, clan_type: str, town_hall: int) -> List[Dict]:
+        entry = self._index.get(guild_id, {}).get(str(clan_type).lower())
+        if not entry:
+            return []
+        min_town_halls, clans = entry
+        return clans[:bisect_right(min_town_halls, town_hall or 0)]
+
+    # Write-through mutations
+    async def save_clan(self, clan_data: Dict[str, Any], guild_id: int) -> bool:
+        """Save a new clan"""
+        success = await self.mongo.save_clan_data(clan_data, guild_id)
+        if success and guild_id in self._clans and '_id' in clan_data:
+            self._clans[guild_id][str(clan_data['_id'])] = clan_data
+            self._reindex(guild_id)
+        return success
+
+    async def update_clan_field(self, guild_id: int, clan_id: str, field: str, value: Any) -> bool:
+        """Update one field of a clan"""
+        return await self.update_clan_data(guild_id, clan_id, {field: value})
+
+    async def update_clan_data(self, guild_id: int, clan_id: str, updates: Dict[str, Any]) -> bool:
+        """Update several fields of a clan"""
+        success = await self.mongo.update_clan_data(clan_id, updates)
+        clan = self._clans.get(guild_id, {}).get(str(clan_id))
+        if success and clan is not None:
+            clan.update(updates)
+            self._reindex(guild_id)
+        return success
+
+    async def delete_clan(self, guild_id: int, clan_id: str) -> bool:
+        """Delete a clan"""
+        success = await self.mongo.delete_clan(clan_id)
+        if success and guild_id in self._clans:
+            self._clans[guild_id].pop(str(clan_id), None)
+            self._reindex(guild_id)
+        return success
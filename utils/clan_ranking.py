@@ -0,0 +1,69 @@
+from typing import Dict, List, Optional
+
+# A clan in Clash of Clans holds at most 50 members
+MAX_CLAN_MEMBERS = 50
+
+# Score weights, the Town Hall fit dominates and the rest break ties between fits
+WEIGHT_TOWN_HALL = 3.0
+WEIGHT_OPEN_SLOTS = 2.0
+WEIGHT_CONTINENT = 1.5
+
+def normalize_clan_type(clan_type: Optional[str]) -> str:
+    return str(clan_type or 'regular').strip().lower()
+
+class ClanFeatures:
+    """Precomputed ranking inputs for one clan"""
+
+    __slots__ = ('clan', 'min_town_hall', 'clan_type', 'open_slots', 'continent')
+
+    def __init__(self, clan: Dict):
+        self.clan = clan
+        try:
+            self.min_town_hall = int(clan.get('min_town_hall') or 1)
+        except (TypeError, ValueError):
+            self.min_town_hall = 1
+        self.clan_type = normalize_clan_type(clan.get('clan_type'))
+
+        # Member count comes from the Clash King snapshot when one exists
+        members = clan.get('member_count')
+        self.open_slots = (
+            max(0, MAX_CLAN_MEMBERS - int(members)) / MAX_CLAN_MEMBERS
+            if members is not None else None
+        )
+
+        continent = clan.get('continent')
+        self.continent = continent.lower() if continent else None
+
+def rank_clans(
+    candidates: List[ClanFeatures],
+    clan_type: str,
+    town_hall: int,
+    continent: Optional[str] = None
+) -> List[Dict]:
+    """Order clans by how well they fit an applicant, dropping other clan types and full clans"""
+    wanted_type = normalize_clan_type(clan_type)
+    continent = continent.lower() if continent else None
+
+    scored = []
+    for features in candidates:
+        # Only the exact clan type the applicant picked is eligible
+        if features.clan_type != wanted_type or features.open_slots == 0:
+            continue
+
+        # Closer minimum Town Hall means a stronger, better matched clan
+        gap = town_hall - features.min_town_hall
+        if gap < 0:
+            continue
+        score = WEIGHT_TOWN_HALL / (1 + gap)
+
+        score += WEIGHT_OPEN_SLOTS * (features.open_slots if features.open_slots is not None else 0.5)
+
+        if continent and features.continent:
+            score += WEIGHT_CONTINENT * (features.continent == continent)
+        else:
+            score += WEIGHT_CONTINENT * 0.5
+
+        scored.append((score, features.clan))
+
+    scored.sort(key=lambda entry: entry[0], reverse=True)
+    return [clan for score, clan in scored]
@@ -0,0 +1,143 @@
+import logging
+import asyncio
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qs, urlparse
+from .clash_king_api import ClashKingAPI
+
+log = logging.getLogger(__name__)
+
+def clan_tag(clan: Dict[str, Any]) -> Optional[str]:
+    """Get a clan's tag from its document or its in-game invite link"""
+    tag = clan.get('tag')
+    if not tag and clan.get('invite_link'):
+        query = parse_qs(urlparse(clan['invite_link']).query)
+        tag = (query.get('tag') or [None])[0]
+    if not tag:
+        return None
+    return '#' + tag.strip().lstrip('#').upper()
+
+class ClanRosterSync:
+    """Keeps a compact Clash King snapshot of every registered clan.
+
+    Each cycle spreads its requests evenly over the interval instead of
+    bursting, caps in-flight requests with a semaphore, and sends the
+    previous ETag/Last-Modified so unchanged clans come back as 304s.
+    Fresh snapshots are written to ``clan_snapshots`` and pushed into the
+    clan catalog used by the join-clan matcher.
+    """
+
+    def __init__(self, bot, interval: float = 1800, max_concurrency: int = 4):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self.interval = interval
+        self.api = ClashKingAPI(os.getenv('CLASH_KING_API_KEY'), timeout=15)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the periodic sync"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="clan-roster-sync")
+
+    async def stop(self):
+        """Stop the periodic sync and close the HTTP session"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.api.close()
+
+    async def _run(self):
+        while True:
+            started = time.monotonic()
+            try:
+                await self.sync_all()
+            except Exception as e:
+                log.error("Error syncing clan rosters: %s", e)
+            # A cycle already paces itself over the interval, only wait out the rest
+            await asyncio.sleep(max(0, self.interval - (time.monotonic() - started)))
+
+    async def sync_all(self) -> Dict[str, int]:
+        """Sync every registered clan once, paced across the interval"""
+        started = time.perf_counter()
+        clans = [clan for clan in await self.mongo.get_clans_for_sync() if clan_tag(clan)]
+        snapshots = {snapshot['clan_id']: snapshot for snapshot in await self.mongo.get_clan_snapshots()}
+        stats = {'clans': len(clans), 'updated': 0, 'unchanged': 0, 'failed': 0}
+        if not clans:
+            return stats
+
+        # Leave a tenth of the interval as slack for the last requests
+        spacing = self.interval * 0.9 / len(clans)
+        tasks = []
+        for i, clan in enumerate(clans):
+            if i:
+                await asyncio.sleep(spacing)
+            tasks.append(asyncio.create_task(
+                self._sync_clan(clan, snapshots.get(str(clan['_id'])), stats)
+            ))
+        await asyncio.gather(*tasks)
+
+        log.info(
+            "Clan roster sync: %s updated, %s unchanged, %s failed of %s in %.0fs",
+            stats['updated'], stats['unchanged'], stats['failed'], stats['clans'], time.perf_counter() - started
+        )
+        return stats
+
+    async def _sync_clan(self, clan: Dict[str, Any], previous: Optional[Dict[str, Any]], stats: Dict[str, int]):
+        clan_id = str(clan['_id'])
+        tag = clan_tag(clan)
+        previous = previous or {}
+
+        async with self._semaphore:
+            result = await self.api.get_clan(tag, previous.get('etag'), previous.get('last_modified'))
+        if result is None:
+            stats['failed'] += 1
+            return
+        if result['status'] == 304:
+            await self.mongo.touch_clan_snapshot(clan_id)
+            stats['unchanged'] += 1
+            return
+        if result['status'] != 200:
+            log.error("Clan sync error for %s: %s", tag, result['status'])
+            stats['failed'] += 1
+            return
+
+        snapshot = self.build_snapshot(clan, tag, result['data'], result['etag'], result['last_modified'])
+        if await self.mongo.save_clan_snapshot(snapshot):
+            self.bot.clan_catalog.apply_snapshot(snapshot)
+            stats['updated'] += 1
+        else:
+            stats['failed'] += 1
+
+    @staticmethod
+    def build_snapshot(
+        clan: Dict[str, Any],
+        tag: str,
+        data: Dict[str, Any],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Keep only the fields staff and the matcher use"""
+        now = datetime.utcnow()
+        return {
+            'clan_id': str(clan['_id']),
+            'guild_id': clan.get('guild_id'),
+            'tag': tag,
+            'name': data.get('name'),
+            'clan_level': data.get('clanLevel'),
+            'member_count': data.get('members'),
+            'required_townhall': data.get('requiredTownhallLevel'),
+            'war_frequency': data.get('warFrequency'),
+            'war_win_streak': data.get('warWinStreak'),
+            'war_wins': data.get('warWins'),
+            'war_league': (data.get('warLeague') or {}).get('name'),
+            'is_war_log_public': data.get('isWarLogPublic'),
+            'location': (data.get('location') or {}).get('name'),
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': now,
+            'checked_at': now
+        }
@@ -1,13 +1,20 @@
+import logging
+import time
 import aiohttp
 import asyncio
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
+from urllib.parse import quote
 import discord
 from datetime import datetime
+from .metrics import record_clash_king
+
+log = logging.getLogger(__name__)
 
 class ClashKingAPI:
-    def __init__(self, api_key: str, base_url: str = "https://api.clashk.ing"):
+    def __init__(self, api_key: Optional[str], base_url: str = "https://api.clashk.ing", timeout: float = 300):
         self.api_key = api_key
         self.base_url = base_url
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
         self.session = None
         self._cache = {}
         self._cache_time = 300  # 5 minutes cache
@@ -15,9 +22,8 @@ class ClashKingAPI:
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession(
-                headers={"Authorization": f"Bearer {self.api_key}"}
-            )
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self.session = aiohttp.ClientSession(headers=headers, timeout=self.timeout)
         return self.session
 
     async def close(self):
@@ -67,11 +73,11 @@ class ClashKingAPI:
                 elif response.status == 404:
                     return None
                 else:
-                    print(f"API Error: {response.status} - {await response.text()}")
+                    log.error("API Error: %s - %s", response.status, await response.text())
                     return None
                     
         except Exception as e:
-            print(f"Error making API request: {str(e)}")
+            log.error("Error making API request: %s", e)
             return None
 
     async def get_player(self, player_tag: str) -> Optional[Dict]:
@@ -90,10 +96,45 @@ class ClashKingAPI:
                     data = await response.text()
                     return {"tag": tag, "stats_data": data}
                 else:
-                    print(f"Error fetching player data: {response.status}")
+                    log.error("Error fetching player data: %s", response.status)
                     return None
         except Exception as e:
-            print(f"Error in get_player: {str(e)}")
+            log.error("Error in get_player: %s", e)
+            return None
+
+    async def get_clan(
+        self,
+        clan_tag: str,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Get a clan by tag, an unchanged clan comes back with status 304 and no data.
+
+        Returns the status, data and the response's ETag/Last-Modified, or
+        None if the request failed.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+
+        started = time.perf_counter()
+        try:
+            session = await self._get_session()
+            url = f"{self.base_url}/v1/clans/{quote(clan_tag)}"
+            async with session.get(url, headers=headers) as response:
+                data = await response.json() if response.status == 200 else None
+                record_clash_king('clan', response.status, time.perf_counter() - started)
+                return {
+                    'status': response.status,
+                    'data': data,
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified')
+                }
+        except Exception as e:
+            record_clash_king('clan', 'error', time.perf_counter() - started)
+            log.error("Error fetching clan %s: %s", clan_tag, e)
             return None
 
     def create_player_embed(self, player_data: Dict) -> discord.Embed:
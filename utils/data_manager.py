@@ -1,15 +1,22 @@
+import logging
 import aiohttp
 import asyncio
 from typing import Dict, List, Optional
+import time
 from datetime import datetime
+from .metrics import record_clash_king
+
+log = logging.getLogger(__name__)
 
 class DataManager:
-    def __init__(self, mongo_manager):
+    def __init__(self, mongo_manager, clan_catalog=None):
         self.mongo = mongo_manager
+        self.clan_catalog = clan_catalog
         self.clash_king_base = "https://api.clashk.ing"
 
     async def get_player_stats(self, player_tag: str) -> Dict:
         """Get player stats from Clash King API"""
+        started = time.perf_counter()
         try:
             # Remove # if present
             if player_tag.startswith('#'):
@@ -19,13 +26,15 @@ class DataManager:
 
             async with aiohttp.ClientSession() as session:
                 async with session.get(url) as response:
+                    record_clash_king('player_stats', response.status, time.perf_counter() - started)
                     if response.status == 200:
                         data = await response.json()
                         return data
                     else:
                         return None
         except Exception as e:
-            print(f"Error fetching player stats: {e}")
+            record_clash_king('player_stats', 'error', time.perf_counter() - started)
+            log.error("Error fetching player stats: %s", e)
             return None
 
     def format_player_stats(self, stats: Dict, player_tag: str) -> str:
@@ -51,22 +60,14 @@ class DataManager:
 
             return formatted.strip()
         except Exception as e:
-            print(f"Error formatting player stats: {e}")
+            log.error("Error formatting player stats: %s", e)
             return f"❌ Error formatting stats for {player_tag}"
 
-    def get_eligible_clans(self, town_hall_level: int, clan_type: str) -> List[Dict]:
+    async def get_eligible_clans(self, guild_id: int, town_hall_level: int, clan_type: str) -> List[Dict]:
         """Get clans that are eligible for the player based on TH level and type"""
-        all_clans = self.mongo.get_all_clans()
-        eligible_clans = []
-
-        for clan in all_clans:
-            clan_th_requirement = clan.get('min_town_hall', 1)
-            clan_clan_type = clan.get('clan_type', 'regular')
-
-            if town_hall_level >= clan_th_requirement and clan_clan_type.lower() == clan_type.lower():
-                eligible_clans.append(clan)
-
-        return eligible_clans
+        if self.clan_catalog:
+            return await self.clan_catalog.eligible(guild_id, clan_type, town_hall_level)
+        return await self.mongo.get_clans_by_type_and_th(clan_type, town_hall_level, guild_id)
 
     def create_clan_dropdown_options(self, eligible_clans: List[Dict]) -> List[Dict]:
         """Create dropdown options for clan selection"""
@@ -97,6 +98,7 @@ class DataManager:
             'disable_counting',
             'add_to_ticket',
             'reject_player',
+            'close_ticket',
             'help'
         ]
 
@@ -205,7 +207,7 @@ WELCOME TO {clan_data.get('clan_name', 'Unknown Clan')} LED BY {clan_data.get('l
             )
             return thread
         except Exception as e:
-            print(f"Error creating private thread: {e}")
+            log.error("Error creating private thread: %s", e)
             return None
 
     def get_milestone_message(self, count: int) -> Optional[str]:
@@ -0,0 +1,211 @@
+import functools
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterable, Optional
+import discord
+from discord.webhook.async_ import AsyncWebhookAdapter
+from pymongo import monitoring
+from .metrics import add_ratelimit_listener, metrics
+from .structured_logging import log_context
+
+log = logging.getLogger(__name__)
+
+# Buckets for the number of REST calls or MongoDB commands one flow makes
+CALL_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 20, 30, 50, 100)
+
+# Routes listed in a flow's summary, busiest first
+SUMMARY_ROUTES = 5
+
+FLOW_RUNS = metrics.counter('flow_runs_total', 'Completed user-facing flows', ('flow',))
+FLOW_REST_CALLS = metrics.histogram('flow_rest_calls', 'Discord REST calls per flow', ('flow',), CALL_BUCKETS)
+FLOW_REST_BYTES = metrics.counter('flow_rest_bytes_total', 'Discord REST request bytes sent by flows', ('flow',))
+FLOW_RATELIMIT_WAITS = metrics.counter(
+    'flow_ratelimit_waits_total', 'Discord REST rate-limit waits hit by flows', ('flow',)
+)
+FLOW_MONGO_QUERIES = metrics.histogram('flow_mongo_queries', 'MongoDB commands per flow', ('flow',), CALL_BUCKETS)
+FLOW_SECONDS = metrics.histogram('flow_seconds', 'Duration of user-facing flows', ('flow',))
+
+_current_flow: ContextVar[Optional['FlowBudget']] = ContextVar('current_flow', default=None)
+_flow_ids = itertools.count(1)
+
+# Commands start on Motor's executor threads, two of one flow can run at once
+_mongo_lock = threading.Lock()
+_listener_registered = False
+
+class FlowBudget:
+    """Discord REST calls and MongoDB commands spent by one run of a flow"""
+
+    __slots__ = (
+        'name', 'flow_id', 'started', 'rest_calls', 'rest_bytes',
+        'rate_limit_waits', 'waited', 'mongo_queries', 'routes'
+    )
+
+    def __init__(self, name: str):
+        self.name = name
+        self.flow_id = f"{name}-{next(_flow_ids)}"
+        self.started = time.perf_counter()
+        self.rest_calls = 0
+        self.rest_bytes = 0
+        self.rate_limit_waits = 0
+        self.waited = 0.0
+        self.mongo_queries = 0
+        self.routes: Counter = Counter()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'flow': self.name,
+            'flow_id': self.flow_id,
+            'rest_calls': self.rest_calls,
+            'rest_bytes': self.rest_bytes,
+            'rate_limit_waits': self.rate_limit_waits,
+            'waited': self.waited,
+            'mongo_queries': self.mongo_queries,
+            'seconds': time.perf_counter() - self.started,
+            'routes': dict(self.routes.most_common(SUMMARY_ROUTES))
+        }
+
+def current_flow() -> Optional[FlowBudget]:
+    """Get the flow the current task is charged to"""
+    return _current_flow.get()
+
+@contextmanager
+def flow(name: str):
+    """Charge the wrapped block to a flow and log its summary when it ends.
+
+    A block inside a running flow stays part of that flow. Tasks created in
+    the block inherit the flow, but calls they make after it has ended are
+    not reported.
+    """
+    budget = _current_flow.get()
+    if budget is not None:
+        yield budget
+        return
+
+    budget = FlowBudget(name)
+    token = _current_flow.set(budget)
+    try:
+        with log_context(flow=budget.flow_id):
+            try:
+                yield budget
+            finally:
+                _report(budget)
+    finally:
+        _current_flow.reset(token)
+
+def tracked_flow(name: str) -> Callable:
+    """Decorator running a coroutine, such as a view callback, as a flow"""
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            with flow(name):
+                return await func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def _report(budget: FlowBudget):
+    summary = budget.summary()
+    FLOW_RUNS.labels(budget.name).inc()
+    FLOW_REST_CALLS.labels(budget.name).observe(budget.rest_calls)
+    FLOW_REST_BYTES.labels(budget.name).inc(budget.rest_bytes)
+    FLOW_RATELIMIT_WAITS.labels(budget.name).inc(budget.rate_limit_waits)
+    FLOW_MONGO_QUERIES.labels(budget.name).observe(budget.mongo_queries)
+    FLOW_SECONDS.labels(budget.name).observe(summary['seconds'])
+    log.info(
+        "Flow %s: %s REST calls, %s bytes, %s rate-limit waits (%.2fs), %s Mongo commands in %.2fs %s",
+        budget.name, budget.rest_calls, budget.rest_bytes, budget.rate_limit_waits, budget.waited,
+        budget.mongo_queries, summary['seconds'], summary['routes']
+    )
+
+def record_rest_call(route: str, size: int = 0):
+    """Charge a Discord REST request to the current flow"""
+    budget = _current_flow.get()
+    if budget is not None:
+        budget.rest_calls += 1
+        budget.rest_bytes += size
+        budget.routes[route] += 1
+
+def record_rate_limit_wait(kind: str, seconds: float):
+    """Charge a wait on a Discord rate limit to the current flow"""
+    budget = _current_flow.get()
+    if budget is not None:
+        budget.rate_limit_waits += 1
+        budget.waited += seconds
+
+def record_mongo_query():
+    """Charge a MongoDB command to the current flow"""
+    budget = _current_flow.get()
+    if budget is not None:
+        with _mongo_lock:
+            budget.mongo_queries += 1
+
+class FlowCommandListener(monitoring.CommandListener):
+    """Charges every MongoDB command to the flow that sent it.
+
+    Motor runs pymongo on executor threads in a copy of the caller's
+    context, so the flow is still the current one when a command starts.
+    Counting at the driver covers every query, whether or not MongoManager
+    is wrapped in ``InstrumentedMongoManager``.
+    """
+
+    def started(self, event):
+        record_mongo_query()
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+def request_size(payload: Any = None, form: Optional[Iterable[Dict[str, Any]]] = None) -> int:
+    """Approximate bytes of a REST request's JSON body and multipart text fields"""
+    size = 0
+    if payload is not None:
+        size += len(json.dumps(payload, separators=(',', ':'), ensure_ascii=False, default=str).encode())
+    for field in form or ():
+        value = field.get('value')
+        if isinstance(value, str):
+            size += len(value.encode())
+        elif isinstance(value, (bytes, bytearray)):
+            size += len(value)
+    return size
+
+def _count_requests(request: Callable, payload_key: str, form_key: str) -> Callable:
+    @functools.wraps(request)
+    async def counted(self, route, *args, **kwargs):
+        if _current_flow.get() is not None:
+            record_rest_call(
+                f"{route.method} {route.path}",
+                request_size(kwargs.get(payload_key), kwargs.get(form_key))
+            )
+        return await request(self, route, *args, **kwargs)
+
+    counted._flow_budget = True
+    return counted
+
+def install_flow_budget():
+    """Charge discord.py's REST requests, rate-limit waits and MongoDB commands to the current flow.
+
+    Bot requests go through ``HTTPClient.request``, interaction responses
+    and followups through the webhook adapter, so both are wrapped. Waits
+    come from the timed rate limiter that ``install_discord_ratelimit_metrics``
+    sets up, which runs in the waiting request's task. pymongo only hands
+    listeners to clients created afterwards, so call this before connecting.
+    """
+    for cls, payload_key, form_key in (
+        (discord.http.HTTPClient, 'json', 'form'),
+        (AsyncWebhookAdapter, 'payload', 'multipart')
+    ):
+        if not getattr(cls.request, '_flow_budget', False):
+            cls.request = _count_requests(cls.request, payload_key, form_key)
+    add_ratelimit_listener(record_rate_limit_wait)
+
+    global _listener_registered
+    if not _listener_registered:
+        monitoring.register(FlowCommandListener())
+        _listener_registered = True
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import math
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from datetime import datetime
+from typing import Deque, Dict, Optional, Set
+import discord
+from .metrics import FAST_BUCKETS, metrics
+
+log = logging.getLogger(__name__)
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    'event_loop_lag_seconds', 'How late the event loop ran a scheduled wakeup',
+    buckets=FAST_BUCKETS + (0.25, 0.5, 1.0, 2.5, 5.0)
+)
+LOOP_STALLS = metrics.counter('event_loop_stalls_total', 'Event loop stalls over the lag threshold')
+GATEWAY_LATENCY = metrics.gauge('gateway_latency_seconds', 'Discord gateway heartbeat latency')
+
+class LoopLagMonitor:
+    """Measures event-loop lag and captures the stack of whatever blocks the loop.
+
+    A task sleeps for ``interval`` and records how late it wakes up. A
+    sampler thread watches the task's last tick; once the loop has been
+    stuck for ``threshold`` it grabs the loop thread's current stack from
+    ``sys._current_frames``, while the offending code is still running.
+    Stalls are logged with the gateway heartbeat latency and summarised in
+    an owner channel at most once per ``alert_cooldown``.
+    """
+
+    def __init__(
+        self,
+        bot,
+        interval: float = 0.5,
+        threshold: float = 0.25,
+        alert_channel_id: Optional[int] = None,
+        alert_cooldown: float = 300
+    ):
+        self.bot = bot
+        self.interval = interval
+        self.threshold = threshold
+        self.alert_channel_id = alert_channel_id
+        self.alert_cooldown = alert_cooldown
+        self.stalls: Deque[Dict] = deque(maxlen=20)
+        self._task: Optional[asyncio.Task] = None
+        self._alerts: Set[asyncio.Task] = set()  # Alert tasks still sending, kept so they are not collected
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._loop_thread_id: Optional[int] = None
+        self._last_tick = time.monotonic()
+        self._captured_tick: Optional[float] = None
+        self._captured_stack: Optional[str] = None
+        self._last_alert = 0.0
+        self._unreported = 0
+
+    def start(self):
+        """Start measuring, must be called from the event loop thread"""
+        if self._task is None or self._task.done():
+            self._loop_thread_id = threading.get_ident()
+            self._last_tick = time.monotonic()
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+        if self._thread is None:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._sample, name="loop-lag-sampler", daemon=True)
+            self._thread.start()
+
+    async def stop(self):
+        """Stop measuring"""
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            tick, self._last_tick = self._last_tick, time.monotonic()
+            LOOP_LAG_SECONDS.observe(lag)
+
+            latency = self.bot.latency
+            if not math.isinf(latency) and not math.isnan(latency):
+                GATEWAY_LATENCY.set(latency)
+
+            if lag >= self.threshold:
+                # Only keep the stack captured during this stall
+                stack = self._captured_stack if self._captured_tick == tick else None
+                self._record_stall(lag, latency, stack)
+
+    def _sample(self):
+        """Sampler thread: capture the loop thread's stack while it is stuck"""
+        period = self.threshold / 2
+        while not self._stopped.wait(period):
+            tick = self._last_tick
+            if self._captured_tick == tick or time.monotonic() - tick < self.interval + self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._captured_stack = "".join(traceback.format_stack(frame, limit=25))
+            self._captured_tick = tick
+
+    def _record_stall(self, lag: float, latency: float, stack: Optional[str]):
+        LOOP_STALLS.inc()
+        stall = {
+            'lag': lag,
+            'gateway_latency': None if math.isinf(latency) else latency,
+            'stack': stack,
+            'at': datetime.utcnow()
+        }
+        self.stalls.append(stall)
+        log.warning(
+            "Event loop stalled for %.3fs (gateway latency %s)%s",
+            lag,
+            f"{latency * 1000:.0f}ms" if stall['gateway_latency'] is not None else "unknown",
+            f"\n{stack}" if stack else ""
+        )
+
+        self._unreported += 1
+        now = time.monotonic()
+        if self.alert_channel_id and now - self._last_alert >= self.alert_cooldown:
+            self._last_alert = now
+            stalls, self._unreported = self._unreported, 0
+            task = asyncio.create_task(self._alert(stall, stalls))
+            self._alerts.add(task)
+            task.add_done_callback(self._alerts.discard)
+
+    async def _alert(self, stall: Dict, stalls: int):
+        """Summarise the latest stall in the owner channel"""
+        channel = self.bot.get_channel(self.alert_channel_id)
+        if channel is None:
+            return
+        embed = discord.Embed(
+            title="🐢 Event Loop Stall",
+            description=f"The event loop was blocked for **{stall['lag'] * 1000:.0f} ms**.",
+            color=0xe67e22,
+            timestamp=discord.utils.utcnow()
+        )
+        embed.add_field(
+            name="💓 Gateway Latency",
+            value=f"{stall['gateway_latency'] * 1000:.0f} ms" if stall['gateway_latency'] is not None else "Unknown",
+            inline=True
+        )
+        embed.add_field(name="📊 Stalls Since Last Alert", value=str(stalls), inline=True)
+        if stall['stack']:
+            # The innermost frames are the ones doing the blocking
+            embed.add_field(name="🧵 Blocking Stack", value=f"```\n{stall['stack'][-1000:]}\n```", inline=False)
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            log.error("Error sending loop stall alert: %s", e)
@@ -0,0 +1,280 @@
+import functools
+import logging
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Latency buckets in seconds, tuned for Discord REST and Mongo round trips
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Finer buckets for in-process work such as handling a counting message
+FAST_BUCKETS = (0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.1)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Counter:
+    """Monotonic counter"""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def inc(self, amount: float = 1):
+        """Add to the counter"""
+        self.value += amount
+
+class Gauge:
+    """Value that can go up and down"""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float):
+        """Set the current value"""
+        self.value = value
+
+class Histogram:
+    """Latency histogram with fixed buckets"""
+
+    __slots__ = ('name', 'buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, name: str, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.name = name
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float):
+        """Record a single sample"""
+        # bisect_left finds the first bound >= value, i.e. Prometheus' "le"
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile from the bucket counts"""
+        if not self.count:
+            return None
+        target = q * self.count
+        seen = 0
+        for i, bound in enumerate(self.buckets):
+            seen += self.counts[i]
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def snapshot(self) -> Dict:
+        """Get a summary of the histogram"""
+        return {
+            'count': self.count,
+            'sum': self.sum,
+            'avg': self.sum / self.count if self.count else None,
+            'p50': self.quantile(0.5),
+            'p99': self.quantile(0.99)
+        }
+
+class MetricFamily:
+    """A named metric and its children, one per set of label values.
+
+    Hot paths should resolve ``labels(...)`` once and keep the child, so
+    recording a sample is a single method call. A family without labels
+    exposes its only child's ``inc``/``set``/``observe`` directly.
+    """
+
+    def __init__(self, kind: str, name: str, help_text: str, labelnames: Tuple[str, ...], factory: Callable):
+        self.kind = kind
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self._factory = factory
+        self.children: Dict[Tuple[str, ...], object] = {}
+        if not self.labelnames:
+            child = self.labels()
+            for method in ('inc', 'set', 'observe', 'quantile', 'snapshot'):
+                if hasattr(child, method):
+                    setattr(self, method, getattr(child, method))
+
+    def labels(self, *values) -> object:
+        """Get or create the child for a set of label values"""
+        key = tuple(str(value) for value in values)
+        child = self.children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            child = self.children[key] = self._factory()
+        return child
+
+class MetricsRegistry:
+    """In-process registry of bot metrics"""
+
+    def __init__(self):
+        self._families: Dict[str, MetricFamily] = {}
+
+    def _family(self, kind: str, name: str, help_text: str, labelnames: Tuple[str, ...], factory: Callable) -> MetricFamily:
+        family = self._families.get(name)
+        if family is None:
+            family = self._families[name] = MetricFamily(kind, name, help_text, labelnames, factory)
+        elif family.kind != kind:
+            raise ValueError(f"Metric {name} is already registered as a {family.kind}")
+        return family
+
+    def counter(self, name: str, help_text: str = "", labelnames: Tuple[str, ...] = ()) -> MetricFamily:
+        """Get or create a counter by name"""
+        return self._family('counter', name, help_text, labelnames, Counter)
+
+    def gauge(self, name: str, help_text: str = "", labelnames: Tuple[str, ...] = ()) -> MetricFamily:
+        """Get or create a gauge by name"""
+        return self._family('gauge', name, help_text, labelnames, Gauge)
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str = "",
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> MetricFamily:
+        """Get or create a histogram by name"""
+        return self._family('histogram', name, help_text, labelnames, lambda: Histogram(name, buckets))
+
+    def observe(self, name: str, value: float):
+        """Record a sample on the named histogram"""
+        self.histogram(name).observe(value)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the wrapped block and record it in seconds"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """Get summaries for every registered histogram"""
+        return {
+            _series_name(family, key): child.snapshot()
+            for family in self._families.values() if family.kind == 'histogram'
+            for key, child in family.children.items()
+        }
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for family in self._families.values():
+            if family.help:
+                lines.append(f"# HELP {family.name} {family.help}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for key, child in family.children.items():
+                labels = list(zip(family.labelnames, key))
+                if family.kind == 'histogram':
+                    cumulative = 0
+                    for bound, count in zip(child.buckets, child.counts):
+                        cumulative += count
+                        lines.append(f"{family.name}_bucket{_labels(labels + [('le', repr(bound))])} {cumulative}")
+                    lines.append(f"{family.name}_bucket{_labels(labels + [('le', '+Inf')])} {child.count}")
+                    lines.append(f"{family.name}_sum{_labels(labels)} {child.sum}")
+                    lines.append(f"{family.name}_count{_labels(labels)} {child.count}")
+                else:
+                    lines.append(f"{family.name}{_labels(labels)} {child.value}")
+        return "\n".join(lines) + "\n"
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _labels(labels: List[Tuple[str, str]]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+def _series_name(family: MetricFamily, key: Tuple[str, ...]) -> str:
+    return family.name + _labels(list(zip(family.labelnames, key)))
+
+# Shorter waits are a non-blocking acquire, not a rate limit
+RATELIMIT_MIN_WAIT = 0.001
+
+_ratelimit_listeners: List[Callable[[str, float], None]] = []
+
+def add_ratelimit_listener(callback: Callable[[str, float], None]):
+    """Call back with the kind and seconds of every Discord rate-limit wait"""
+    if callback not in _ratelimit_listeners:
+        _ratelimit_listeners.append(callback)
+
+def _timed_ratelimit_wait(method: Callable, kind: str, waits: 'MetricFamily', seconds: 'MetricFamily') -> Callable:
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            waited = time.perf_counter() - started
+            if waited >= RATELIMIT_MIN_WAIT:
+                waits.labels(kind).inc()
+                seconds.labels(kind).observe(waited)
+                for callback in _ratelimit_listeners:
+                    try:
+                        callback(kind, waited)
+                    except Exception as e:
+                        log.error("Error in rate-limit listener: %s", e)
+
+    wrapper._ratelimit_metrics = True
+    return wrapper
+
+def install_discord_ratelimit_metrics(registry: Optional['MetricsRegistry'] = None):
+    """Time the waits discord.py makes on exhausted rate-limit buckets.
+
+    Requests queue in ``Ratelimit.acquire`` while their bucket is exhausted,
+    and the request that drained it sleeps in ``Ratelimit._refresh`` until
+    the bucket resets. Both run in the waiting request's task. Retries after
+    a 429 sleep inside discord.py's request loop and are not timed.
+    """
+    from discord.http import Ratelimit
+
+    registry = registry or metrics
+    waits = registry.counter(
+        'discord_ratelimit_waits_total', 'Discord REST rate-limit waits', ('kind',)
+    )
+    seconds = registry.histogram(
+        'discord_ratelimit_wait_seconds', 'Time spent waiting on Discord REST rate limits', ('kind',)
+    )
+    for name, kind in (('acquire', 'queued'), ('_refresh', 'bucket')):
+        method = getattr(Ratelimit, name, None)
+        if method is not None and not getattr(method, '_ratelimit_metrics', False):
+            setattr(Ratelimit, name, _timed_ratelimit_wait(method, kind, waits, seconds))
+
+# Shared registry used across cogs and utils
+metrics = MetricsRegistry()
+
+# Clash King requests from every caller share these series
+_clash_king_seconds = metrics.histogram(
+    'clash_king_request_seconds', 'Latency of Clash King API requests', ('endpoint',)
+)
+_clash_king_responses = metrics.counter(
+    'clash_king_responses_total', 'Clash King API responses by status code', ('endpoint', 'status')
+)
+
+def record_clash_king(endpoint: str, status, seconds: float):
+    """Record one Clash King request, status is the HTTP code or 'error'"""
+    _clash_king_seconds.labels(endpoint).observe(seconds)
+    _clash_king_responses.labels(endpoint, status).inc()
+
+def timed(histogram) -> Callable:
+    """Decorator recording a coroutine's duration on a histogram child"""
+    observe = histogram.observe
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - started)
+        return wrapper
+    return decorator
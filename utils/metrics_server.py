@@ -0,0 +1,42 @@
+import logging
+from typing import Optional
+from aiohttp import web
+from .metrics import PROMETHEUS_CONTENT_TYPE, MetricsRegistry, metrics
+
+log = logging.getLogger(__name__)
+
+class MetricsServer:
+    """Serves the metrics registry on a local ``/metrics`` endpoint for Prometheus"""
+
+    def __init__(self, registry: MetricsRegistry = metrics, host: str = "127.0.0.1", port: int = 9108):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._runner: Optional[web.AppRunner] = None
+
+    async def start(self):
+        """Start listening"""
+        if self._runner:
+            return
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle_metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        try:
+            await web.TCPSite(self._runner, self.host, self.port).start()
+        except OSError:
+            await self.stop()
+            raise
+        log.info("📈 Metrics available on http://%s:%s/metrics", self.host, self.port)
+
+    async def stop(self):
+        """Stop listening"""
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_metrics(self, request: web.Request) -> web.Response:
+        return web.Response(
+            body=self.registry.render().encode('utf-8'),
+            headers={'Content-Type': PROMETHEUS_CONTENT_TYPE}
+        )
@@ -0,0 +1,240 @@
+import functools
+import inspect
+import logging
+import os
+import time
+from collections import deque
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional
+from pymongo import monitoring
+from .metrics import MetricsRegistry, metrics
+
+# Buckets for the number of documents a call returns
+DOCUMENT_BUCKETS = (0, 1, 5, 10, 25, 50, 100, 500, 1000, 5000)
+
+# Calls and server commands slower than this are kept as samples
+DEFAULT_SLOW_MS = 100
+SLOW_SAMPLES = 50
+
+def query_shape(value: Any, depth: int = 0) -> Any:
+    """Replace the values of a query with their type names, keeping keys and operators"""
+    if depth > 4:
+        return '...'
+    if isinstance(value, dict):
+        return {key: query_shape(item, depth + 1) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # Operator lists such as $or/$and keep one shape per branch
+        if value and all(isinstance(item, dict) for item in value):
+            return [query_shape(item, depth + 1) for item in value[:5]]
+        return type(value).__name__
+    return type(value).__name__
+
+def command_filter(command: Dict[str, Any]) -> Any:
+    """Get the filter or pipeline of a server command, update and delete keep theirs per statement"""
+    for key in ('updates', 'deletes'):
+        statements = command.get(key)
+        if isinstance(statements, list) and statements:
+            return statements[0].get('q') or {}
+    return command.get('filter') or command.get('query') or command.get('q') or command.get('pipeline') or {}
+
+class CallOutcome:
+    """Whether the MongoManager call running in this task failed"""
+
+    __slots__ = ('failed',)
+
+    def __init__(self):
+        self.failed = False
+
+_current_call: ContextVar[Optional[CallOutcome]] = ContextVar('mongo_call', default=None)
+
+def _mark_failed():
+    outcome = _current_call.get()
+    if outcome is not None:
+        outcome.failed = True
+
+class ManagerErrorHandler(logging.Handler):
+    """Marks the running MongoManager call failed when it logs an error.
+
+    MongoManager methods catch their own exceptions, log them and return a
+    fallback such as None or False, so the error log is the only sign that
+    a call failed.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+
+    def emit(self, record: logging.LogRecord):
+        _mark_failed()
+
+def _documents_in(result: Any) -> Optional[int]:
+    if isinstance(result, list):
+        return len(result)
+    if isinstance(result, dict):
+        return 1
+    if result is None:
+        return 0
+    return None
+
+class MethodStats:
+    """Aggregated timings for one MongoManager method"""
+
+    __slots__ = ('calls', 'errors', 'total', 'max', 'documents', 'latency')
+
+    def __init__(self, latency):
+        self.calls = 0
+        self.errors = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.documents = 0
+        self.latency = latency
+
+    def record(self, elapsed: float, failed: bool):
+        self.calls += 1
+        self.errors += failed
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+        self.latency.observe(elapsed)
+
+class SlowCommandListener(monitoring.CommandListener):
+    """Keeps samples of slow server commands with their query shape.
+
+    pymongo calls these hooks from Motor's executor threads, so the
+    listener only touches a dict keyed by request ID and a bounded deque.
+    Motor runs them in a copy of the caller's context, so a failed command
+    also marks the MongoManager call that sent it as failed.
+    """
+
+    def __init__(self, slow_seconds: float, samples: Deque[Dict]):
+        self.slow_seconds = slow_seconds
+        self.samples = samples
+        self._started: Dict[int, Dict] = {}
+
+    def started(self, event):
+        command = event.command
+        collection = command.get(event.command_name)
+        self._started[event.request_id] = {
+            'command': event.command_name,
+            'collection': collection if isinstance(collection, str) else None,
+            'shape': query_shape(command_filter(command))
+        }
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        _mark_failed()
+        self._finish(event)
+
+    def _finish(self, event):
+        started = self._started.pop(event.request_id, None)
+        elapsed = event.duration_micros / 1e6
+        if started and elapsed >= self.slow_seconds:
+            self.samples.append({**started, 'seconds': elapsed, 'at': datetime.utcnow()})
+
+class InstrumentedMongoManager:
+    """Proxy around ``MongoManager`` that instruments every public coroutine method.
+
+    Attribute access is forwarded to the wrapped manager, so call sites use
+    it unchanged. Per method it records call and error counts, latency and
+    the number of documents returned, and keeps samples of slow calls with
+    the shape of their arguments. A call counts as an error if it raises,
+    logs an error or sends a server command that fails. A pymongo command
+    listener adds samples of slow server commands with the shape of their
+    filter or pipeline.
+    """
+
+    def __init__(self, mongo_manager, registry: MetricsRegistry = metrics, slow_ms: Optional[float] = None):
+        self._mongo = mongo_manager
+        self._registry = registry
+        self._latency = registry.histogram(
+            'mongo_call_seconds', 'Latency of MongoManager calls', ('method',)
+        )
+        self._calls = registry.counter(
+            'mongo_calls_total', 'MongoManager calls by outcome', ('method', 'outcome')
+        )
+        self._documents = registry.histogram(
+            'mongo_documents_returned', 'Documents returned by MongoManager calls', ('method',), DOCUMENT_BUCKETS
+        )
+        self.slow_seconds = (slow_ms if slow_ms is not None else float(os.getenv('MONGO_SLOW_MS', DEFAULT_SLOW_MS))) / 1000
+        self.slow_calls: Deque[Dict] = deque(maxlen=SLOW_SAMPLES)
+        self.slow_commands: Deque[Dict] = deque(maxlen=SLOW_SAMPLES)
+        self.stats: Dict[str, MethodStats] = {}
+        self._wrapped: Dict[str, Callable] = {}
+
+        # Registered globally so it covers the client MongoManager creates in initialize()
+        monitoring.register(SlowCommandListener(self.slow_seconds, self.slow_commands))
+        logger = logging.getLogger(type(mongo_manager).__module__)
+        if not any(isinstance(handler, ManagerErrorHandler) for handler in logger.handlers):
+            logger.addHandler(ManagerErrorHandler())
+
+    def __getattr__(self, name: str) -> Any:
+        wrapped = self._wrapped.get(name)
+        if wrapped is not None:
+            return wrapped
+        attr = getattr(self._mongo, name)
+        if name.startswith('_') or not inspect.iscoroutinefunction(attr):
+            return attr
+        wrapped = self._wrapped[name] = self._wrap(name, attr)
+        return wrapped
+
+    def _wrap(self, name: str, method: Callable) -> Callable:
+        stats = self.stats[name] = MethodStats(self._latency.labels(name))
+        ok = self._calls.labels(name, 'ok').inc
+        error = self._calls.labels(name, 'error').inc
+        documents = self._documents.labels(name).observe
+        slow_seconds = self.slow_seconds
+        slow_calls = self.slow_calls
+
+        @functools.wraps(method)
+        async def instrumented(*args, **kwargs):
+            outcome = CallOutcome()
+            token = _current_call.set(outcome)
+            started = time.perf_counter()
+            failed = True
+            try:
+                result = await method(*args, **kwargs)
+                failed = outcome.failed
+                return result
+            finally:
+                _current_call.reset(token)
+                elapsed = time.perf_counter() - started
+                stats.record(elapsed, failed)
+                if failed:
+                    error()
+                else:
+                    ok()
+                    count = _documents_in(result)
+                    if count is not None:
+                        stats.documents += count
+                        documents(count)
+                if elapsed >= slow_seconds:
+                    slow_calls.append({
+                        'method': name,
+                        'seconds': elapsed,
+                        'args': [query_shape(arg) for arg in args],
+                        'kwargs': query_shape(kwargs),
+                        'at': datetime.utcnow()
+                    })
+
+        return instrumented
+
+    def top_methods(self, limit: int = 10, sort_by: str = 'p99') -> List[Dict]:
+        """Get the slowest methods by p99, average, max or total time"""
+        rows = []
+        for name, stats in self.stats.items():
+            if not stats.calls:
+                continue
+            rows.append({
+                'method': name,
+                'calls': stats.calls,
+                'errors': stats.errors,
+                'avg': stats.total / stats.calls,
+                'p99': stats.latency.quantile(0.99),
+                'max': stats.max,
+                'total': stats.total,
+                'documents': stats.documents / stats.calls
+            })
+        rows.sort(key=lambda row: row[sort_by], reverse=True)
+        return rows[:limit]
@@ -1,10 +1,29 @@
+import logging
 from motor import motor_asyncio
 import os
 import asyncio
-from typing import Dict, List, Any, Optional, Union
+import time
+from typing import Dict, List, Any, Optional, Tuple, Union
 from datetime import datetime
 import discord
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from .permission_responses import PermissionResponses
+from .metrics import metrics, timed
+
+log = logging.getLogger(__name__)
+
+# Seconds the admin system statistics are reused before being recomputed
+SYSTEM_STATS_TTL = 30
+
+# Full unique indexes on active_tickets from before the partial ones replaced them.
+# A null channel_id on every reservation collides under channel_id_1, and the full
+# (guild, user, type) index also blocks a new ticket while a closed one awaits archiving.
+LEGACY_ACTIVE_TICKET_INDEXES = ('guild_id_1_user_id_1_ticket_type_1', 'channel_id_1')
+
+PERMISSION_CHECK_SECONDS = metrics.histogram(
+    'permission_check_seconds', 'Latency of dashboard and command permission checks', ('kind',)
+)
 
 class MongoManager:
     def __init__(self):
@@ -12,6 +31,9 @@ class MongoManager:
         self._load_env_variables()
         self.client = None
         self.db = None
+        self._system_stats = None  # (computed_at, stats)
+        self._system_stats_lock = asyncio.Lock()
+        self._staff_listeners = []  # called with (guild_id, ticket_type) after staff changes
         
     async def initialize(self):
         """Initialize MongoDB connection and setup collections"""
@@ -22,10 +44,10 @@ class MongoManager:
             
             # Initialize collections and indexes
             await self._initialize_collections()
-            print("MongoDB initialization complete")
+            log.info("MongoDB initialization complete")
             
         except Exception as e:
-            print(f"Failed to initialize MongoDB: {str(e)}")
+            log.error("Failed to initialize MongoDB: %s", e)
             raise
 
     def _load_env_variables(self):
@@ -66,7 +88,7 @@ class MongoManager:
             # Create indexes
             await self._create_indexes()
         except Exception as e:
-            print(f"Error initializing collections: {e}")
+            log.error("Error initializing collections: %s", e)
             raise
             
     async def _create_indexes(self):
@@ -103,32 +125,131 @@ class MongoManager:
             ])
 
             # Active tickets indexes
+            await self._drop_legacy_indexes(self.db.active_tickets, LEGACY_ACTIVE_TICKET_INDEXES)
+            # One open ticket per (guild, user, type); inserting first acts as the lock
+            await self._ensure_partial_index(
+                self.db.active_tickets,
+                [('guild_id', 1), ('user_id', 1), ('ticket_type', 1)],
+                name='open_ticket_per_user',
+                partial_filter={'status': 'open'}
+            )
+            # Reserved tickets have no channel yet
+            await self._ensure_partial_index(
+                self.db.active_tickets,
+                [('channel_id', 1)],
+                name='ticket_channel_unique',
+                partial_filter={'channel_id': {'$exists': True}}
+            )
+            await self.db.active_tickets.create_index([
+                ('created_at', 1)
+            ])
+            # Stale ticket sweeps walk open tickets in _id order
+            await self._ensure_partial_index(
+                self.db.active_tickets,
+                [('status', 1), ('_id', 1)],
+                name='open_tickets_by_id',
+                partial_filter={'status': 'open'},
+                unique=False
+            )
+            # Closed tickets waiting to move to the archive tier
             await self.db.active_tickets.create_index([
+                ('status', 1),
+                ('closed_at', 1)
+            ])
+            await self.db.tickets.create_index([
+                ('status', 1),
+                ('updated_at', 1)
+            ])
+
+            # Clan matching by type and minimum Town Hall
+            await self.db.clans.create_index([
                 ('guild_id', 1),
-                ('user_id', 1),
-                ('ticket_type', 1)
+                ('clan_type', 1),
+                ('min_town_hall', 1)
+            ])
+
+            # Keyset pagination of clan listings
+            await self.db.clans.create_index([
+                ('guild_id', 1),
+                ('name', 1),
+                ('_id', 1)
+            ])
+
+            # Clash King snapshots, one per registered clan
+            await self.db.clan_snapshots.create_index([
+                ('clan_id', 1)
             ], unique=True)
-            await self.db.active_tickets.create_index([
+            await self.db.clan_snapshots.create_index([
+                ('guild_id', 1)
+            ])
+
+            # Archive tier for closed tickets from both collections
+            await self.db.tickets_archive.create_index([
+                ('guild_id', 1),
+                ('user_id', 1),
+                ('created_at', -1)
+            ])
+            await self.db.tickets_archive.create_index([
                 ('channel_id', 1)
-            ], unique=True)
-            await self.db.active_tickets.create_index([
-                ('created_at', 1)
             ])
+            await self.db.tickets_archive.create_index([
+                ('thread_id', 1)
+            ])
+
+            # Ticket question sessions, abandoned ones expire after a week
+            await self.db.ticket_sessions.create_index([
+                ('channel_id', 1)
+            ], unique=True)
+            await self.db.ticket_sessions.create_index([
+                ('updated_at', 1)
+            ], expireAfterSeconds=7 * 24 * 3600)
+
+            # Stored ticket attachments, one document per content hash
+            await self.db.attachments.create_index([
+                ('sha256', 1)
+            ], unique=True)
         except Exception as e:
-            print(f"Error creating indexes: {e}")
+            log.error("Error creating indexes: %s", e)
             raise
             
+    async def _drop_legacy_indexes(self, collection, names: Tuple[str, ...]):
+        """Drop full indexes that earlier versions of this bot created, if they are still there"""
+        indexes = await collection.index_information()
+        for name in names:
+            index = indexes.get(name)
+            if index is None or 'partialFilterExpression' in index:
+                continue
+            await collection.drop_index(name)
+            log.info("Dropped legacy index %s on %s", name, collection.name)
+
+    async def _ensure_partial_index(
+        self,
+        collection,
+        keys: List,
+        name: str,
+        partial_filter: Dict,
+        unique: bool = True
+    ):
+        """Create a partial index under its own name"""
+        await collection.create_index(
+            keys,
+            name=name,
+            unique=unique,
+            partialFilterExpression=partial_filter
+        )
+
     # Questions Management Methods
     async def get_questions(self, guild_id: int, ticket_type: str) -> List[Dict]:
         """Get questions for a specific ticket type"""
         try:
-            cursor = self.db.questions.find({
+            # One document per ticket type holds the whole list
+            doc = await self.db.questions.find_one({
                 'guild_id': guild_id,
                 'ticket_type': ticket_type
             })
-            return await cursor.to_list(length=None)
+            return doc.get('questions', []) if doc else []
         except Exception as e:
-            print(f"Error getting questions: {e}")
+            log.error("Error getting questions: %s", e)
             return []
 
     async def update_questions(self, guild_id: int, ticket_type: str, questions: List[Dict]) -> bool:
@@ -149,7 +270,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error updating questions: {e}")
+            log.error("Error updating questions: %s", e)
             return False
 
     async def add_question(self, guild_id: int, ticket_type: str, question: Dict) -> bool:
@@ -172,7 +293,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error adding question: {e}")
+            log.error("Error adding question: %s", e)
             return False
 
     async def remove_question(self, guild_id: int, ticket_type: str, question_id: str) -> bool:
@@ -196,7 +317,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error removing question: {e}")
+            log.error("Error removing question: %s", e)
             return False
 
     # Ticket Tracking Methods
@@ -222,7 +343,67 @@ class MongoManager:
             })
             return True
         except Exception as e:
-            print(f"Error creating ticket: {e}")
+            log.error("Error creating ticket: %s", e)
+            return False
+
+    async def reserve_ticket(
+        self,
+        guild_id: int,
+        user_id: int,
+        ticket_type: str
+    ) -> Optional[Any]:
+        """Insert an open ticket before its channel exists.
+
+        Returns the ticket ID, or None if the user already has an open ticket
+        of this type (or the insert failed).
+        """
+        try:
+            result = await self.db.active_tickets.insert_one({
+                'guild_id': guild_id,
+                'thread_id': None,
+                'user_id': user_id,
+                'ticket_type': ticket_type,
+                'status': 'open',
+                'created_at': datetime.utcnow(),
+                'updated_at': datetime.utcnow()
+            })
+            return result.inserted_id
+        except DuplicateKeyError:
+            return None
+        except Exception as e:
+            log.error("Error reserving ticket: %s", e)
+            return None
+
+    async def attach_ticket_channel(
+        self,
+        ticket_id: Any,
+        channel_id: int,
+        thread_id: Optional[int] = None
+    ) -> bool:
+        """Attach the created channel (and thread) to a reserved ticket"""
+        try:
+            result = await self.db.active_tickets.update_one(
+                {'_id': ticket_id},
+                {
+                    '$set': {
+                        'channel_id': channel_id,
+                        'thread_id': thread_id,
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return result.matched_count > 0
+        except Exception as e:
+            log.error("Error attaching ticket channel: %s", e)
+            return False
+
+    async def release_ticket(self, ticket_id: Any) -> bool:
+        """Delete a reserved ticket whose setup failed"""
+        try:
+            result = await self.db.active_tickets.delete_one({'_id': ticket_id})
+            return result.deleted_count > 0
+        except Exception as e:
+            log.error("Error releasing ticket: %s", e)
             return False
 
     async def get_active_ticket(
@@ -240,7 +421,7 @@ class MongoManager:
                 'status': 'open'
             })
         except Exception as e:
-            print(f"Error getting active ticket: {e}")
+            log.error("Error getting active ticket: %s", e)
             return None
 
     async def close_ticket(
@@ -270,20 +451,150 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error closing ticket: {e}")
+            log.error("Error closing ticket: %s", e)
+            return False
+
+    async def get_open_tickets_batch(self, after_id: Optional[Any], limit: int) -> List[Dict]:
+        """Get the next batch of open tickets after an _id, in _id order"""
+        try:
+            query: Dict[str, Any] = {'status': 'open'}
+            if after_id is not None:
+                query['_id'] = {'$gt': after_id}
+            cursor = self.db.active_tickets.find(
+                query,
+                {'guild_id': 1, 'channel_id': 1, 'user_id': 1, 'created_at': 1}
+            ).sort('_id', 1).limit(limit)
+            return await cursor.to_list(length=limit)
+        except Exception as e:
+            log.error("Error getting open tickets: %s", e)
+            return []
+
+    async def close_tickets_bulk(self, closures: List[Any], closed_by: int) -> int:
+        """Close many tickets in one round trip, closures are (ticket_id, reason) pairs"""
+        try:
+            now = datetime.utcnow()
+            result = await self.db.active_tickets.bulk_write([
+                UpdateOne(
+                    {'_id': ticket_id, 'status': 'open'},
+                    {
+                        '$set': {
+                            'status': 'closed',
+                            'closed_by': closed_by,
+                            'close_reason': reason,
+                            'closed_at': now,
+                            'updated_at': now
+                        }
+                    }
+                )
+                for ticket_id, reason in closures
+            ], ordered=False)
+            return result.modified_count
+        except Exception as e:
+            log.error("Error closing tickets: %s", e)
+            return 0
+
+    # Ticket Archive Methods
+    async def archive_closed_tickets(
+        self,
+        source: str,
+        statuses: List[str],
+        time_field: str,
+        before: datetime,
+        batch_size: int = 500
+    ) -> int:
+        """Move one batch of finished tickets into tickets_archive.
+
+        Documents are copied before they are deleted, so an interrupted batch
+        is simply copied again (duplicates are ignored) on the next run.
+        Returns the number of tickets moved.
+        """
+        try:
+            collection = self.db[source]
+            cursor = collection.find({
+                'status': {'$in': statuses},
+                time_field: {'$lt': before}
+            }).limit(batch_size)
+            tickets = await cursor.to_list(length=batch_size)
+            if not tickets:
+                return 0
+
+            now = datetime.utcnow()
+            for ticket in tickets:
+                ticket['source'] = source
+                ticket['archived_at'] = now
+            try:
+                await self.db.tickets_archive.insert_many(tickets, ordered=False)
+            except BulkWriteError as e:
+                # Already archived by an interrupted run
+                if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                    raise
+
+            await collection.delete_many({'_id': {'$in': [ticket['_id'] for ticket in tickets]}})
+            return len(tickets)
+        except Exception as e:
+            log.error("Error archiving tickets from %s: %s", source, e)
+            return 0
+
+    async def search_tickets(
+        self,
+        query: Dict[str, Any],
+        include_archive: bool = True,
+        limit: int = 50
+    ) -> List[Dict]:
+        """Find tickets across the hot collections and the archive, newest first"""
+        try:
+            sources = ['active_tickets', 'tickets']
+            if include_archive:
+                sources.append('tickets_archive')
+
+            results = []
+            for source in sources:
+                cursor = self.db[source].find(query).sort('created_at', -1).limit(limit)
+                for ticket in await cursor.to_list(length=limit):
+                    ticket.setdefault('source', source)
+                    ticket['archived'] = source == 'tickets_archive'
+                    results.append(ticket)
+
+            results.sort(key=lambda ticket: ticket.get('created_at') or datetime.min, reverse=True)
+            return results[:limit]
+        except Exception as e:
+            log.error("Error searching tickets: %s", e)
+            return []
+
+    async def set_ticket_transcript(self, channel_id: int, transcript: Dict[str, Any]) -> bool:
+        """Record where a ticket's transcript was archived"""
+        try:
+            update = {
+                '$set': {
+                    'transcript': transcript,
+                    'updated_at': datetime.utcnow()
+                }
+            }
+            result = await self.db.active_tickets.update_one({'channel_id': channel_id}, update)
+            if not result.matched_count:
+                # Ticket may already have moved to the archive tier
+                await self.db.tickets_archive.update_one({'channel_id': channel_id}, update)
+            return True
+        except Exception as e:
+            log.error("Error saving ticket transcript: %s", e)
             return False
 
     async def get_ticket_by_channel(
         self,
         channel_id: int
     ) -> Optional[Dict]:
-        """Get ticket information by channel ID"""
+        """Get ticket information by channel ID, from either tier"""
         try:
-            return await self.db.active_tickets.find_one({
+            ticket = await self.db.active_tickets.find_one({
                 'channel_id': channel_id
             })
+            if ticket is None:
+                ticket = await self.db.tickets_archive.find_one({
+                    'channel_id': channel_id
+                })
+            return ticket
         except Exception as e:
-            print(f"Error getting ticket: {e}")
+            log.error("Error getting ticket: %s", e)
             return None
 
     async def update_ticket_thread(
@@ -306,9 +617,191 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error updating ticket thread: {e}")
+            log.error("Error updating ticket thread: %s", e)
             return False
             
+    # Ticket Session Methods
+    async def create_ticket_session(self, session: Dict[str, Any]) -> bool:
+        """Create (or restart) the question session for a channel"""
+        try:
+            await self.db.ticket_sessions.replace_one(
+                {'channel_id': session['channel_id']},
+                session,
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            log.error("Error creating ticket session: %s", e)
+            return False
+
+    async def save_ticket_session_answer(self, channel_id: int, index: int, entry: Dict[str, Any]) -> bool:
+        """Checkpoint one answer of a question session"""
+        try:
+            await self.db.ticket_sessions.update_one(
+                {'channel_id': channel_id},
+                {
+                    '$set': {
+                        f'answers.{index}': entry,
+                        'current_index': index + 1,
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            log.error("Error saving ticket session answer: %s", e)
+            return False
+
+    async def save_ticket_session_answers(
+        self,
+        channel_id: int,
+        entries: Dict[int, Dict[str, Any]],
+        current_index: int
+    ) -> bool:
+        """Checkpoint several answers of a question session in one update"""
+        try:
+            await self.db.ticket_sessions.update_one(
+                {'channel_id': channel_id},
+                {
+                    '$set': {
+                        **{f'answers.{index}': entry for index, entry in entries.items()},
+                        'current_index': current_index,
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            log.error("Error saving ticket session answers: %s", e)
+            return False
+
+    async def complete_ticket_session(self, channel_id: int) -> bool:
+        """Mark a question session as finished"""
+        try:
+            await self.db.ticket_sessions.update_one(
+                {'channel_id': channel_id},
+                {
+                    '$set': {
+                        'status': 'completed',
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            log.error("Error completing ticket session: %s", e)
+            return False
+
+    async def close_ticket_sessions(self, channel_ids: List[int]) -> bool:
+        """Mark the in-progress question sessions of closed ticket channels as closed"""
+        try:
+            await self.db.ticket_sessions.update_many(
+                {'channel_id': {'$in': channel_ids}, 'status': 'in_progress'},
+                {
+                    '$set': {
+                        'status': 'closed',
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            log.error("Error closing ticket sessions: %s", e)
+            return False
+
+    async def get_active_ticket_sessions(self) -> List[Dict]:
+        """Get all question sessions that are still in progress"""
+        try:
+            cursor = self.db.ticket_sessions.find({'status': 'in_progress'})
+            return await cursor.to_list(length=None)
+        except Exception as e:
+            log.error("Error getting ticket sessions: %s", e)
+            return []
+
+    # Attachment Methods
+    async def get_attachment(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """Get stored attachment metadata by content hash"""
+        try:
+            return await self.db.attachments.find_one({'sha256': sha256}, {'_id': 0})
+        except Exception as e:
+            log.error("Error getting attachment: %s", e)
+            return None
+
+    async def save_attachment(self, metadata: Dict[str, Any]) -> bool:
+        """Save attachment metadata, an existing hash counts as saved"""
+        try:
+            await self.db.attachments.insert_one(dict(metadata))
+            return True
+        except DuplicateKeyError:
+            return True
+        except Exception as e:
+            log.error("Error saving attachment: %s", e)
+            return False
+
+    # System statistics
+    async def get_system_stats(self) -> Dict[str, Any]:
+        """Get database statistics for the admin dashboard, cached for SYSTEM_STATS_TTL"""
+        async with self._system_stats_lock:
+            if self._system_stats and time.monotonic() - self._system_stats[0] < SYSTEM_STATS_TTL:
+                return self._system_stats[1]
+            try:
+                stats = await self._compute_system_stats()
+            except Exception as e:
+                log.error("Error getting system stats: %s", e)
+                return {}
+            self._system_stats = (time.monotonic(), stats)
+            return stats
+
+    async def _compute_system_stats(self) -> Dict[str, Any]:
+        ticket_facet = [{
+            '$facet': {
+                'by_status': [{'$group': {'_id': '$status', 'count': {'$sum': 1}}}],
+                'by_type': [{'$group': {'_id': '$ticket_type', 'count': {'$sum': 1}}}]
+            }
+        }]
+        counting_summary = [{
+            '$group': {
+                '_id': None,
+                'channels': {'$sum': 1},
+                'enabled': {'$sum': {'$cond': ['$enabled', 1, 0]}},
+                'total_counted': {'$sum': '$current_count'},
+                'last_activity': {'$max': '$updated_at'}
+            }
+        }]
+        estimated = (
+            'dashboard_permissions', 'command_permissions', 'ticket_config',
+            'tickets_archive', 'attachments', 'clan_snapshots'
+        )
+
+        # Every aggregation is a single round trip, run them side by side
+        results = await asyncio.gather(
+            self.db.active_tickets.aggregate(ticket_facet).to_list(length=1),
+            self.db.tickets.aggregate(ticket_facet).to_list(length=1),
+            self.db.clans.aggregate([{'$group': {'_id': '$guild_id', 'count': {'$sum': 1}}}]).to_list(length=None),
+            self.db.counting_system.aggregate(counting_summary).to_list(length=1),
+            *(self.db[name].estimated_document_count() for name in estimated)
+        )
+        active_tickets, tickets, clans, counting = results[:4]
+
+        by_status: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for facet in active_tickets + tickets:
+            for row in facet['by_status']:
+                by_status[str(row['_id'])] = by_status.get(str(row['_id']), 0) + row['count']
+            for row in facet['by_type']:
+                by_type[str(row['_id'])] = by_type.get(str(row['_id']), 0) + row['count']
+
+        counting_stats = counting[0] if counting else {}
+        counting_stats.pop('_id', None)
+        return {
+            'tickets_by_status': by_status,
+            'tickets_by_type': by_type,
+            'clans_per_guild': {row['_id']: row['count'] for row in clans},
+            'counting': counting_stats,
+            'collections': dict(zip(estimated, results[4:])),
+            'computed_at': datetime.utcnow()
+        }
+
     # Counting System Methods
     async def setup_counting(self, guild_id: int, channel_id: int) -> bool:
         """Setup counting system for a channel"""
@@ -329,7 +822,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error setting up counting: {e}")
+            log.error("Error setting up counting: %s", e)
             return False
 
     async def disable_counting(self, guild_id: int, channel_id: int) -> bool:
@@ -349,7 +842,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error disabling counting: {e}")
+            log.error("Error disabling counting: %s", e)
             return False
 
     async def get_counting_data(self, guild_id: int) -> Optional[dict]:
@@ -357,7 +850,7 @@ class MongoManager:
         try:
             return await self.db.counting_system.find_one({'guild_id': guild_id, 'enabled': True})
         except Exception as e:
-            print(f"Error getting counting data: {e}")
+            log.error("Error getting counting data: %s", e)
             return None
 
     async def update_count(self, guild_id: int, channel_id: int, count: int, user_id: int) -> bool:
@@ -378,9 +871,35 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error updating count: {e}")
+            log.error("Error updating count: %s", e)
             return False
 
+    async def reset_count(self, channel_id: int) -> bool:
+        """Reset a channel's count after a wrong number"""
+        try:
+            await self.db.counting_system.update_one(
+                {'channel_id': channel_id},
+                {
+                    '$set': {
+                        'current_count': 0,
+                        'last_counter': None,
+                        'updated_at': datetime.utcnow()
+                    }
+                }
+            )
+            return True
+        except Exception as e:
+            log.error("Error resetting count: %s", e)
+            return False
+
+    async def get_counting_settings(self, guild_id: int) -> Dict[str, Any]:
+        """Get a guild's counting rules, empty if it uses the defaults"""
+        try:
+            return await self.db.counting_settings.find_one({'guild_id': guild_id}) or {}
+        except Exception as e:
+            log.error("Error getting counting settings: %s", e)
+            return {}
+
     async def get_guild_counting_channels(self, guild_id: int) -> list:
         """Get all counting channels for a guild"""
         try:
@@ -390,7 +909,7 @@ class MongoManager:
             })
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting counting channels: {e}")
+            log.error("Error getting counting channels: %s", e)
             return []
 
     # Color Roles Management
@@ -409,7 +928,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error adding color role: {e}")
+            log.error("Error adding color role: %s", e)
             return False
 
     async def get_color_roles(self, guild_id: int) -> List[Dict]:
@@ -418,7 +937,7 @@ class MongoManager:
             cursor = self.db.color_roles.find({'guild_id': guild_id})
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting color roles: {e}")
+            log.error("Error getting color roles: %s", e)
             return []
 
     async def remove_color_role(self, guild_id: int, role_id: int) -> bool:
@@ -430,7 +949,7 @@ class MongoManager:
             })
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error removing color role: {e}")
+            log.error("Error removing color role: %s", e)
             return False
 
     # Booster Roles Management
@@ -449,7 +968,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error adding booster role: {e}")
+            log.error("Error adding booster role: %s", e)
             return False
 
     async def get_booster_roles(self, guild_id: int) -> List[Dict]:
@@ -458,7 +977,7 @@ class MongoManager:
             cursor = self.db.booster_roles.find({'guild_id': guild_id})
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting booster roles: {e}")
+            log.error("Error getting booster roles: %s", e)
             return []
 
     async def remove_booster_role(self, guild_id: int, role_id: int) -> bool:
@@ -470,7 +989,7 @@ class MongoManager:
             })
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error removing booster role: {e}")
+            log.error("Error removing booster role: %s", e)
             return False
 
     # Panel Images Management
@@ -492,7 +1011,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving panel image: {e}")
+            log.error("Error saving panel image: %s", e)
             return False
 
     async def get_panel_image(self, panel_type: str, guild_id: int) -> Optional[str]:
@@ -504,7 +1023,7 @@ class MongoManager:
             })
             return doc['image_url'] if doc else None
         except Exception as e:
-            print(f"Error getting panel image: {e}")
+            log.error("Error getting panel image: %s", e)
             return None
 
     async def delete_panel_image(self, panel_type: str, guild_id: int) -> bool:
@@ -516,7 +1035,7 @@ class MongoManager:
             })
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error deleting panel image: {e}")
+            log.error("Error deleting panel image: %s", e)
             return False
             # Define collection configurations with indexes
             collections_config = {
@@ -612,7 +1131,7 @@ class MongoManager:
             for collection_name in collections_config.keys():
                 if collection_name not in existing_collections:
                     await self.db.create_collection(collection_name)
-                    print(f"Created collection: {collection_name}")
+                    log.info("Created collection: %s", collection_name)
 
             # Create indexes for each collection
             for collection_name, config in collections_config.items():
@@ -630,7 +1149,7 @@ class MongoManager:
                         except Exception as e:
                             # Ignore index conflicts
                             if 'already exists' not in str(e):
-                                print(f"Index creation error: {e}")
+                                log.error("Index creation error: %s", e)
                 
                 # Create unique indexes
                 if 'unique_indexes' in config:
@@ -639,15 +1158,16 @@ class MongoManager:
                             await collection.create_index(index, unique=True, name=index_name(index))
                         except Exception as e:
                             if 'already exists' not in str(e) and 'IndexKeySpecsConflict' not in str(e):
-                                print(f"Unique index creation error: {e}")
+                                log.error("Unique index creation error: %s", e)
 
-            print("MongoDB collections and indexes initialized successfully")
+            log.info("MongoDB collections and indexes initialized successfully")
             collections = await self.db.list_collection_names()
-            print(f"Available collections: {', '.join(collections)}")
+            log.info("Available collections: %s", ', '.join(collections))
             
         except Exception as e:
-            print(f"Error initializing collections: {str(e)}")
+            log.error("Error initializing collections: %s", e)
 
+    @timed(PERMISSION_CHECK_SECONDS.labels('dashboard'))
     async def check_dashboard_permission(self, dashboard_name: str, user_id: int, user_roles: List[int], guild_id: int) -> bool:
         """Check if user has permission to use a dashboard"""
         try:
@@ -684,9 +1204,10 @@ class MongoManager:
             return bool(role_perm)
 
         except Exception as e:
-            print(f"Error checking dashboard permission: {str(e)}")
+            log.error("Error checking dashboard permission: %s", e)
             return False
 
+    @timed(PERMISSION_CHECK_SECONDS.labels('command'))
     async def check_command_permission(self, command_name: str, user_id: int, user_roles: List[int], guild_id: int) -> bool:
         """Check if user has permission to use a command"""
         try:
@@ -722,7 +1243,7 @@ class MongoManager:
             return bool(role_perm)
 
         except Exception as e:
-            print(f"Error checking command permission: {str(e)}")
+            log.error("Error checking command permission: %s", e)
             return False
 
     # Ticket System Methods
@@ -744,7 +1265,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving ticket questions: {str(e)}")
+            log.error("Error saving ticket questions: %s", e)
             return False
 
     async def get_ticket_questions(self, ticket_type: str, guild_id: int) -> List[str]:
@@ -756,7 +1277,7 @@ class MongoManager:
             })
             return config.get('questions', []) if config else []
         except Exception as e:
-            print(f"Error getting ticket questions: {str(e)}")
+            log.error("Error getting ticket questions: %s", e)
             return []
 
     async def add_ticket_staff(self, ticket_type: str, guild_id: int, 
@@ -790,7 +1311,7 @@ class MongoManager:
             await self.db.ticket_staff.insert_one(doc)
             return True
         except Exception as e:
-            print(f"Error adding ticket staff: {str(e)}")
+            log.error("Error adding ticket staff: %s", e)
             return False
 
     async def remove_ticket_staff(self, ticket_type: str, guild_id: int,
@@ -809,7 +1330,7 @@ class MongoManager:
             result = await self.db.ticket_staff.delete_one(query)
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error removing ticket staff: {str(e)}")
+            log.error("Error removing ticket staff: %s", e)
             return False
 
     async def save_ticket(self, ticket_type: str, ticket_data: Dict[str, Any]) -> bool:
@@ -821,7 +1342,7 @@ class MongoManager:
             await self.db.tickets.insert_one(ticket_data)
             return True
         except Exception as e:
-            print(f"Error saving ticket: {str(e)}")
+            log.error("Error saving ticket: %s", e)
             return False
 
     async def update_ticket_status(self, ticket_id: str, new_status: str, 
@@ -840,9 +1361,15 @@ class MongoManager:
                 {'_id': ticket_id},
                 {'$set': update_data}
             )
+            if not result.matched_count:
+                # Decisions on archived tickets update the archive copy
+                result = await self.db.tickets_archive.update_one(
+                    {'_id': ticket_id},
+                    {'$set': update_data}
+                )
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error updating ticket status: {str(e)}")
+            log.error("Error updating ticket status: %s", e)
             return False
 
     # Panel Methods
@@ -864,7 +1391,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving panel channel: {str(e)}")
+            log.error("Error saving panel channel: %s", e)
             return False
 
     async def get_panel_channel(self, panel_type: str, guild_id: int) -> Optional[int]:
@@ -876,7 +1403,7 @@ class MongoManager:
             })
             return doc['channel_id'] if doc else None
         except Exception as e:
-            print(f"Error getting panel channel: {str(e)}")
+            log.error("Error getting panel channel: %s", e)
             return None
 
     async def save_panel_image(self, panel_type: str, image_url: str, guild_id: int) -> bool:
@@ -897,7 +1424,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving panel image: {str(e)}")
+            log.error("Error saving panel image: %s", e)
             return False
 
     async def get_panel_image(self, panel_type: str, guild_id: int) -> Optional[str]:
@@ -909,7 +1436,7 @@ class MongoManager:
             })
             return doc['image_url'] if doc else None
         except Exception as e:
-            print(f"Error getting panel image: {str(e)}")
+            log.error("Error getting panel image: %s", e)
             return None
 
     async def get_ticket_staff(self, ticket_type: str, guild_id: int) -> Dict[str, List[int]]:
@@ -934,7 +1461,7 @@ class MongoManager:
             return staff
             
         except Exception as e:
-            print(f"Error getting ticket staff: {str(e)}")
+            log.error("Error getting ticket staff: %s", e)
             return {'users': [], 'roles': []}
 
     # Clan Methods
@@ -953,7 +1480,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving clan data: {str(e)}")
+            log.error("Error saving clan data: %s", e)
             return False
 
     # Settings Methods
@@ -973,7 +1500,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving guild settings: {str(e)}")
+            log.error("Error saving guild settings: %s", e)
             return False
 
     async def get_guild_settings(self, guild_id: int, settings_type: str) -> Optional[Dict[str, Any]]:
@@ -984,7 +1511,7 @@ class MongoManager:
                 'type': settings_type
             })
         except Exception as e:
-            print(f"Error getting guild settings: {str(e)}")
+            log.error("Error getting guild settings: %s", e)
             return None
 
     # Missing methods that other cogs are trying to use
@@ -1004,7 +1531,7 @@ class MongoManager:
             await self.db.dashboard_permissions.insert_one(doc)
             return True
         except Exception as e:
-            print(f"Error adding dashboard permission: {str(e)}")
+            log.error("Error adding dashboard permission: %s", e)
             return False
 
     async def add_color_role(self, role_id: int, guild_id: int) -> bool:
@@ -1022,7 +1549,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error adding color role: {str(e)}")
+            log.error("Error adding color role: %s", e)
             return False
 
     async def get_counting_data(self, guild_id: int) -> Optional[Dict[str, Any]]:
@@ -1030,7 +1557,7 @@ class MongoManager:
         try:
             return await self.db.counting_channels.find_one({'guild_id': guild_id})
         except Exception as e:
-            print(f"Error getting counting data: {str(e)}")
+            log.error("Error getting counting data: %s", e)
             return None
 
     async def save_counting_data(self, guild_id: int, channel_id: int, enabled: bool = True) -> bool:
@@ -1049,7 +1576,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving counting data: {str(e)}")
+            log.error("Error saving counting data: %s", e)
             return False
 
     async def remove_panel_image(self, panel_type: str, guild_id: int) -> bool:
@@ -1061,17 +1588,47 @@ class MongoManager:
             })
             return True
         except Exception as e:
-            print(f"Error removing panel image: {str(e)}")
+            log.error("Error removing panel image: %s", e)
             return False
 
     # Clan management methods
-    async def get_all_clans(self, guild_id: int) -> list:
-        """Get all clans for a guild"""
+    async def get_all_clans(self, guild_id: int) -> Optional[list]:
+        """Get all clans for a guild, None if the read failed"""
         try:
             cursor = self.db.clans.find({'guild_id': guild_id})
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting clans: {str(e)}")
+            log.error("Error getting clans: %s", e)
+            return None
+
+    async def get_clans_page(
+        self,
+        guild_id: int,
+        limit: int,
+        after: Optional[tuple] = None,
+        before: Optional[tuple] = None,
+        projection: Optional[Dict[str, int]] = None
+    ) -> list:
+        """Get one page of a guild's clans ordered by (name, _id), after or before a (name, _id) key"""
+        try:
+            query = {'guild_id': guild_id}
+            direction = 1
+            key = after if after is not None else before
+            if key is not None:
+                name, clan_id = key
+                op = '$gt' if after is not None else '$lt'
+                query['$or'] = [{'name': {op: name}}, {'name': name, '_id': {op: clan_id}}]
+                if before is not None:
+                    direction = -1
+            cursor = self.db.clans.find(query, projection).sort([
+                ('name', direction), ('_id', direction)
+            ]).limit(limit)
+            clans = await cursor.to_list(length=limit)
+            if direction == -1:
+                clans.reverse()
+            return clans
+        except Exception as e:
+            log.error("Error getting clans page: %s", e)
             return []
 
     async def get_clan_by_id(self, clan_id: str) -> Optional[Dict[str, Any]]:
@@ -1080,7 +1637,7 @@ class MongoManager:
             from bson import ObjectId
             return await self.db.clans.find_one({'_id': ObjectId(clan_id)})
         except Exception as e:
-            print(f"Error getting clan by ID: {str(e)}")
+            log.error("Error getting clan by ID: %s", e)
             return None
 
     async def save_clan_data(self, clan_data: Dict[str, Any], guild_id: int) -> bool:
@@ -1090,7 +1647,7 @@ class MongoManager:
             await self.db.clans.insert_one(clan_data)
             return True
         except Exception as e:
-            print(f"Error saving clan data: {str(e)}")
+            log.error("Error saving clan data: %s", e)
             return False
 
     async def update_clan_field(self, clan_id: str, field: str, value: Any) -> bool:
@@ -1103,7 +1660,7 @@ class MongoManager:
             )
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error updating clan field: {str(e)}")
+            log.error("Error updating clan field: %s", e)
             return False
 
     async def update_clan_data(self, clan_id: str, updates: Dict[str, Any]) -> bool:
@@ -1116,7 +1673,7 @@ class MongoManager:
             )
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error updating clan data: {str(e)}")
+            log.error("Error updating clan data: %s", e)
             return False
 
     async def delete_clan(self, clan_id: str) -> bool:
@@ -1124,9 +1681,58 @@ class MongoManager:
         try:
             from bson import ObjectId
             result = await self.db.clans.delete_one({'_id': ObjectId(clan_id)})
+            await self.db.clan_snapshots.delete_one({'clan_id': str(clan_id)})
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error deleting clan: {str(e)}")
+            log.error("Error deleting clan: %s", e)
+            return False
+
+    async def get_clans_for_sync(self) -> list:
+        """Get the fields of every clan needed to sync it from Clash King"""
+        try:
+            cursor = self.db.clans.find({}, {'guild_id': 1, 'name': 1, 'tag': 1, 'invite_link': 1})
+            return await cursor.to_list(length=None)
+        except Exception as e:
+            log.error("Error getting clans for sync: %s", e)
+            return []
+
+    async def get_clan_snapshots(self, guild_id: Optional[int] = None, clan_ids: Optional[List[str]] = None) -> list:
+        """Get Clash King snapshots, optionally for one guild or some clans"""
+        try:
+            query = {}
+            if guild_id is not None:
+                query['guild_id'] = guild_id
+            if clan_ids is not None:
+                query['clan_id'] = {'$in': clan_ids}
+            cursor = self.db.clan_snapshots.find(query, {'_id': 0})
+            return await cursor.to_list(length=None)
+        except Exception as e:
+            log.error("Error getting clan snapshots: %s", e)
+            return []
+
+    async def save_clan_snapshot(self, snapshot: Dict[str, Any]) -> bool:
+        """Save the latest Clash King snapshot of a clan"""
+        try:
+            await self.db.clan_snapshots.replace_one(
+                {'clan_id': snapshot['clan_id']},
+                snapshot,
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            log.error("Error saving clan snapshot: %s", e)
+            return False
+
+    async def touch_clan_snapshot(self, clan_id: str) -> bool:
+        """Mark a snapshot as checked when Clash King reports no change"""
+        try:
+            await self.db.clan_snapshots.update_one(
+                {'clan_id': clan_id},
+                {'$set': {'checked_at': datetime.utcnow()}}
+            )
+            return True
+        except Exception as e:
+            log.error("Error touching clan snapshot: %s", e)
             return False
 
     # Ticket system methods
@@ -1140,7 +1746,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error saving ticket questions: {str(e)}")
+            log.error("Error saving ticket questions: %s", e)
             return False
 
     async def get_ticket_questions(self, ticket_type: str, guild_id: int) -> list:
@@ -1152,7 +1758,7 @@ class MongoManager:
             })
             return doc.get('questions', []) if doc else []
         except Exception as e:
-            print(f"Error getting ticket questions: {str(e)}")
+            log.error("Error getting ticket questions: %s", e)
             return []
 
     async def add_ticket_staff(self, ticket_type: str, guild_id: int, user_id: Optional[int] = None, role_id: Optional[int] = None) -> bool:
@@ -1169,13 +1775,14 @@ class MongoManager:
                 doc['role_id'] = role_id
             
             await self.db.ticket_staff.insert_one(doc)
+            self._staff_changed(guild_id, ticket_type)
             return True
         except Exception as e:
-            print(f"Error adding ticket staff: {str(e)}")
+            log.error("Error adding ticket staff: %s", e)
             return False
 
-    async def get_ticket_staff(self, ticket_type: str, guild_id: int) -> list:
-        """Get ticket staff"""
+    async def get_ticket_staff(self, ticket_type: str, guild_id: int) -> Optional[list]:
+        """Get ticket staff, None if the read failed"""
         try:
             cursor = self.db.ticket_staff.find({
                 'ticket_type': ticket_type,
@@ -1183,8 +1790,8 @@ class MongoManager:
             })
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting ticket staff: {str(e)}")
-            return []
+            log.error("Error getting ticket staff: %s", e)
+            return None
 
     async def remove_ticket_staff(self, ticket_type: str, guild_id: int, user_id: Optional[int] = None, role_id: Optional[int] = None) -> bool:
         """Remove ticket staff"""
@@ -1199,11 +1806,20 @@ class MongoManager:
                 query['role_id'] = role_id
             
             result = await self.db.ticket_staff.delete_one(query)
+            self._staff_changed(guild_id, ticket_type)
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error removing ticket staff: {str(e)}")
+            log.error("Error removing ticket staff: %s", e)
             return False
 
+    def add_staff_listener(self, callback):
+        """Call ``callback(guild_id, ticket_type)`` whenever ticket staff change"""
+        self._staff_listeners.append(callback)
+
+    def _staff_changed(self, guild_id: int, ticket_type: str):
+        for callback in self._staff_listeners:
+            callback(guild_id, ticket_type)
+
     async def set_ticket_category(self, ticket_type: str, guild_id: int, category_id: int) -> bool:
         """Set ticket category"""
         try:
@@ -1214,7 +1830,34 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error setting ticket category: {str(e)}")
+            log.error("Error setting ticket category: %s", e)
+            return False
+
+    async def get_ticket_config(self, ticket_type: str, guild_id: int) -> Optional[Dict[str, Any]]:
+        """Get the full config document for a ticket type"""
+        try:
+            return await self.db.ticket_config.find_one({
+                'ticket_type': ticket_type,
+                'guild_id': guild_id
+            })
+        except Exception as e:
+            log.error("Error getting ticket config: %s", e)
+            return None
+
+    async def add_ticket_overflow_category(self, ticket_type: str, guild_id: int, category_id: int) -> bool:
+        """Record an overflow category used once the configured one is full"""
+        try:
+            await self.db.ticket_config.update_one(
+                {'ticket_type': ticket_type, 'guild_id': guild_id},
+                {
+                    '$addToSet': {'overflow_category_ids': category_id},
+                    '$set': {'updated_at': datetime.utcnow()}
+                },
+                upsert=True
+            )
+            return True
+        except Exception as e:
+            log.error("Error adding overflow category: %s", e)
             return False
 
     async def get_panel_image(self, panel_type: str, guild_id: int) -> Optional[str]:
@@ -1226,7 +1869,7 @@ class MongoManager:
             })
             return doc.get('image_url') if doc else None
         except Exception as e:
-            print(f"Error getting panel image: {str(e)}")
+            log.error("Error getting panel image: %s", e)
             return None
 
     async def set_panel_image(self, panel_type: str, guild_id: int, image_url: str) -> bool:
@@ -1239,7 +1882,7 @@ class MongoManager:
             )
             return True
         except Exception as e:
-            print(f"Error setting panel image: {str(e)}")
+            log.error("Error setting panel image: %s", e)
             return False
 
     async def get_clans_by_type_and_th(self, clan_type: str, min_th: int, guild_id: int) -> list:
@@ -1252,5 +1895,5 @@ class MongoManager:
             })
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting clans by type and TH: {str(e)}")
+            log.error("Error getting clans by type and TH: %s", e)
             return []
\ No newline at end of file
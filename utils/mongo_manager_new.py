@@ -1,3 +1,4 @@
+import logging
 from motor import motor_asyncio
 import os
 import asyncio
@@ -8,6 +9,8 @@ from .permission_responses import PermissionResponses
 from .permission_manager import PermissionManager
 from .permission_result import PermissionResult
 
+log = logging.getLogger(__name__)
+
 class MongoManager:
     def __init__(self):
         """Initialize MongoDB connection and setup collections"""
@@ -27,7 +30,7 @@ class MongoManager:
                     setattr(self, func_name, getattr(QuestionStore, func_name).__get__(self))
             
         except Exception as e:
-            print(f"Failed to initialize MongoDB: {str(e)}")
+            log.error("Failed to initialize MongoDB: %s", e)
             raise
 
     def _load_env_variables(self):
@@ -63,9 +66,9 @@ class MongoManager:
             ])
             await self.db.clans.create_index([("name", 1), ("guild_id", 1)], unique=True)
             
-            print("MongoDB collections and indexes initialized successfully")
+            log.info("MongoDB collections and indexes initialized successfully")
         except Exception as e:
-            print(f"Error initializing collections: {str(e)}")
+            log.error("Error initializing collections: %s", e)
 
     async def check_dashboard_permission(self, dashboard_name: str, user_id: int, user_roles: List[int], guild_id: int) -> bool:
         """Check if user has permission to use a dashboard"""
@@ -102,7 +105,7 @@ class MongoManager:
             return bool(role_perm)
 
         except Exception as e:
-            print(f"Error checking dashboard permission: {str(e)}")
+            log.error("Error checking dashboard permission: %s", e)
             return False
 
     async def check_command_permission(self, command_name: str, user_id: int, user_roles: List[int], guild_id: int) -> bool:
@@ -140,7 +143,7 @@ class MongoManager:
             return bool(role_perm)
 
         except Exception as e:
-            print(f"Error checking command permission: {str(e)}")
+            log.error("Error checking command permission: %s", e)
             return False
 
     # Clan Data Management
@@ -150,7 +153,7 @@ class MongoManager:
             cursor = self.db.clans.find({"guild_id": guild_id})
             return await cursor.to_list(length=None)
         except Exception as e:
-            print(f"Error getting clan data: {str(e)}")
+            log.error("Error getting clan data: %s", e)
             return []
 
     async def get_clan_by_name(self, guild_id: int, clan_name: str) -> Optional[Dict]:
@@ -161,7 +164,7 @@ class MongoManager:
                 "name": clan_name
             })
         except Exception as e:
-            print(f"Error getting clan by name: {str(e)}")
+            log.error("Error getting clan by name: %s", e)
             return None
 
     async def add_clan(self, guild_id: int, clan_data: Dict) -> bool:
@@ -172,7 +175,7 @@ class MongoManager:
             await self.db.clans.insert_one(clan_data)
             return True
         except Exception as e:
-            print(f"Error adding clan: {str(e)}")
+            log.error("Error adding clan: %s", e)
             return False
 
     async def update_clan(self, guild_id: int, clan_name: str, update_data: Dict) -> bool:
@@ -185,7 +188,7 @@ class MongoManager:
             )
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error updating clan: {str(e)}")
+            log.error("Error updating clan: %s", e)
             return False
 
     async def delete_clan(self, guild_id: int, clan_name: str) -> bool:
@@ -197,7 +200,7 @@ class MongoManager:
             })
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error deleting clan: {str(e)}")
+            log.error("Error deleting clan: %s", e)
             return False
 
     # Permission Management
@@ -218,7 +221,7 @@ class MongoManager:
             await self.db.dashboard_permissions.insert_one(doc)
             return True
         except Exception as e:
-            print(f"Error adding dashboard permission: {str(e)}")
+            log.error("Error adding dashboard permission: %s", e)
             return False
 
     async def remove_dashboard_permission(self, dashboard_name: str, guild_id: int, user_id: Optional[int] = None,
@@ -237,5 +240,5 @@ class MongoManager:
             result = await self.db.dashboard_permissions.delete_one(query)
             return result.deleted_count > 0
         except Exception as e:
-            print(f"Error removing dashboard permission: {str(e)}")
+            log.error("Error removing dashboard permission: %s", e)
             return False
\ No newline at end of file
@@ -1,3 +1,4 @@
+import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 import os
@@ -6,6 +7,8 @@ import discord
 from .permission_responses import PermissionResponses
 from .permission_result import PermissionResult
 
+log = logging.getLogger(__name__)
+
 @dataclass
 class PermissionCheck:
     allowed: bool
@@ -147,7 +150,7 @@ class PermissionManager:
                 'timestamp': datetime.utcnow()
             })
         except Exception as e:
-            print(f"Failed to log access attempt: {e}")
+            log.error("Failed to log access attempt: %s", e)
 
     async def _log_error(
         self,
@@ -168,7 +171,7 @@ class PermissionManager:
             
             await self.db.error_logs.insert_one(log_entry)
         except Exception as e:
-            print(f"Failed to log error: {e}")
+            log.error("Failed to log error: %s", e)
 
     async def add_permission(
         self,
@@ -202,7 +205,7 @@ class PermissionManager:
             return result.modified_count > 0 or result.upserted_id is not None
             
         except Exception as e:
-            print(f"Error adding permission: {e}")
+            log.error("Error adding permission: %s", e)
             return False
 
     async def remove_permission(
@@ -236,5 +239,5 @@ class PermissionManager:
             return result.modified_count > 0
             
         except Exception as e:
-            print(f"Error removing permission: {e}")
+            log.error("Error removing permission: %s", e)
             return False
\ No newline at end of file
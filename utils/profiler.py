@@ -0,0 +1,123 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+
+# (filename, function, first line) of one frame
+FrameKey = Tuple[str, str, int]
+
+class SamplingProfiler:
+    """Pure-Python sampling profiler for a running thread.
+
+    A background thread reads the target thread's stack from
+    ``sys._current_frames`` every ``interval`` seconds and counts identical
+    stacks, so the running bot is profiled without a restart or external
+    tools. Results export as collapsed stacks (flamegraph.pl, speedscope)
+    or as a speedscope JSON profile.
+    """
+
+    def __init__(self, thread_id: Optional[int] = None, interval: float = 0.005):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.samples: Counter = Counter()  # stack (root first) -> samples
+        self.started_at: Optional[float] = None
+        self.duration = 0.0
+        self._stopped = threading.Event()
+
+    async def profile(self, duration: float) -> 'SamplingProfiler':
+        """Sample for ``duration`` seconds while the event loop keeps running"""
+        self._stopped.clear()
+        thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        # A busy loop thread only hands over the GIL every switch interval,
+        # shorten it so samples land while the loop is working, not just idle
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, self.interval / 5))
+        self.started_at = time.monotonic()
+        thread.start()
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            self._stopped.set()
+            await asyncio.to_thread(thread.join)
+            sys.setswitchinterval(switch_interval)
+            self.duration = time.monotonic() - self.started_at
+        return self
+
+    def _sample(self):
+        interval = self.interval
+        while not self._stopped.wait(interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append((code.co_filename, code.co_name, code.co_firstlineno))
+                frame = frame.f_back
+            if stack:
+                stack.reverse()
+                self.samples[tuple(stack)] += 1
+
+    @property
+    def sample_count(self) -> int:
+        return sum(self.samples.values())
+
+    @staticmethod
+    def frame_name(frame: FrameKey) -> str:
+        """Readable name of a frame, with paths relative to the bot's directory"""
+        filename, function, line = frame
+        try:
+            filename = os.path.relpath(filename)
+        except ValueError:
+            pass
+        if filename.startswith('..'):
+            # Library code: keep the path from site-packages or the stdlib onwards
+            filename = filename.split('site-packages' + os.sep)[-1].split('lib' + os.sep)[-1]
+        return f"{function} ({filename}:{line})"
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's collapsed stack format, one ``a;b;c count`` line per stack"""
+        lines = [
+            ";".join(self.frame_name(frame).replace(';', ':') for frame in stack) + f" {count}"
+            for stack, count in self.samples.most_common()
+        ]
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self, name: str = "Blackspire bot") -> Dict[str, Any]:
+        """Profile in speedscope's file format, sample weights are seconds"""
+        frames: List[Dict[str, Any]] = []
+        index: Dict[FrameKey, int] = {}
+        samples, weights = [], []
+        for stack, count in self.samples.items():
+            indexes = []
+            for frame in stack:
+                if frame not in index:
+                    index[frame] = len(frames)
+                    frames.append({'name': frame[1], 'file': frame[0], 'line': frame[2]})
+                indexes.append(index[frame])
+            samples.append(indexes)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': 'https://www.speedscope.app/file-format-schema.json',
+            'shared': {'frames': frames},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            }],
+            'name': name,
+            'exporter': 'blackspire-sampling-profiler'
+        }
+
+    def top_functions(self, limit: int = 10) -> List[Tuple[str, int]]:
+        """Functions seen on top of the stack most often (self time)"""
+        leaves: Counter = Counter()
+        for stack, count in self.samples.items():
+            leaves[stack[-1]] += count
+        return [(self.frame_name(frame), count) for frame, count in leaves.most_common(limit)]
@@ -1,3 +1,7 @@
+import logging
+
+log = logging.getLogger(__name__)
+
 class QuestionStore:
     """Question management functions for MongoDB"""
 
@@ -25,7 +29,7 @@ class QuestionStore:
             )
             return result.modified_count > 0 or result.upserted_id is not None
         except Exception as e:
-            print(f"Error adding question: {e}")
+            log.error("Error adding question: %s", e)
             return False
 
     async def remove_question(self, guild_id: int, ticket_type: str, question_id: str) -> bool:
@@ -43,7 +47,7 @@ class QuestionStore:
             )
             return result.modified_count > 0
         except Exception as e:
-            print(f"Error removing question: {e}")
+            log.error("Error removing question: %s", e)
             return False
 
     async def get_question_by_id(self, guild_id: int, ticket_type: str, question_id: str) -> dict:
@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+import discord
+from .structured_logging import bind_interaction
+
+log = logging.getLogger(__name__)
+
+class QuestionnaireEngine:
+    """Resumable question flows for ticket channels.
+
+    Each active flow is a document in the ``ticket_sessions`` collection,
+    keyed by channel ID. Answers are checkpointed after every message, so a
+    restart only loses the question currently on screen. A single
+    ``on_message`` listener routes replies by channel ID instead of one
+    ``wait_for`` predicate per applicant. Sessions started with a
+    ``form_title`` are answered in modal pages through ``submit_answers``
+    instead of messages.
+    """
+
+    def __init__(self, bot):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self._sessions: Dict[int, Dict[str, Any]] = {}  # channel_id -> session
+        self._handlers: Dict[str, Any] = {}  # ticket_type -> ticket handler
+        self._locks: Dict[int, asyncio.Lock] = {}  # channel_id -> answer lock
+
+    def register_handler(self, ticket_type: str, handler):
+        """Register the handler that finishes sessions of a ticket type.
+
+        The handler must define ``complete_questionnaire(channel, user, session)``
+        and may define ``parse_answer(question, message)`` to store something
+        other than the message content.
+        """
+        self._handlers[ticket_type] = handler
+
+    async def restore(self):
+        """Load in-progress sessions after a restart"""
+        sessions = await self.mongo.get_active_ticket_sessions()
+        for session in sessions:
+            self._sessions[session['channel_id']] = session
+        log.info("Restored %s ticket question session(s)", len(sessions))
+
+    async def start(
+        self,
+        channel: discord.abc.Messageable,
+        user: discord.abc.User,
+        ticket_type: str,
+        questions: List[str],
+        color: int = 0x3498db,
+        context: Optional[Dict[str, Any]] = None,
+        form_title: Optional[str] = None
+    ) -> bool:
+        """Start asking questions in a channel, or start a modal form if ``form_title`` is set"""
+        session = {
+            'channel_id': channel.id,
+            'guild_id': channel.guild.id if getattr(channel, 'guild', None) else None,
+            'user_id': user.id,
+            'ticket_type': ticket_type,
+            'questions': questions,
+            'answers': [],
+            'current_index': 0,
+            'color': color,
+            'context': context or {},
+            'form_title': form_title,
+            'status': 'in_progress',
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+        if not await self.mongo.create_ticket_session(session):
+            return False
+
+        self._sessions[channel.id] = session
+        if not questions:
+            await self._complete(channel, session)
+            return True
+
+        if not form_title:
+            await self._send_question(channel, session)
+        return True
+
+    def get_session(self, channel_id: int) -> Optional[Dict[str, Any]]:
+        """Get the session in progress in a channel"""
+        return self._sessions.get(channel_id)
+
+    async def cancel(self, *channel_ids: Optional[int]) -> bool:
+        """End the sessions of closed ticket channels, ignoring channels without one"""
+        channel_ids = [channel_id for channel_id in channel_ids if channel_id]
+        if not channel_ids:
+            return True
+        for channel_id in channel_ids:
+            self._sessions.pop(channel_id, None)
+            self._locks.pop(channel_id, None)
+        return await self.mongo.close_ticket_sessions(channel_ids)
+
+    async def on_channel_delete(self, channel: discord.abc.GuildChannel):
+        """End the session of a deleted ticket channel"""
+        if channel.id in self._sessions:
+            await self.cancel(channel.id)
+
+    async def on_message(self, message: discord.Message):
+        """Route a message to the session waiting in its channel"""
+        session = self._sessions.get(message.channel.id)
+        if session is None or session.get('form_title') or message.author.id != session['user_id']:
+            return
+
+        bind_interaction(message)
+
+        # Quick double messages answer consecutive questions, one at a time
+        async with self._locks.setdefault(message.channel.id, asyncio.Lock()):
+            if self._sessions.get(message.channel.id) is not session:
+                return
+            index = session['current_index']
+            if index >= len(session['questions']):
+                return
+            question = session['questions'][index]
+
+            try:
+                handler = self._handlers.get(session['ticket_type'])
+                parse_answer = getattr(handler, 'parse_answer', None)
+                answer = await parse_answer(question, message) if parse_answer else message.content
+
+                entry = {'question': question, 'answer': answer}
+                if not await self.mongo.save_ticket_session_answer(message.channel.id, index, entry):
+                    await self._send_question(message.channel, session, retry=True)
+                    return
+
+                # Only a saved answer moves the session on
+                while len(session['answers']) <= index:
+                    session['answers'].append(None)
+                session['answers'][index] = entry
+                session['current_index'] = index + 1
+
+                if session['current_index'] < len(session['questions']):
+                    await self._send_question(message.channel, session)
+                else:
+                    await self._complete(message.channel, session)
+
+            except Exception as e:
+                log.error("Error handling questionnaire answer: %s", e)
+                if session['current_index'] == index:
+                    await self._send_question(message.channel, session, retry=True)
+
+    async def submit_answers(self, channel: discord.abc.Messageable, answers: Dict[int, Any]) -> bool:
+        """Checkpoint answers by question index, finishing the session once all are answered"""
+        async with self._locks.setdefault(channel.id, asyncio.Lock()):
+            session = self._sessions.get(channel.id)
+            if session is None:
+                return False
+
+            entries = {
+                index: {'question': session['questions'][index], 'answer': answer}
+                for index, answer in answers.items()
+            }
+            answered = {index for index, entry in enumerate(session['answers']) if entry} | set(entries)
+            next_index = next(
+                (index for index in range(len(session['questions'])) if index not in answered),
+                len(session['questions'])
+            )
+            if not await self.mongo.save_ticket_session_answers(channel.id, entries, next_index):
+                return False
+
+            while len(session['answers']) < len(session['questions']):
+                session['answers'].append(None)
+            for index, entry in entries.items():
+                session['answers'][index] = entry
+            session['current_index'] = next_index
+
+            if next_index >= len(session['questions']):
+                await self._complete(channel, session)
+            return True
+
+    async def _send_question(self, channel: discord.abc.Messageable, session: Dict[str, Any], retry: bool = False):
+        """Send the session's current question, again after a failed answer if ``retry``"""
+        index = session['current_index']
+        embed = discord.Embed(
+            title=f"Question {index + 1}/{len(session['questions'])}",
+            description=session['questions'][index],
+            color=session.get('color', 0x3498db)
+        )
+        if retry:
+            embed.set_footer(text="⚠️ Your last answer could not be saved, please answer again")
+        await channel.send(embed=embed)
+
+    async def _complete(self, channel: discord.abc.Messageable, session: Dict[str, Any]):
+        """Hand a finished session to its ticket handler"""
+        self._sessions.pop(session['channel_id'], None)
+        self._locks.pop(session['channel_id'], None)
+        await self.mongo.complete_ticket_session(session['channel_id'])
+
+        handler = self._handlers.get(session['ticket_type'])
+        if not handler:
+            log.warning("No questionnaire handler registered for %s", session['ticket_type'])
+            return
+
+        guild = getattr(channel, 'guild', None)
+        user = (guild.get_member(session['user_id']) if guild else None) or \
+            self.bot.get_user(session['user_id'])
+        await handler.complete_questionnaire(channel, user, session)
+
+    @staticmethod
+    async def get_thread(guild: discord.Guild, thread_id: int) -> Optional[discord.Thread]:
+        """Get a session's thread, fetching it when a restart left it uncached"""
+        thread = guild.get_thread(thread_id)
+        if thread is None:
+            try:
+                thread = await guild.fetch_channel(thread_id)
+            except discord.HTTPException as e:
+                log.error("Error fetching questionnaire thread %s: %s", thread_id, e)
+        return thread
+
+    @staticmethod
+    def get_responses(session: Dict[str, Any]) -> Dict[str, Any]:
+        """Get the session's answers as a question -> answer dict, numbering repeated questions"""
+        responses = {}
+        for entry in session['answers']:
+            if not entry:
+                continue
+            question, repeat = entry['question'], 2
+            while question in responses:
+                question = f"{entry['question']} ({repeat})"
+                repeat += 1
+            responses[question] = entry['answer']
+        return responses
@@ -0,0 +1,69 @@
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+class ReplyDispatcher:
+    """Routes incoming messages to coroutines waiting for a user's reply.
+
+    ``bot.wait_for('message', check=...)`` runs every pending predicate
+    against every message, so the cost per message grows with the number of
+    open prompts. Waiters here are keyed by ``(channel_id, user_id)``, which
+    makes the listener a single dict lookup; the optional ``check`` only runs
+    for messages from the right user in the right channel.
+    """
+
+    def __init__(self):
+        self._waiters: Dict[Tuple[int, int], List[Tuple[asyncio.Future, Optional[Callable]]]] = {}
+
+    @property
+    def pending(self) -> int:
+        """Number of replies currently being waited for"""
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def wait_for_reply(
+        self,
+        channel_id: int,
+        user_id: int,
+        check: Optional[Callable[[Any], bool]] = None,
+        timeout: Optional[float] = None
+    ):
+        """Wait for the next message from a user in a channel.
+
+        Raises asyncio.TimeoutError like ``bot.wait_for`` does.
+        """
+        key = (channel_id, user_id)
+        future = asyncio.get_running_loop().create_future()
+        entry = (future, check)
+        self._waiters.setdefault(key, []).append(entry)
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            waiters = self._waiters.get(key)
+            if waiters:
+                if entry in waiters:
+                    waiters.remove(entry)
+                if not waiters:
+                    del self._waiters[key]
+
+    def dispatch(self, message) -> bool:
+        """Resolve the waiters matching a message; returns True if one took it"""
+        waiters = self._waiters.get((message.channel.id, message.author.id))
+        if not waiters:
+            return False
+
+        handled = False
+        for future, check in list(waiters):
+            if future.done():
+                continue
+            try:
+                if check is not None and not check(message):
+                    continue
+            except Exception as e:
+                future.set_exception(e)
+                continue
+            future.set_result(message)
+            handled = True
+        return handled
+
+    async def on_message(self, message):
+        """Listener entry point"""
+        self.dispatch(message)
@@ -0,0 +1,73 @@
+from typing import Dict, List, Optional, Tuple
+import discord
+
+class StaffRoster:
+    """Staff assigned to one ticket type in one guild, with a ready-made ping"""
+
+    def __init__(self, staff: List[Dict]):
+        self.user_ids = [staff_doc['user_id'] for staff_doc in staff if staff_doc.get('user_id')]
+        self.role_ids = [staff_doc['role_id'] for staff_doc in staff if staff_doc.get('role_id')]
+        self.mention = " ".join(
+            [f"<@{user_id}>" for user_id in self.user_ids] +
+            [f"<@&{role_id}>" for role_id in self.role_ids]
+        )
+        # Only the assigned staff may be pinged, never @everyone
+        self.allowed_mentions = self.allowed_mentions_with()
+
+    def allowed_mentions_with(self, user_ids: List[int] = (), role_ids: List[int] = ()) -> discord.AllowedMentions:
+        """Allowed mentions for the staff plus extra users and roles"""
+        return discord.AllowedMentions(
+            everyone=False,
+            users=[discord.Object(id=user_id) for user_id in [*self.user_ids, *user_ids]],
+            roles=[discord.Object(id=role_id) for role_id in [*self.role_ids, *role_ids]]
+        )
+
+    def __bool__(self) -> bool:
+        return bool(self.user_ids or self.role_ids)
+
+class StaffRosterCache:
+    """Caches ticket staff per (guild, ticket type).
+
+    MongoManager drops the cached roster on every staff write, whoever
+    makes it; submissions then route pings without reading the database.
+    A failed read is not cached.
+    """
+
+    def __init__(self, mongo_manager):
+        self.mongo = mongo_manager
+        self._cache: Dict[Tuple[int, str], StaffRoster] = {}
+        self.hits = 0
+        self.misses = 0
+        mongo_manager.add_staff_listener(self.invalidate)
+
+    def invalidate(self, guild_id: int, ticket_type: Optional[str] = None):
+        """Drop cached rosters for a ticket type, or for the whole guild"""
+        if ticket_type is not None:
+            self._cache.pop((guild_id, ticket_type), None)
+            return
+        for key in [key for key in self._cache if key[0] == guild_id]:
+            del self._cache[key]
+
+    async def get(self, guild_id: int, ticket_type: str) -> StaffRoster:
+        """Get the staff roster for a ticket type"""
+        key = (guild_id, ticket_type)
+        roster = self._cache.get(key)
+        if roster is None:
+            self.misses += 1
+            staff = await self.mongo.get_ticket_staff(ticket_type, guild_id)
+            if staff is None:
+                # Ping nobody this time, the next submission reads again
+                return StaffRoster([])
+            roster = StaffRoster(staff)
+            self._cache[key] = roster
+        else:
+            self.hits += 1
+        return roster
+
+    async def add_staff(self, ticket_type: str, guild_id: int, user_id: Optional[int] = None, role_id: Optional[int] = None) -> bool:
+        """Add ticket staff, the roster is refreshed by the write"""
+        return await self.mongo.add_ticket_staff(ticket_type, guild_id, user_id=user_id, role_id=role_id)
+
+    async def remove_staff(self, ticket_type: str, guild_id: int, user_id: Optional[int] = None, role_id: Optional[int] = None) -> bool:
+        """Remove ticket staff, the roster is refreshed by the write"""
+        return await self.mongo.remove_ticket_staff(ticket_type, guild_id, user_id=user_id, role_id=role_id)
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import queue
+import sys
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+# Fields attached to every record logged from the current task
+CONTEXT_FIELDS = ('guild_id', 'channel_id', 'user_id', 'ticket_id', 'flow')
+_log_context: ContextVar[Dict[str, Any]] = ContextVar('log_context', default={})
+
+# Records waiting for the writer thread, new records are dropped once full
+QUEUE_SIZE = 10000
+
+# Repeats of the same warning or error are dropped for this many seconds
+DEDUP_WINDOW = 60.0
+
+def get_log_context() -> Dict[str, Any]:
+    """Get the context fields of the current task"""
+    return _log_context.get()
+
+def bind(**fields):
+    """Add context fields for the rest of the current task"""
+    _log_context.set({**_log_context.get(), **{key: value for key, value in fields.items() if value is not None}})
+
+@contextmanager
+def log_context(**fields):
+    """Add context fields for the wrapped block"""
+    token = _log_context.set({**_log_context.get(), **{key: value for key, value in fields.items() if value is not None}})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+def bind_interaction(interaction):
+    """Add the guild, channel and user of an interaction or message to the current task"""
+    user = getattr(interaction, 'user', None) or getattr(interaction, 'author', None)
+    guild = getattr(interaction, 'guild', None)
+    channel = getattr(interaction, 'channel', None)
+    bind(
+        guild_id=guild.id if guild else None,
+        channel_id=channel.id if channel else None,
+        user_id=user.id if user else None
+    )
+
+class ContextFilter(logging.Filter):
+    """Copies the task's context fields onto the record before it leaves the task"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        for key, value in _log_context.get().items():
+            if not hasattr(record, key):
+                setattr(record, key, value)
+        return True
+
+class DedupFilter(logging.Filter):
+    """Drops repeats of a warning or error within a time window.
+
+    Records are keyed by logger, message template and exception type. The
+    first record after a window carries ``suppressed`` with the number of
+    repeats that were dropped.
+    """
+
+    def __init__(self, window: float = DEDUP_WINDOW):
+        super().__init__()
+        self.window = window
+        self._seen: Dict[Tuple, Tuple[float, int]] = {}  # key -> (window start, suppressed)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING:
+            return True
+        key = (record.name, record.msg, record.exc_info[0] if record.exc_info else None)
+        now = time.monotonic()
+        seen = self._seen.get(key)
+        if seen and now - seen[0] < self.window:
+            self._seen[key] = (seen[0], seen[1] + 1)
+            return False
+        if seen and seen[1]:
+            record.suppressed = seen[1]
+        self._seen[key] = (now, 0)
+        if len(self._seen) > 1000:
+            # Forget keys whose window is over
+            self._seen = {k: v for k, v in self._seen.items() if now - v[0] < self.window}
+        return True
+
+class NonBlockingQueueHandler(QueueHandler):
+    """Hands records to the writer thread without formatting or blocking"""
+
+    def __init__(self, log_queue: queue.SimpleQueue, max_size: int = QUEUE_SIZE):
+        super().__init__(log_queue)
+        self.max_size = max_size
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # This is the root's only handler, so the record is changed in place.
+        # Args and tracebacks are resolved now, they may not be safe to touch later
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.queue.qsize() >= self.max_size:
+            self.dropped += 1
+            return
+        self.queue.put_nowait(record)
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname.lower(),
+            'logger': record.name,
+            'message': record.getMessage()
+        }
+        for key in CONTEXT_FIELDS + ('suppressed',):
+            value = getattr(record, key, None)
+            if value is not None:
+                entry[key] = value
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        elif record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+_listener: Optional[QueueListener] = None
+
+def setup_logging(level: Optional[str] = None) -> QueueListener:
+    """Route all logging through a queue to a JSON writer thread"""
+    global _listener
+    if _listener:
+        return _listener
+
+    # Caller file/line and process fields are never written, skip collecting them
+    logging._srcfile = None
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = NonBlockingQueueHandler(log_queue)
+    # Filters run in the logging task, where the context variables live
+    queue_handler.addFilter(DedupFilter())
+    queue_handler.addFilter(ContextFilter())
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(JsonFormatter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level or os.getenv('LOG_LEVEL', 'INFO'))
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
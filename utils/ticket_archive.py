@@ -0,0 +1,70 @@
+import logging
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+log = logging.getLogger(__name__)
+
+# (collection, finished statuses, timestamp the age is measured from)
+ARCHIVE_SOURCES = (
+    ('active_tickets', ['closed'], 'closed_at'),
+    ('tickets', ['accepted', 'rejected', 'closed'], 'updated_at')
+)
+
+class TicketArchiver:
+    """Periodically moves finished tickets into the ``tickets_archive`` tier.
+
+    Tickets stay in the hot collections for ``retention`` after they finish
+    (so transcripts and late staff actions land there first) and are then
+    moved in batches. Use ``MongoManager.search_tickets`` to query both tiers.
+    """
+
+    def __init__(self, bot, interval: float = 3600, retention: timedelta = timedelta(days=1), batch_size: int = 500):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self.interval = interval
+        self.retention = retention
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the periodic migration"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ticket-archiver")
+
+    async def stop(self):
+        """Stop the periodic migration"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.migrate()
+            except Exception as e:
+                log.error("Error archiving tickets: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def migrate(self) -> Dict[str, int]:
+        """Move every ticket that finished before the retention window"""
+        started = time.perf_counter()
+        before = datetime.utcnow() - self.retention
+        moved = {}
+
+        for source, statuses, time_field in ARCHIVE_SOURCES:
+            moved[source] = 0
+            while True:
+                count = await self.mongo.archive_closed_tickets(
+                    source, statuses, time_field, before, self.batch_size
+                )
+                moved[source] += count
+                if count < self.batch_size:
+                    break
+                await asyncio.sleep(0)  # Let the gateway breathe between batches
+
+        if any(moved.values()):
+            log.info("Archived tickets in %.2fs: %s", time.perf_counter() - started, moved)
+        return moved
@@ -0,0 +1,111 @@
+import logging
+import asyncio
+from typing import Dict, Optional, Tuple
+import discord
+
+log = logging.getLogger(__name__)
+
+# Discord refuses to place more than 50 channels in one category
+CATEGORY_CHANNEL_LIMIT = 50
+DEFAULT_CATEGORY_NAME = "Tickets"
+
+class TicketCategoryResolver:
+    """Resolves the category new tickets are created in, per guild and ticket type"""
+
+    def __init__(self, mongo_manager):
+        self.mongo = mongo_manager
+        self._cache: Dict[Tuple[int, str], int] = {}  # (guild_id, ticket_type) -> category_id
+        self._locks: Dict[Tuple[int, str], asyncio.Lock] = {}
+        self._default_locks: Dict[int, asyncio.Lock] = {}  # guild_id -> lock for the shared category
+        self.hits = 0
+        self.misses = 0
+
+    def invalidate(self, guild_id: int, ticket_type: Optional[str] = None):
+        """Drop cached categories for a ticket type, or for the whole guild"""
+        if ticket_type is not None:
+            self._cache.pop((guild_id, ticket_type), None)
+            return
+        for key in [key for key in self._cache if key[0] == guild_id]:
+            del self._cache[key]
+
+    async def resolve(self, guild: discord.Guild, ticket_type: str) -> Optional[discord.CategoryChannel]:
+        """Get a category with room for one more ticket channel"""
+        key = (guild.id, ticket_type)
+
+        # Fast path: cached category that still exists and has room
+        category = self._get_usable_category(guild, self._cache.get(key))
+        if category:
+            self.hits += 1
+            return category
+        self.misses += 1
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another ticket may have resolved it while we waited
+            category = self._get_usable_category(guild, self._cache.get(key))
+            if category:
+                return category
+
+            try:
+                category = await self._resolve_uncached(guild, ticket_type)
+            except Exception as e:
+                log.error("Error resolving ticket category: %s", e)
+                return None
+
+            if category:
+                self._cache[key] = category.id
+            return category
+
+    def _get_usable_category(self, guild: discord.Guild, category_id: Optional[int]) -> Optional[discord.CategoryChannel]:
+        """Get a category by ID if it exists and is not full"""
+        if not category_id:
+            return None
+        category = guild.get_channel(category_id)
+        if not isinstance(category, discord.CategoryChannel):
+            return None
+        if len(category.channels) >= CATEGORY_CHANNEL_LIMIT:
+            return None
+        return category
+
+    async def _resolve_uncached(self, guild: discord.Guild, ticket_type: str) -> Optional[discord.CategoryChannel]:
+        """Resolve a category from the ticket config, creating one if needed"""
+        config = await self.mongo.get_ticket_config(ticket_type, guild.id) or {}
+
+        base = guild.get_channel(config.get('category_id') or 0)
+        if not isinstance(base, discord.CategoryChannel):
+            base = await self._get_default_category(guild)
+            await self.mongo.set_ticket_category(ticket_type, guild.id, base.id)
+
+        if len(base.channels) < CATEGORY_CHANNEL_LIMIT:
+            return base
+
+        # Configured category is full, use (or create) an overflow category
+        for category_id in config.get('overflow_category_ids', []):
+            category = self._get_usable_category(guild, category_id)
+            if category:
+                return category
+
+        overflow_name = f"{base.name} {len(config.get('overflow_category_ids', [])) + 2}"
+        category = discord.utils.get(guild.categories, name=overflow_name)
+        if not self._get_usable_category(guild, category.id if category else None):
+            category = await guild.create_category(
+                name=overflow_name,
+                overwrites=base.overwrites,
+                reason="Ticket category is full"
+            )
+        await self.mongo.add_ticket_overflow_category(ticket_type, guild.id, category.id)
+        return category
+
+    async def _get_default_category(self, guild: discord.Guild) -> discord.CategoryChannel:
+        """Get or create the shared default tickets category"""
+        # Shared by every ticket type, so guard it per guild rather than per type
+        lock = self._default_locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            for category in guild.categories:
+                if category.name.lower() == DEFAULT_CATEGORY_NAME.lower():
+                    return category
+
+            return await guild.create_category(
+                name=DEFAULT_CATEGORY_NAME,
+                reason="Ticket system setup"
+            )
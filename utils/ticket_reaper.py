@@ -0,0 +1,113 @@
+import logging
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+# Reserved tickets get this long to receive their channel before counting as abandoned
+RESERVATION_GRACE = timedelta(minutes=15)
+
+class TicketReaper:
+    """Periodically closes open tickets whose channel, guild or applicant is gone.
+
+    Open tickets are read in ``_id`` order, one batch at a time, and checked
+    against the gateway cache only, so a sweep makes no Discord REST calls.
+    Each batch's orphans are closed with a single ``bulk_write``.
+    """
+
+    def __init__(self, bot, interval: float = 3600, batch_size: int = 500, dry_run: bool = False):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self.interval = interval
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start the periodic sweep"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name="ticket-reaper")
+
+    async def stop(self):
+        """Stop the periodic sweep"""
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            try:
+                await self.sweep()
+            except Exception as e:
+                log.error("Error sweeping stale tickets: %s", e)
+            await asyncio.sleep(self.interval)
+
+    async def sweep(self) -> Dict[str, Any]:
+        """Check every open ticket once and close the orphaned ones"""
+        started = time.perf_counter()
+        stats = {'scanned': 0, 'orphaned': 0, 'closed': 0, 'reasons': {}}
+        now = datetime.utcnow()
+
+        after_id = None
+        while True:
+            batch = await self.mongo.get_open_tickets_batch(after_id, self.batch_size)
+            if not batch:
+                break
+            after_id = batch[-1]['_id']
+            stats['scanned'] += len(batch)
+
+            closures: List[Tuple[Any, str]] = []
+            channel_ids: List[int] = []
+            for ticket in batch:
+                reason = self._orphan_reason(ticket, now)
+                if reason:
+                    closures.append((ticket['_id'], reason))
+                    channel_ids += [ticket.get('channel_id'), ticket.get('thread_id')]
+                    stats['reasons'][reason] = stats['reasons'].get(reason, 0) + 1
+
+            stats['orphaned'] += len(closures)
+            if closures and not self.dry_run:
+                stats['closed'] += await self.mongo.close_tickets_bulk(closures, self.bot.user.id)
+                await self.bot.questionnaires.cancel(*channel_ids)
+
+            if len(batch) < self.batch_size:
+                break
+
+        duration = time.perf_counter() - started
+        rate = stats['scanned'] / duration if duration else 0
+        log.info(
+            "%sTicket reaper: scanned %s open tickets in %.2fs (%.0f/s), %s orphaned, %s closed %s",
+            '[dry run] ' if self.dry_run else '', stats['scanned'], duration, rate,
+            stats['orphaned'], stats['closed'], stats['reasons']
+        )
+        stats['duration'] = duration
+        return stats
+
+    def _orphan_reason(self, ticket: Dict[str, Any], now: datetime) -> Optional[str]:
+        """Get why a ticket is orphaned, or None if it is still live"""
+        guild = self.bot.get_guild(ticket['guild_id'])
+        if guild is None:
+            return 'guild_left'
+        if guild.unavailable:
+            return None  # Discord outage, check again next sweep
+
+        channel_id = ticket.get('channel_id')
+        if not channel_id:
+            # Reservation whose channel was never attached
+            created_at = ticket.get('created_at')
+            if created_at and now - created_at > RESERVATION_GRACE:
+                return 'reservation_abandoned'
+            return None
+
+        if guild.get_channel(channel_id) is None:
+            return 'channel_deleted'
+
+        # Member cache is only complete once the guild is chunked
+        if guild.chunked and guild.get_member(ticket['user_id']) is None:
+            return 'applicant_left'
+
+        return None
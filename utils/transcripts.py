@@ -0,0 +1,175 @@
+import logging
+import asyncio
+import gzip
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Dict, List
+import discord
+from .structured_logging import log_context
+
+log = logging.getLogger(__name__)
+
+# Messages buffered before a compressed write, roughly one history page
+WRITE_BATCH_SIZE = 100
+
+class TranscriptExporter:
+    """Exports closed ticket channels to gzip-compressed JSONL transcripts.
+
+    Exports run on a small pool of background workers fed by a bounded
+    queue, so closing many tickets at once does not flood the REST API.
+    History is streamed page by page and written in batches; at most one
+    page of messages is held in memory per export.
+    """
+
+    def __init__(self, bot, directory: str = 'transcripts', max_concurrency: int = 2, queue_size: int = 100):
+        self.bot = bot
+        self.mongo = bot.mongo_manager
+        self.directory = directory
+        self.max_concurrency = max_concurrency
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._workers: List[asyncio.Task] = []
+
+    @property
+    def pending(self) -> int:
+        """Number of exports waiting for a worker"""
+        return self._queue.qsize()
+
+    def start(self):
+        """Start the export workers"""
+        os.makedirs(self.directory, exist_ok=True)
+        for i in range(self.max_concurrency - len(self._workers)):
+            self._workers.append(asyncio.create_task(self._worker(), name=f"transcript-worker-{i}"))
+
+    async def stop(self):
+        """Cancel the export workers"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    def enqueue(self, channel: discord.TextChannel, delete_after: bool = False) -> bool:
+        """Queue a channel for export, returns False if the queue is full"""
+        try:
+            self._queue.put_nowait((channel, delete_after))
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    async def _worker(self):
+        while True:
+            channel, delete_after = await self._queue.get()
+            # Workers are long-lived, scope the context to this export
+            with log_context(guild_id=channel.guild.id, channel_id=channel.id):
+                await self._export_one(channel, delete_after)
+
+    async def _export_one(self, channel: discord.TextChannel, delete_after: bool):
+        try:
+            result = await self.export(channel)
+            await self.mongo.set_ticket_transcript(channel.id, result)
+            if delete_after:
+                await channel.delete(reason="Ticket closed")
+        except Exception as e:
+            log.error("Error exporting transcript for %s: %s", channel.id, e)
+            await self._notify_failure(channel)
+        finally:
+            self._queue.task_done()
+
+    async def _notify_failure(self, channel: discord.TextChannel):
+        """Tell the closer and staff that the ticket stayed open"""
+        embed = discord.Embed(
+            title="⚠️ Transcript Failed",
+            description=(
+                "The transcript for this ticket could not be saved, so the channel was left open.\n"
+                "Please try closing it again or contact an administrator."
+            ),
+            color=0xff9900
+        )
+        try:
+            await channel.send(embed=embed)
+        except discord.HTTPException as e:
+            log.error("Error sending transcript failure notice to %s: %s", channel.id, e)
+
+    async def export(self, channel: discord.TextChannel) -> Dict[str, Any]:
+        """Stream a channel and its threads into a transcript file"""
+        started = time.perf_counter()
+        path = os.path.join(
+            self.directory,
+            f"{channel.guild.id}-{channel.id}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.jsonl.gz"
+        )
+
+        message_count = 0
+        threads = await self._get_threads(channel)
+        # Opening and closing the archive touch the disk, keep them off the event loop
+        archive = await asyncio.to_thread(gzip.open, path, 'wt', encoding='utf-8')
+        try:
+            message_count += await self._write_history(archive, channel)
+            for thread in threads:
+                message_count += await self._write_history(archive, thread)
+        finally:
+            await asyncio.to_thread(archive.close)
+        size = await asyncio.to_thread(os.path.getsize, path)
+
+        duration = time.perf_counter() - started
+        log.info("Exported transcript for #%s: %s messages in %.1fs", channel.name, message_count, duration)
+        return {
+            'path': path,
+            'messages': message_count,
+            'threads': len(threads),
+            'size': size,
+            'exported_at': datetime.utcnow()
+        }
+
+    async def _get_threads(self, channel: discord.TextChannel) -> List[discord.Thread]:
+        """Get active and archived threads of a channel"""
+        threads = {thread.id: thread for thread in channel.threads}
+        for private in (False, True):
+            try:
+                async for thread in channel.archived_threads(private=private, limit=None):
+                    threads[thread.id] = thread
+            except discord.Forbidden:
+                pass
+        return list(threads.values())
+
+    async def _write_history(self, archive, channel) -> int:
+        """Write a channel's history to the archive in batches"""
+        count = 0
+        batch = []
+        async for message in channel.history(limit=None, oldest_first=True):
+            batch.append(json.dumps(self._serialize(message, channel), ensure_ascii=False))
+            if len(batch) >= WRITE_BATCH_SIZE:
+                await asyncio.to_thread(archive.write, '\n'.join(batch) + '\n')
+                count += len(batch)
+                batch = []
+        if batch:
+            await asyncio.to_thread(archive.write, '\n'.join(batch) + '\n')
+            count += len(batch)
+        return count
+
+    @staticmethod
+    def _serialize(message: discord.Message, channel) -> Dict[str, Any]:
+        """Turn a message into a transcript line"""
+        return {
+            'channel_id': channel.id,
+            'channel': channel.name,
+            'message_id': message.id,
+            'author_id': message.author.id,
+            'author': str(message.author),
+            'bot': message.author.bot,
+            'created_at': message.created_at.isoformat(),
+            'edited_at': message.edited_at.isoformat() if message.edited_at else None,
+            'content': message.content,
+            'embeds': [embed.to_dict() for embed in message.embeds],
+            'attachments': [
+                {'filename': attachment.filename, 'url': attachment.url, 'size': attachment.size}
+                for attachment in message.attachments
+            ]
+        }
+
+    @staticmethod
+    def open_transcript(path: str):
+        """Iterate over the messages of a transcript without loading it all"""
+        with gzip.open(path, 'rt', encoding='utf-8') as archive:
+            for line in archive:
+                yield json.loads(line)